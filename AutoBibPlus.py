@@ -19,7 +19,7 @@ text_style_question = '"color: #0C5E31"'
 # Fonction permettant de checker la présence d'un fichier de configuration si non la création se fait alors (reprise de la bibliothèque "pybliometrics"), également fonction d'initialisation
 def check_create_config(console: QPlainTextEdit, response: str, keys: list = None, first_time: bool = False):
     import configparser
-    from Include.pybliometrics.utils.constants import CONFIG_FILE
+    from Include.pybliometrics.utils.constants import CONFIG_FILE, URLS
     from Include.pybliometrics.utils.create_config import create_config
 
     # Read/create config file (with fixture for RTFD.io)
@@ -51,7 +51,7 @@ def check_create_config(console: QPlainTextEdit, response: str, keys: list = Non
             # Test de la clef et du token par envoie d'une requête (API Scopus / AuthorRetrival sur Mohamed Cheriet)
             try:
                 # Envoi de la requête à l'API Scopus
-                response = requests.get("https://api.elsevier.com/content/author/author_id/56216876600", params={"apiKey": elements[0], "insttoken": elements[1], "httpAccept": "application/json"})
+                response = requests.get(URLS["AuthorRetrieval"] + "56216876600", params={"apiKey": elements[0], "insttoken": elements[1], "httpAccept": "application/json"})
             except requests.exceptions.RequestException as e:
                 error_message = "Une erreur s'est produite!\n\nSi l'erreur persiste, veuillez contacter le service technique de  votre établissement.\n\nDétails:\n" + str(e)
                 error_dialog = QMessageBox(QMessageBox.Critical, "Erreur", error_message, QMessageBox.Ok)
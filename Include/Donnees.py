@@ -0,0 +1,152 @@
+"""
+Données des rapports obtenues des API Scopus et SciVal, sans interface graphique : documents d'une personne, citations
+par année de ses documents, métriques SciVal du rapport et valeurs de l'encadré (d'une personne ou de plusieurs à la fois).
+Utilisées par Tools.py pour les rapports et par Warmer.py pour le préchauffage du cache.
+"""
+
+from datetime import datetime
+
+# Importations locales
+from .pybliometrics.scopus.abstract_citation import CitationOverview
+from .pybliometrics.scopus.author_retrieval import AuthorRetrieval
+from .pybliometrics.scival.author_lookup import AuthorLookup
+from .pybliometrics.scopus.scopus_search import ScopusSearch
+
+# Champs des documents utilisés par les rapports (les seuls téléchargés par documents_chercheur)
+CHAMPS_DOCUMENTS = ['eid', 'subtypeDescription', 'coverDate']
+
+# Fonction qui retourne un DataFrame de tous les documents publiés de la personne (une ligne par document, seules les
+# colonnes de CHAMPS_DOCUMENTS sont remplies), construit directement à partir des résultats de la recherche mis en cache
+# (mis à jour de façon incrémentale après refresh jours)
+def documents_chercheur(au_retrieval: AuthorRetrieval, refresh: int = 10):
+    search = ScopusSearch(f'AU-ID({au_retrieval.identifier})', refresh=refresh, incremental=True, fields=CHAMPS_DOCUMENTS)
+    return search.to_frame()
+
+# Nombre maximal de documents par appel de CitationOverview
+TAILLE_LOT_CITATIONS = 25
+
+# Fonction qui retourne les listes de : du nombre de citations par année des documents donnés et les années de carrière
+# de la personne. Les citations sont obtenues par lots de documents pris dans tous les documents de la personne triés par
+# EID (les documents récents, aux EID plus grands, s'ajoutent au dernier lot) et non dans les seuls documents donnés :
+# les lots, et donc les réponses en cache, sont les mêmes quels que soient les types de documents sélectionnés, en
+# particulier ceux préchauffés par Warmer.py. Seuls les lots contenant au moins un des documents donnés sont demandés.
+def donnees_citations_graph_citations(au_retrieval: AuthorRetrieval, document_eids: list):
+    # Constantes nécessaires pour la suite des calculs
+    first_year = au_retrieval.publication_range[0]
+    total_annees = datetime.now().year - first_year + 2
+    years_list = [first_year + i for i in range(0, total_annees)]
+
+    # Scopus ID (EID sans préfixe) des documents donnés et de tous les documents de la personne
+    selection = {eid.split(".0-")[-1] for eid in document_eids}
+    scopus_ids = sorted({eid.split(".0-")[-1] for eid in documents_chercheur(au_retrieval)['eid']} | selection, key=int)
+
+    # Somme par année des citations des documents donnés, lot par lot
+    nb_cit_annees = [0] * total_annees
+    header_citation = {}
+    for debut in range(0, len(scopus_ids), TAILLE_LOT_CITATIONS):
+        lot = scopus_ids[debut:debut + TAILLE_LOT_CITATIONS]
+        if selection.isdisjoint(lot):
+            continue
+        co = CitationOverview(identifier=lot, start=first_year, end=first_year+total_annees-1, refresh=True)
+        # En-tête de la dernière réponse reçue de l'API (absent si la réponse vient du cache)
+        header_citation = getattr(co, '_header', header_citation)
+        for scopus_id, citations in zip(co.scopus_id, co.cc):
+            if str(scopus_id) in selection:
+                for i, (_, nb) in enumerate(citations):
+                    nb_cit_annees[i] += nb
+
+    # Ajoute le total de cette liste à la fin de la liste (écrasement/overwriting)
+    nb_cit_annees.append(sum(nb_cit_annees))
+
+    return nb_cit_annees, years_list, header_citation
+
+# Métriques SciVal de l'encadré du rapport, regroupées par combinaison (metricTypes, yearRange, includedDocs,
+# journalImpactType) pour être obtenues en un seul appel par combinaison
+METRIQUES_ENCADRE = [
+    (['ScholarlyOutput', 'OutputsInTopCitationPercentiles', 'AcademicCorporateCollaboration', 'Collaboration'], '10yrs', 'AllPublicationTypes', 'CiteScore'),
+    (['ScholarlyOutput', 'AcademicCorporateCollaboration'], '5yrsAndCurrentAndFuture', 'AllPublicationTypes', 'CiteScore'),
+    (['ScholarlyOutput', 'CitationsPerPublication', 'FieldWeightedCitationImpact'], '10yrs', 'ArticlesConferencePapers', 'CiteScore'),
+]
+# Même chose pour tout le rapport (encadré, graphiques SNIP et Collaborations)
+METRIQUES_RAPPORT = METRIQUES_ENCADRE + [
+    (['Collaboration'], '3yrsAndCurrentAndFuture', 'AllPublicationTypes', 'CiteScore'),
+    (['ScholarlyOutput', 'PublicationsInTopJournalPercentiles'], '10yrs', 'ArticlesReviews', 'SNIP'),
+    (['ScholarlyOutput', 'PublicationsInTopJournalPercentiles'], '3yrsAndCurrentAndFuture', 'ArticlesReviews', 'SNIP'),
+]
+
+# Fonction utilitaire qui précharge toutes les métriques du rapport pour l'instance AuthorLookup donnée
+# (les réponses étant en cache, seul le premier appel pour une personne interroge SciVal)
+def _precharger_metriques(au: AuthorLookup):
+    for metric_types, year_range, included_docs, journal_impact_type in METRIQUES_RAPPORT:
+        au.prefetch_metrics(metric_types, yearRange=year_range, includedDocs=included_docs, journalImpactType=journal_impact_type)
+
+# Fonction utilitaire qui permet d'une liste de retourner une liste avec des 0
+# à la place des éléments vides (NONE)
+def _replace_none_with_zero(lst: list):
+    for i in range(len(lst)):
+        if lst[i] is None:
+            lst[i] = 0
+    return lst
+
+# Fonction utilitaire qui calcule les valeurs de l'encadré de la personne author_id (celle de l'instance si vide)
+# à partir des métriques de l'instance AuthorLookup, éventuellement préchargées par lots
+def _calcul_encadre(au: AuthorLookup, author_id: str, years_list: list):
+    # Obtient via l'instance les metrics "ScholarlyOutput" sur les 10 dernières années complètes sous forme de liste tot_scholarly_out
+    liste_sch_out = _replace_none_with_zero(au.get_metrics_Other(author_ids=author_id, metricType='ScholarlyOutput', yearRange='10yrs').List)
+
+    # Adapte l'index correspondant à la première année pour les valeurs de l'encadré : moy de citations par pub ET moy MCR, vis-à-vis de la contrainte de l'API SciVal
+    index_10y_adapted = liste_sch_out[0].index(years_list[0]) if years_list[0] in liste_sch_out[0] else 0
+    # Créé une nouvelle liste en fonction de l'index trouvé
+    annee_10y_adapt = liste_sch_out[0][index_10y_adapted]
+
+    ### Publications très citées (1er décile) sur les 5 dernières années complètes - 1 ###
+    # Calcul le total des "ScholarlyOutputs" pour les 5 dernières années complètes - 1
+    tot_scholarly_5y = sum(liste_sch_out[-1][4:9])
+    # Calcul le total des "OutputsInTopCitationPercentiles" pour les 5 dernières années complètes - 1
+    tot_top_citations = sum(_replace_none_with_zero(au.get_metrics_Percentile(author_ids=author_id, metricType='OutputsInTopCitationPercentiles', yearRange='10yrs').List[-1][4:9]))
+    # Calcul final : rapport des totaux multiplié par 100 pour avoir en pourcentage et arrondi au dixième ET valeur mis à 0 si tot_scholarly_5y vaut 0
+    top_citations = round(tot_top_citations/tot_scholarly_5y*100, 1) if tot_scholarly_5y != 0 else 0
+
+    ### Publications en collaboration avec l'industrie de -6 ans à l'année prochaine ###
+    # Calcul le total des "ScholarlyOutputs" pour les 5 dernières années - 1 complètes ainsi que l'année en cours et l'année future
+    tot_scholarly_5ycf = sum([liste_sch_out[-1][4]] + _replace_none_with_zero(au.get_metrics_Other(author_ids=author_id, metricType='ScholarlyOutput', yearRange='5yrsAndCurrentAndFuture').List[-1]))
+    # Calcul le total des "AcademicCorporateCollaborations" pour les 5 dernières années - 1 complètes ainsi que l'année en cours et l'année future
+    tot_acad_collab = sum(_replace_none_with_zero([au.get_metrics_Collaboration(author_ids=author_id, metricType='AcademicCorporateCollaboration', yearRange='10yrs', collabType='Academic-corporate collaboration').List[-1][4]] + au.get_metrics_Collaboration(author_ids=author_id, metricType='AcademicCorporateCollaboration', yearRange='5yrsAndCurrentAndFuture', collabType='Academic-corporate collaboration').List[-1]))
+    # Calcul final : rapport des totaux multiplié par 100 pour avoir en pourcentage et arrondi au dixième ET valeur mis à 0 si tot_scholarly_5ycf vaut 0
+    acad_collab = round(tot_acad_collab/tot_scholarly_5ycf*100, 1) if tot_scholarly_5ycf != 0 else 0
+
+    ###### Moyennes de citations par publication ET MCR
+    # Créé la liste des "ScholarlyOutputs" avec seulement les types Articles et ConferencePapers, et dynamiquement via l'index adapté
+    liste_sch_out_10y_adapted_ArticlesConf = _replace_none_with_zero(au.get_metrics_Other(author_ids=author_id, metricType='ScholarlyOutput', yearRange='10yrs', includedDocs='ArticlesConferencePapers').List)[-1][index_10y_adapted:9]
+    # Constante résultante de la somme des éléments de la liste ci-dessus
+    tot_liste_sch_out_10y_adapted_ArticlesConf = sum(liste_sch_out_10y_adapted_ArticlesConf)
+
+    ### Moyenne de citations par publication ###
+    # Créé la liste des "CitationsPerPublication" avec seulement les types Articles et ConferencePapers, et dynamiquement via l'index adapté
+    liste_cit_per_pub = _replace_none_with_zero(au.get_metrics_Other(author_ids=author_id, metricType='CitationsPerPublication', yearRange='10yrs', includedDocs='ArticlesConferencePapers').List[-1][index_10y_adapted:9])
+    # Calcul final : produit du nombre de documents publiés par la moy de citations par pub. par année, divisé par le total de documents publiés sur le range d'années,
+    # arrondi au dixième ET valeur mis à 0 si tot_liste_sch_out_10y_adapted_ArticlesConf vaut 0
+    cit_per_pub = round(sum([elem1 * elem2 for elem1, elem2 in zip(liste_sch_out_10y_adapted_ArticlesConf, liste_cit_per_pub)])/tot_liste_sch_out_10y_adapted_ArticlesConf, 1) if tot_liste_sch_out_10y_adapted_ArticlesConf != 0 else 0
+
+    ### Moyenne MCR ###
+    # Créé la liste des "FieldWeightedCitationImpact" avec seulement les types Articles et ConferencePapers, et dynamiquement via l'index adapté
+    liste_moy_MCR = _replace_none_with_zero(au.get_metrics_Other(author_ids=author_id, metricType='FieldWeightedCitationImpact', yearRange='10yrs', includedDocs='ArticlesConferencePapers').List[-1][index_10y_adapted:9])
+    # Calcul final : produit du nombre de documents publiés par la moy MCR par année, divisé par le total de documents publiés sur le range d'années,
+    # arrondi au centième ET valeur mis à 0 si tot_liste_sch_out_10y_adapted_ArticlesConf vaut 0
+    moy_MCR = round(sum([elem1 * elem2 for elem1, elem2 in zip(liste_sch_out_10y_adapted_ArticlesConf, liste_moy_MCR)])/tot_liste_sch_out_10y_adapted_ArticlesConf, 2) if tot_liste_sch_out_10y_adapted_ArticlesConf != 0 else 0
+
+    return [top_citations, cit_per_pub, moy_MCR, acad_collab], annee_10y_adapt
+
+# Fonction qui retourne les valeurs de l'encadré de chacun des auteurs author_ids (dictionnaire ID -> valeurs), en regroupant
+# les auteurs par lots de SCIVAL_MAX_AUTHORS dans les appels à SciVal : un appel par lot et par combinaison de METRIQUES_ENCADRE
+def valeurs_encadre_auteurs(author_ids: list, years_list: list, refresh: int = 10):
+    author_ids = list(dict.fromkeys(str(a).split('-')[-1] for a in author_ids))
+    if not author_ids:
+        return {}
+    # Une seule instance AuthorLookup pour tous les auteurs et préchargement par lots de toutes les métriques de l'encadré
+    au = AuthorLookup(author_id=author_ids[0], refresh=refresh)
+    for metric_types, year_range, included_docs, journal_impact_type in METRIQUES_ENCADRE:
+        au.prefetch_metrics_batch(author_ids, metric_types, yearRange=year_range, includedDocs=included_docs,
+                                  journalImpactType=journal_impact_type)
+
+    return {author_id: _calcul_encadre(au, author_id, years_list)[0] for author_id in author_ids}
@@ -175,7 +175,7 @@ class InfoAPI(QDialog):
 
         # Définie le titre et les dimensions de la Box
         self.setWindowTitle("Informations sur les API")
-        self.resize(800, 250)
+        self.resize(950, 300)
 
         # La structure principale est conçue d'un arrangement vertical qui contient un Widget avec 2 onglets (SciVal et Scopus)
         layout = QVBoxLayout()
@@ -194,6 +194,9 @@ class InfoAPI(QDialog):
             tab_subScopus.addTab(self._create_tab(infos_API[nom_API]), nom_API)
         tab_main.addTab(tab_subScopus, "Scopus")
 
+        # L'onglet Statistiques contient les mesures de toutes les requêtes depuis l'ouverture du logiciel
+        tab_main.addTab(self._create_metrics_tab(), "Statistiques")
+
         # Ajout du Widget avec les 2 onglets pricipaux au Layout placé comme principale
         layout.addWidget(tab_main)
         self.setLayout(layout)
@@ -224,6 +227,28 @@ class InfoAPI(QDialog):
         info_widget.setPlainText("Date:\t\t" + infos['Date'] + formatted_date_GMT + "\nX-RateLimit-Limit:\t" + infos['X-RateLimit-Limit'] + "\nX-RateLimit-Remaining:\t" + infos['X-RateLimit-Remaining'] + "\nX-RateLimit-Reset:\t" + infos['X-RateLimit-Reset'] + formatted_date_epoch + "\n\nLes valeurs sont indiquées que lorsque vous avez utilisé l'API concernée, depuis l'ouverture du logiciel.")
         return info_widget
 
+    # Méthode utilitaire pour générer l'onglet des statistiques (nombre de requêtes, latences, volume téléchargé, cache) par API
+    def _create_metrics_tab(self):
+        from .pybliometrics.utils.metrics import METRICS
+
+        info_widget = QPlainTextEdit()
+        info_widget.setReadOnly(True)  # Pour empêcher l'édition du texte
+        info_widget.setFont(QFont("Consolas", 9))
+
+        lignes = [f"{'API':<24}{'Requêtes':>9}{'Moy. (s)':>10}{'p95 (s)':>9}{'Mo':>8}{'Reprises':>9}{'429':>6}{'Cache (trouvé/absent/périmé)':>30}{'Taux':>7}"]
+        for nom_API, c in sorted(METRICS.snapshot().items()):
+            moyenne = c['latency_sum'] / c['requests'] if c['requests'] else 0
+            p95 = METRICS.quantile(nom_API, 0.95)
+            taux = METRICS.hit_ratio(nom_API)
+            cache = f"{c['cache_hit']}/{c['cache_miss']}/{c['cache_stale']}"
+            lignes.append(f"{nom_API:<24}{c['requests']:>9}{moyenne:>10.2f}{(str(p95) if p95 is not None else '-'):>9}{c['bytes']/1e6:>8.1f}{c['retries']:>9}{c['throttled']:>6}{cache:>30}{(f'{taux:.0%}' if taux is not None else '-'):>7}")
+        lignes.append("")
+        lignes.append("Le p95 indique la borne supérieure de l'intervalle de l'histogramme des latences. Les valeurs sont cumulées depuis l'ouverture du logiciel.")
+
+        # Affichage des informations
+        info_widget.setPlainText("\n".join(lignes))
+        return info_widget
+
 
 # Classe de la boîte de dialogue sur les informations du logiciel
 class Info(QDialog):
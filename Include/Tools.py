@@ -48,7 +48,7 @@ Approche adoptée et tâches réalisées:
         Amélioration de l'Interface Homme-Machine (IHM) : Développement d'une nouvelle branche pour l'IHM en Qt.
 """
 
-import os, unicodedata, win32gui, time, re
+import os, unicodedata, win32gui, time, re, asyncio
 import pandas as pd
 import json
 from unidecode import unidecode
@@ -61,16 +61,17 @@ from openpyxl.styles import PatternFill
 from xlsxwriter import Workbook
 
 # Importations locales
-from .pybliometrics.scopus.abstract_citation import CitationOverview
 from .pybliometrics.scopus.author_retrieval import AuthorRetrieval
 from .pybliometrics.scopus.author_search import AuthorSearch
-from .pybliometrics.scopus.abstract_retrieval import AbstractRetrieval
+from .pybliometrics.scopus.abstract_retrieval import AbstractRetrieval, AsyncAbstractRetrieval
 from .pybliometrics.scival.author_lookup import AuthorLookup
 from .pybliometrics.scival.institution_lookup import InstitutionLookup
 from .pybliometrics.utils.startup import DOCS_PATH
 from .pybliometrics.scopus.affiliation_retrieval import AffiliationRetrieval
 from .pybliometrics.scopus.affiliation_search import AffiliationSearch
 from Include.pybliometrics.scopus.scopus_search import ScopusSearch
+from .Donnees import _calcul_encadre, _precharger_metriques, _replace_none_with_zero, documents_chercheur, \
+    donnees_citations_graph_citations, valeurs_encadre_auteurs
 
 # Pour utiliser la console de l'IHM
 from PySide6.QtWidgets import QPlainTextEdit
@@ -392,7 +393,7 @@ def affRetrieval(choix: int, s: AffiliationSearch, console: QPlainTextEdit):
 # Fonction qui retourne un DataFrame sur les types de documents avec leur nombre en fonction de la personne sélectionnée
 def tous_les_docs_chercheur(au_retrieval: AuthorRetrieval, console: QPlainTextEdit):
     # Récupère tous les documents publiés de la personne et les stock dans un DataFrame
-    docs = pd.DataFrame(au_retrieval.get_documents(refresh=10))
+    docs = documents_chercheur(au_retrieval)
 
     # Afficher les valeurs uniques dans la colonne 'subtypeDescription'
     list_val = docs['subtypeDescription'].unique()
@@ -445,7 +446,7 @@ def selection_types_de_documents(selected_types: list, len_df: int, console: QPl
 # des eids de tous les documents des types sélectionnés, ainsi que les années de carrière de la personne
 def donnees_documents_graph_citations(au_retrieval: AuthorRetrieval, selected_types: list, df: pd.DataFrame, console: QPlainTextEdit):
     # Créé un DataFrame avec toutes les données sur tous les documents de la personne sélectionnée
-    docs = pd.DataFrame(au_retrieval.get_documents(refresh=10))
+    docs = documents_chercheur(au_retrieval)
 
     # Trie par année de publication des documents
     draft_list = docs['coverDate'].str[:4].sort_values() # pour draft list
@@ -501,63 +502,6 @@ def donnees_documents_graph_citations(au_retrieval: AuthorRetrieval, selected_ty
 
     return final_list, eids_list, years
 
-# Fonction qui retourne les listes de : du nombre de citations par année et les années de carrière de la personne
-def donnees_citations_graph_citations(au_retrieval: AuthorRetrieval, document_eids: list):
-    # Constantes nécessaires pour la suite des calculs
-    first_year = au_retrieval.publication_range[0]
-    total_annees = datetime.now().year - first_year + 2
-
-    # Modifier les eid dans document_eids
-    document_eids = [eid.split(".0-")[-1] for eid in document_eids]
-
-    # Autres constantes nécessaires pour la suite des calculs
-    length_list_eids = len(document_eids)
-    stop_value = int((length_list_eids-1)/25)
-
-    # Extraire les données du premier élément obligatoirement à part sinon cela impacte la boucle for si length > 25!
-    co = CitationOverview(identifier=document_eids[0:1], start=first_year, end=first_year+total_annees-1, refresh=True)
-    header_citation = co._header
-    citation_overviews = []
-    citation_overviews.append(co.cc)
-
-    # Plusieurs extractions nécessaires si documents > 25
-    if length_list_eids > 25:
-        # Boucle le nombre de fois où il y a 25 dans length_list_eids
-        for i in range(0, int(length_list_eids / 25)):
-            # Extraire par 25 les données et les ajouter à la liste principale
-            co = CitationOverview(identifier=document_eids[(i*25)+1 : (i*25)+26], start=first_year, end=first_year+total_annees-1, refresh=True)
-            header_citation = co._header
-            citation_overviews.append(co.cc)
-
-    # Extraire les données qu'il reste (nb de documents < 25)
-    if (length_list_eids-1)%25 != 0:
-        co = CitationOverview(identifier=document_eids[stop_value*25 + 1 : stop_value*25 + (length_list_eids-1)%25 + 1], start=first_year, end=first_year+total_annees-1, refresh=True)
-        header_citation = co._header
-        citation_overviews.append(co.cc)
-    else:
-        citation_overviews.append([[(0, 0) for _ in range(total_annees)]])
-
-    # Décapsulation de citation_overviews (liste principale) pour faire le total par année
-    nb_cit_annees = [0] * total_annees
-    for i in range(0, stop_value + 2):
-        for y in range(0, len(citation_overviews[i])):
-            for z in range(0, len(citation_overviews[i][y])):
-                nb_cit_annees[z] += citation_overviews[i][y][z][1]
-
-    # Affichage de manière tabulaire le nb de citations par année (T pour transposition matricielle)
-    df = pd.DataFrame(nb_cit_annees).T # Transposition
-    years_list = [first_year + i for i in range(0, total_annees)] # Modification des index de colonnes avec les années
-    df.columns = years_list
-
-    # Renommer l'axe des colonnes transposées ainsi que le nom de la colonne de données
-    df = df.rename_axis('Année', axis='columns')
-    df = df.rename(index={0: 'Citations'})
-
-    # Ajoute le total de cette liste à la fin de la liste (écrasement/overwriting)
-    nb_cit_annees.append(sum(nb_cit_annees))
-
-    return nb_cit_annees, years_list, header_citation
-
 # Fonction qui retourne le tableau pour le graphique des citations
 def tab_graph_citations(au_retrieval: AuthorRetrieval, eids_list: list, liste_docs: list, console: QPlainTextEdit, window_width: int):
     # PARTIE sur les citations
@@ -583,64 +527,36 @@ def tab_graph_citations(au_retrieval: AuthorRetrieval, eids_list: list, liste_do
     return df, [au_retrieval.given_name, au_retrieval.surname], header
 
 
-# Fonction utilitaire qui permet d'une liste de retourner une liste avec des 0
-# à la place des éléments vides (NONE)
-def _replace_none_with_zero(lst: list):
-    for i in range(len(lst)):
-        if lst[i] is None:
-            lst[i] = 0
-    return lst
-
 # Fonction qui retourne les valeurs de l'encadré du rapport en fonction de l'eid de la personne sélectionnée
 def valeurs_encadre(author_eid, years_list: list):
     # Instance de l'objet AuthorLookup correspondant à la personne sélectionnée via l'EID
-    au = AuthorLookup(author_id=author_eid, refresh=True)
-
-    # Obtient via l'instance les metrics "ScholarlyOutput" sur les 10 dernières années complètes sous forme de liste tot_scholarly_out
-    liste_sch_out = _replace_none_with_zero(au.get_metrics_Other(metricType='ScholarlyOutput', yearRange='10yrs').List)
-
-    # Adapte l'index correspondant à la première année pour les valeurs de l'encadré : moy de citations par pub ET moy MCR, vis-à-vis de la contrainte de l'API SciVal
-    index_10y_adapted = liste_sch_out[0].index(years_list[0]) if years_list[0] in liste_sch_out[0] else 0
-    # Créé une nouvelle liste en fonction de l'index trouvé
-    annee_10y_adapt = liste_sch_out[0][index_10y_adapted]
-
-    ### Publications très citées (1er décile) sur les 5 dernières années complètes - 1 ###
-    # Calcul le total des "ScholarlyOutputs" pour les 5 dernières années complètes - 1
-    tot_scholarly_5y = sum(liste_sch_out[-1][4:9])
-    # Calcul le total des "OutputsInTopCitationPercentiles" pour les 5 dernières années complètes - 1
-    tot_top_citations = sum(_replace_none_with_zero(au.get_metrics_Percentile(metricType='OutputsInTopCitationPercentiles', yearRange='10yrs').List[-1][4:9]))
-    # Calcul final : rapport des totaux multiplié par 100 pour avoir en pourcentage et arrondi au dixième ET valeur mis à 0 si tot_scholarly_5y vaut 0
-    top_citations = round(tot_top_citations/tot_scholarly_5y*100, 1) if tot_scholarly_5y != 0 else 0
-
-    ### Publications en collaboration avec l'industrie de -6 ans à l'année prochaine ###
-    # Calcul le total des "ScholarlyOutputs" pour les 5 dernières années - 1 complètes ainsi que l'année en cours et l'année future
-    tot_scholarly_5ycf = sum([liste_sch_out[-1][4]] + _replace_none_with_zero(au.get_metrics_Other(metricType='ScholarlyOutput', yearRange='5yrsAndCurrentAndFuture').List[-1]))
-    # Calcul le total des "AcademicCorporateCollaborations" pour les 5 dernières années - 1 complètes ainsi que l'année en cours et l'année future
-    tot_acad_collab = sum(_replace_none_with_zero([au.get_metrics_Collaboration(metricType='AcademicCorporateCollaboration', yearRange='10yrs', collabType='Academic-corporate collaboration').List[-1][4]] + au.get_metrics_Collaboration(metricType='AcademicCorporateCollaboration', yearRange='5yrsAndCurrentAndFuture', collabType='Academic-corporate collaboration').List[-1]))
-    # Calcul final : rapport des totaux multiplié par 100 pour avoir en pourcentage et arrondi au dixième ET valeur mis à 0 si tot_scholarly_5ycf vaut 0
-    acad_collab = round(tot_acad_collab/tot_scholarly_5ycf*100, 1) if tot_scholarly_5ycf != 0 else 0
-
-    ###### Moyennes de citations par publication ET MCR
-    # Créé la liste des "ScholarlyOutputs" avec seulement les types Articles et ConferencePapers, et dynamiquement via l'index adapté
-    liste_sch_out_10y_adapted_ArticlesConf = _replace_none_with_zero(au.get_metrics_Other(metricType='ScholarlyOutput', yearRange='10yrs', includedDocs='ArticlesConferencePapers').List)[-1][index_10y_adapted:9]
-    # Constante résultante de la somme des éléments de la liste ci-dessus
-    tot_liste_sch_out_10y_adapted_ArticlesConf = sum(liste_sch_out_10y_adapted_ArticlesConf)
-
-    ### Moyenne de citations par publication ###
-    # Créé la liste des "CitationsPerPublication" avec seulement les types Articles et ConferencePapers, et dynamiquement via l'index adapté
-    liste_cit_per_pub = _replace_none_with_zero(au.get_metrics_Other(metricType='CitationsPerPublication', yearRange='10yrs', includedDocs='ArticlesConferencePapers').List[-1][index_10y_adapted:9])
-    # Calcul final : produit du nombre de documents publiés par la moy de citations par pub. par année, divisé par le total de documents publiés sur le range d'années,
-    # arrondi au dixième ET valeur mis à 0 si tot_liste_sch_out_10y_adapted_ArticlesConf vaut 0
-    cit_per_pub = round(sum([elem1 * elem2 for elem1, elem2 in zip(liste_sch_out_10y_adapted_ArticlesConf, liste_cit_per_pub)])/tot_liste_sch_out_10y_adapted_ArticlesConf, 1) if tot_liste_sch_out_10y_adapted_ArticlesConf != 0 else 0
-
-    ### Moyenne MCR ###
-    # Créé la liste des "FieldWeightedCitationImpact" avec seulement les types Articles et ConferencePapers, et dynamiquement via l'index adapté
-    liste_moy_MCR = _replace_none_with_zero(au.get_metrics_Other(metricType='FieldWeightedCitationImpact', yearRange='10yrs', includedDocs='ArticlesConferencePapers').List[-1][index_10y_adapted:9])
-    # Calcul final : produit du nombre de documents publiés par la moy MCR par année, divisé par le total de documents publiés sur le range d'années,
-    # arrondi au centième ET valeur mis à 0 si tot_liste_sch_out_10y_adapted_ArticlesConf vaut 0
-    moy_MCR = round(sum([elem1 * elem2 for elem1, elem2 in zip(liste_sch_out_10y_adapted_ArticlesConf, liste_moy_MCR)])/tot_liste_sch_out_10y_adapted_ArticlesConf, 2) if tot_liste_sch_out_10y_adapted_ArticlesConf != 0 else 0
-
-    return [top_citations, cit_per_pub, moy_MCR, acad_collab], annee_10y_adapt, au._header
+    au = AuthorLookup(author_id=author_eid, refresh=10)
+    _precharger_metriques(au)
+
+    valeurs, annee_10y_adapt = _calcul_encadre(au, '', years_list)
+
+    return valeurs, annee_10y_adapt, au._header
+
+
+# Fonction qui retourne un DataFrame des valeurs de l'encadré pour tous les professeurs de la feuille Noms_Profs_ETS de INFO.xlsx,
+# en regroupant les auteurs par lots de SCIVAL_MAX_AUTHORS dans les appels à SciVal (quelques dizaines d'appels au lieu de plusieurs milliers)
+def valeurs_encadre_profs_ETS(years_list: list, console: QPlainTextEdit):
+    df = load_ETS_profs(console)
+    # La colonne 'Affiliation ID' de la feuille Noms_Profs_ETS contient les ID Scopus des professeurs
+    if df is None or 'Affiliation ID' not in df.columns:
+        console.append('<p style={}>! Colonne Affiliation ID manquante dans la feuille Noms_Profs_ETS.</p>'.format(text_style_warning))
+        return
+    df = df.dropna(subset=['Affiliation ID'])
+    author_ids = [str(int(aff_id)) if isinstance(aff_id, float) else str(aff_id).split('-')[-1] for aff_id in df['Affiliation ID']]
+    if not author_ids:
+        return
+
+    valeurs = valeurs_encadre_auteurs(author_ids, years_list)
+    lignes = [[row.get('Nom_prof_ETS'), row.get('Département'), author_id] + valeurs[author_id]
+              for (_, row), author_id in zip(df.iterrows(), author_ids)]
+
+    return pd.DataFrame(lignes, columns=['Nom_prof_ETS', 'Département', 'Author ID', 'Publications très citées (%)',
+                                         'Citations par publication', 'MCR', 'Collaboration industrie (%)'])
 
 
 # Fonction utilitaire pour gérer l'affichage mais aussi la création la liste des années sélectionnées
@@ -783,7 +699,7 @@ def tab_graph_publications(au_retrieval: AuthorRetrieval, document_eids: list, l
     liste_annees = [[str(annee) for annee in sous_liste] for sous_liste in liste_annees]
 
     # Filtrer les documents en fonction des EIDs spécifiés
-    docs = pd.DataFrame(au_retrieval.get_documents(refresh=10))
+    docs = documents_chercheur(au_retrieval)
     docs_filtered = docs[docs['eid'].isin(document_eids)]
 
     # Extraire les années de publication
@@ -862,7 +778,8 @@ def tab_graph_SNIP(author_id: str, years_list: list, console: pd.DataFrame, wind
     years_list = [[int(item) for item in sublist] for sublist in years_list]
 
     # Instance de l'objet AuthorLookup correspondant à la personne sélectionnée via l'ID
-    au = AuthorLookup(author_id=author_id, refresh=True)
+    au = AuthorLookup(author_id=author_id, refresh=10)
+    _precharger_metriques(au)
 
     # Obtient via l'instance les metrics "PublicationsInTopJournalPercentiles" avec seulement les types Articles et Reviews
     # sur les 10 dernières années complètes sous forme de liste ten_y_cf_list
@@ -933,7 +850,8 @@ def _for_Collab_list_10y_current_future(lst: list):
 # Fonction qui retourne un DataFrame (tableau) pour le graphique Collaborations du rapport
 def tab_graph_Collab(author_id: str, years_list: list, console: pd.DataFrame, window_width: int):
     # Instance de l'objet AuthorLookup correspondant à la personne sélectionnée via l'ID
-    au = AuthorLookup(author_id=author_id, refresh=True)
+    au = AuthorLookup(author_id=author_id, refresh=10)
+    _precharger_metriques(au)
 
     # Obtient via l'instance les metrics "Collaboration" sur les 10 dernières années complètes sous forme de liste ten_y_cf_list
     ten_y_cf_list = _for_Collab_list_10y_current_future(au._get_metrics_rawdata(metricType='Collaboration', yearRange='10yrs'))
@@ -1262,6 +1180,45 @@ def Excel_part2(excel, classeur, df: pd.DataFrame, df_SNIP: pd.DataFrame, df_Col
 
 #-------------------------------------Nouvelles fonctions d'Autobib+-------------------------------------------------
 
+# Nombre de résultats d'une page de ScopusSearch, traités ensemble par collaborationExtract
+TAILLE_PAGE_COLLABORATIONS = 25
+
+# Champs des résultats de ScopusSearch lus par extraire_collaborations : seuls ces champs sont téléchargés
+CHAMPS_COLLABORATIONS = ['eid', 'title', 'author_names', 'author_ids', 'author_afids', 'publicationName',
+                         'coverDisplayDate', 'citedby_count', 'doi', 'authkeywords', 'afid', 'affilname',
+                         'affiliation_country', 'subtype', 'fund_sponsor', 'fund_acr']
+
+# Fonction qui extrait les informations d'une page de collaborations, après avoir téléchargé en parallèle leurs
+# résumés (mis en cache pour getAbstract)
+def extraire_collaborations(collaborations: list, keys: list):
+    if not collaborations:
+        return []
+    prefetchAbstracts([collaboration.eid for collaboration in collaborations], keys)
+    results = []
+    for collaboration in collaborations:
+        results.append({
+            'EID': collaboration.eid,
+            'Abstract': getAbstract(collaboration.eid, keys),
+            'Title': collaboration.title,
+            # 'Source title': collaboration.subtype,
+            'Authors': collaboration.author_names,
+            'Authors ID': collaboration.author_ids,
+            'Authors affiliations': collaboration.author_afids,
+            'PublicationName': collaboration.publicationName,
+            'Year': collaboration.coverDisplayDate[-4:],  # Garder les 4 derniers chiffres de la date (l'annee)
+            'Cited By': collaboration.citedby_count,
+            'DOI': collaboration.doi,
+            'Authors keywords': collaboration.authkeywords, 
+            # 'AggregationType': collaboration.aggregationType,
+            'Nbre de publications': collaboration.afid,
+            'affilname': collaboration.affilname,
+            'Countries': collaboration.affiliation_country,
+            'DocumentType': collaboration.subtype, 
+            'Funding details': collaboration.fund_sponsor,
+            'Funding texts': collaboration.fund_acr,
+        })
+    return results
+
 def collaborationExtract(researchersA: list = None, institutionsA: list = None, researchersB: list = None, institutionsB: list = None,\
                          country: str = None, start_year: int = None, end_year: int = None, keys: list = None, console: QPlainTextEdit = None):
     # Construction de la requete pour les collabs entre l'entité A et l'entité B
@@ -1296,34 +1253,21 @@ def collaborationExtract(researchersA: list = None, institutionsA: list = None,
     RequestQuery = f"({query_partA}) AND ({query_partB})"
     
     try:
-        # Recherche sur Scopus avec la clé API et le Token
-        search = ScopusSearch(query=RequestQuery, api_key= keys[0], token= keys[1])
-        if search.results is not None:
-            # Extraction des résultats
-            results = []
-            for collaboration in search.results:
-                results.append({
-                    'EID': collaboration.eid,
-                    'Abstract': getAbstract(collaboration.eid, keys),
-                    'Title': collaboration.title,
-                    # 'Source title': collaboration.subtype,
-                    'Authors': collaboration.author_names,
-                    'Authors ID': collaboration.author_ids,
-                    'Authors affiliations': collaboration.author_afids,
-                    'PublicationName': collaboration.publicationName,
-                    'Year': collaboration.coverDisplayDate[-4:],  # Garder les 4 derniers chiffres de la date (l'annee)
-                    'Cited By': collaboration.citedby_count,
-                    'DOI': collaboration.doi,
-                    'Authors keywords': collaboration.authkeywords, 
-                    # 'AggregationType': collaboration.aggregationType,
-                    'Nbre de publications': collaboration.afid,
-                    'affilname': collaboration.affilname,
-                    'Countries': collaboration.affiliation_country,
-                    'DocumentType': collaboration.subtype, 
-                    'Funding details': collaboration.fund_sponsor,
-                    'Funding texts': collaboration.fund_acr,
-                })
-            
+        # Recherche sur Scopus avec la clé API et le Token (cache mis à jour de façon incrémentale après 7 jours) ;
+        # les résultats sont traités page par page, pendant le téléchargement des pages suivantes ; une recherche trop large
+        # (plus de 5000 résultats) est découpée par années de publication et par types de documents ; seuls les champs
+        # de CHAMPS_COLLABORATIONS sont téléchargés
+        search = ScopusSearch(query=RequestQuery, api_key= keys[0], token= keys[1], refresh=7, incremental=True, download=False,
+                              partition=True, fields=CHAMPS_COLLABORATIONS)
+        results = []
+        page = []
+        for collaboration in search.iter_results():
+            page.append(collaboration)
+            if len(page) == TAILLE_PAGE_COLLABORATIONS:
+                results += extraire_collaborations(page, keys)
+                page = []
+        results += extraire_collaborations(page, keys)
+        if results:
             # Conversion des résultats en DataFrame pandas
             df = pd.DataFrame(results)
             return df
@@ -1993,6 +1937,10 @@ def getAuthorORCID(authorId: str, keys: list):
             return orcid
         else: return 'NONE'
 
+# Télécharge de manière concurrente les résumés d'une liste d'EIDs afin que les appels à getAbstract soient servis par le cache
+def prefetchAbstracts(EIDs: list, keys: list):
+    asyncio.run(AsyncAbstractRetrieval.create_many(EIDs, return_exceptions=True, api_key= keys[0], token= keys[1]))
+
 def getAbstract(EID: str, keys: list):
     try : 
         search = AbstractRetrieval(identifier=EID, api_key= keys[0], token= keys[1])
@@ -0,0 +1,139 @@
+"""
+Préchauffage du cache des API Scopus et SciVal à partir des listes de INFO.xlsx :
+
+  ● Feuille Noms_Profs_ETS : profil (AuthorRetrieval), documents (documents_chercheur), citations par année (CitationOverview)
+    et métriques SciVal du rapport (AuthorLookup) de chaque professeur
+  ● Feuilles Liste_ORN, Reseau_UQ et Reseau_ETS : profil (AffiliationRetrieval) de chaque établissement
+
+Le préchauffage a lieu dans une plage horaire creuse (par défaut de 20h à 6h) et respecte les limites de débit des API,
+gérées par pybliometrics. Un rapport sur une personne de la liste démarre ensuite à partir d'un cache chaud, à condition
+que les politiques de fraîcheur ([Freshness] du fichier de configuration) couvrent les API appelées avec refresh=True.
+
+Utilisation, depuis la racine du projet :
+
+    python -m Include.Warmer [--fichier INFO.xlsx] [--debut 20] [--fin 6] [--maintenant] [--boucle]
+"""
+
+import argparse, logging, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Importations locales
+from .pybliometrics.scopus.affiliation_retrieval import AffiliationRetrieval
+from .pybliometrics.scopus.author_retrieval import AuthorRetrieval
+from .pybliometrics.scival.author_lookup import AuthorLookup
+from .Donnees import _precharger_metriques, documents_chercheur, donnees_citations_graph_citations
+
+logger = logging.getLogger(__name__)
+
+# Feuilles de INFO.xlsx dont la colonne 'Affiliation ID' contient des ID d'auteurs et des ID d'établissements
+FEUILLES_AUTEURS = ['Noms_Profs_ETS']
+FEUILLES_ETABLISSEMENTS = ['Liste_ORN', 'Reseau_UQ', 'Reseau_ETS']
+
+
+# Fonction qui retourne les ID (sans doublons, dans l'ordre) de la colonne 'Affiliation ID' des feuilles données
+def lire_ids(fichier: str, feuilles: list):
+    ids = []
+    for feuille in feuilles:
+        try:
+            df = pd.read_excel(fichier, sheet_name=feuille)
+        except (FileNotFoundError, ValueError):
+            logger.warning("Feuille %s non trouvée dans %s.", feuille, fichier)
+            continue
+        if 'Affiliation ID' not in df.columns:
+            logger.warning("Colonne Affiliation ID manquante dans la feuille %s.", feuille)
+            continue
+        for valeur in df['Affiliation ID'].dropna():
+            ids.append(str(int(valeur)) if isinstance(valeur, float) else str(valeur).split('-')[-1])
+    return list(dict.fromkeys(ids))
+
+
+# Fonction qui indique si l'heure donnée est dans la plage creuse [debut, fin[ (plage pouvant passer minuit)
+def dans_plage_creuse(maintenant: datetime, debut: int, fin: int):
+    if debut <= fin:
+        return debut <= maintenant.hour < fin
+    return maintenant.hour >= debut or maintenant.hour < fin
+
+
+# Fonction qui attend le début de la prochaine plage creuse
+def attendre_plage_creuse(debut: int, fin: int):
+    maintenant = datetime.now()
+    if dans_plage_creuse(maintenant, debut, fin):
+        return
+    prochain = maintenant.replace(hour=debut, minute=0, second=0, microsecond=0)
+    if prochain <= maintenant:
+        prochain += timedelta(days=1)
+    logger.info("En attente de la plage creuse (%s).", f"{prochain:%Y-%m-%d %H:%M}")
+    time.sleep((prochain - maintenant).total_seconds())
+
+
+# Fonction qui précharge tout ce qu'un rapport demande pour un professeur : profil, documents,
+# citations par année (tous les lots de documents, quels que soient les types sélectionnés dans le rapport)
+# et métriques SciVal regroupées
+def prechauffer_auteur(author_id: str):
+    au_retrieval = AuthorRetrieval(author_id, refresh=1)
+    eids = documents_chercheur(au_retrieval, refresh=1)['eid'].tolist()
+    if eids and au_retrieval.publication_range:
+        donnees_citations_graph_citations(au_retrieval, eids)
+    _precharger_metriques(AuthorLookup(author_id=author_id, refresh=1))
+
+
+# Fonction qui précharge le profil d'un établissement
+def prechauffer_etablissement(affiliation_id: str):
+    AffiliationRetrieval(affiliation_id, refresh=1)
+
+
+# Fonction qui préchauffe le cache pour toutes les entités de INFO.xlsx, en s'arrêtant à la fin de la plage creuse
+# (sauf si hors_plage est vrai) ; retourne le nombre d'entités préchauffées
+def prechauffer(fichier: str = "INFO.xlsx", debut: int = 20, fin: int = 6, hors_plage: bool = False, nb_threads: int = 4):
+    taches = [(prechauffer_auteur, author_id) for author_id in lire_ids(fichier, FEUILLES_AUTEURS)]
+    taches += [(prechauffer_etablissement, aff_id) for aff_id in lire_ids(fichier, FEUILLES_ETABLISSEMENTS)]
+    logger.info("%d entités à préchauffer.", len(taches))
+
+    # Fonction exécutée par les threads : une entité, sauf si la plage creuse est terminée
+    def executer(tache):
+        fonction, identifiant = tache
+        if not hors_plage and not dans_plage_creuse(datetime.now(), debut, fin):
+            return False
+        try:
+            fonction(identifiant)
+        except Exception as erreur:
+            logger.error("Erreur pour %s : %s", identifiant, erreur)
+            return False
+        return True
+
+    # Les limites de débit et de concurrence de pybliometrics s'appliquent à tous les threads
+    with ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        nb_ok = sum(executor.map(executer, taches))
+    logger.info("%d/%d entités préchauffées.", nb_ok, len(taches))
+    return nb_ok
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Préchauffage du cache à partir de INFO.xlsx")
+    parser.add_argument("--fichier", default="INFO.xlsx", help="chemin de INFO.xlsx")
+    parser.add_argument("--debut", type=int, default=20, help="heure de début de la plage creuse")
+    parser.add_argument("--fin", type=int, default=6, help="heure de fin de la plage creuse")
+    parser.add_argument("--threads", type=int, default=4, help="nombre d'entités préchauffées en parallèle")
+    parser.add_argument("--maintenant", action="store_true", help="préchauffer immédiatement, sans plage creuse")
+    parser.add_argument("--boucle", action="store_true", help="recommencer à chaque plage creuse")
+    opts = parser.parse_args(args)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    while True:
+        if not opts.maintenant:
+            attendre_plage_creuse(opts.debut, opts.fin)
+        prechauffer(opts.fichier, opts.debut, opts.fin, opts.maintenant, opts.threads)
+        if not opts.boucle:
+            return
+        # Attend la fin de la plage creuse en cours avant d'attendre la suivante
+        while not opts.maintenant and dans_plage_creuse(datetime.now(), opts.debut, opts.fin):
+            time.sleep(600)
+        if opts.maintenant:
+            time.sleep(86400)
+
+
+if __name__ == '__main__':
+    main()
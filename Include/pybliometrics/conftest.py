@@ -0,0 +1,56 @@
+"""Setup of the tests of pybliometrics.
+
+The tests import the package as `Include.pybliometrics`, from the root of
+the project, whatever the directory pytest runs from.  They run offline
+against the stand-in server of `utils/standin_server.py`, with a temporary
+configuration file: both must be in place before pybliometrics is imported,
+hence at the import of this module.
+"""
+
+import configparser
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from Include.pybliometrics.utils.standin_server import StandinServer
+
+# API keys of the configuration file
+KEYS = ['key1', 'key2']
+
+_folder = Path(tempfile.mkdtemp(prefix="pybliometrics-tests-"))
+SERVER = StandinServer().start()
+os.environ['PYB_API_BASE'] = SERVER.url
+os.environ['PYB_CONFIG_FILE'] = str(_folder/"config.ini")
+
+from Include.pybliometrics.utils.constants import DEFAULT_PATHS
+
+_config = configparser.ConfigParser()
+_config.optionxform = str
+_config['Directories'] = {api: str(_folder/"cache"/api)
+                          for api in DEFAULT_PATHS}
+_config['Authentication'] = {'APIKey': ", ".join(KEYS)}
+_config['Requests'] = {'Timeout': '20', 'Retries': '2', 'RateLimitDir': ''}
+_config['Cache'] = {'Backend': 'file', 'Compression': 'gzip',
+                    'HousekeepingInterval': '0', 'NegativeTTL': '1'}
+_config['Docs Path'] = {'Path': str(_folder/"docs")}
+with open(os.environ['PYB_CONFIG_FILE'], "w") as ouf:
+    _config.write(ouf)
+
+
+@pytest.fixture
+def server():
+    """The stand-in server with fresh quotas, restored to its settings
+    after the test.
+    """
+    settings = (SERVER.size, SERVER.quota, SERVER.error_rate)
+    with SERVER._lock:
+        SERVER._used.clear()
+    yield SERVER
+    SERVER.size, SERVER.quota, SERVER.error_rate = settings
@@ -1,11 +1,12 @@
-from typing import Union, Literal
+from typing import Literal, Sequence, Union
 import pandas as pd
 
 
+from ..superclasses.async_base import AsyncBase
 from ..superclasses.lookup import Lookup
 from ..utils.get_content import get_content
 from ..utils.parse_content import chained_get
-from ..utils.constants import URLS
+from ..utils.constants import SCIVAL_MAX_AUTHORS, URLS
 
 
 class AuthorLookup(Lookup):
@@ -15,6 +16,8 @@ class AuthorLookup(Lookup):
     includedDocs_list = Literal['AllPublicationTypes', 'ArticlesOnly', 'ArticlesReviews', 'ArticlesReviewsConferencePapers', 'ArticlesReviewsConferencePapersBooksAndBookChapters', 'ConferencePapersOnly', 'ArticlesConferencePapers', 'BooksAndBookChapters']
     journalImpactType_list = Literal['CiteScore', 'SNIP', 'SJR']
     indexType_list = Literal['hIndex', 'h5Index', 'gIndex', 'mIndex']
+    # Metric types whose values depend on parameter journalImpactType
+    journal_metrics = ('PublicationsInTopJournalPercentiles',)
 
     @property
     def name(self):
@@ -77,6 +80,7 @@ class AuthorLookup(Lookup):
                         complement="metrics",
                         **kwds)
         self.kwds = kwds
+        self._prefetched = {}
 
         # Parse json
         self._results = self._json['results'][0]
@@ -119,10 +123,115 @@ class AuthorLookup(Lookup):
             "indexType": indexType
         }
 
-        response = get_content(url=URLS['AuthorLookup']+'metrics', api='AuthorLookup', params=params, **self.kwds)
-        data = response.json()['results'][0]['metrics'][0]
+        try:
+            data = self._prefetched[self._prefetch_key(metricType, params)]
+        except KeyError:
+            response = self._get_cached_json(URLS['AuthorLookup']+'metrics', 'AuthorLookup', params, 'metrics', **self.kwds)
+            data = response['results'][0]['metrics'][0]
         last_key = list(data.keys())[-1]
         return data[last_key]
+
+    def prefetch_metrics(self,
+                    metricTypes: Sequence[metricType_liste],
+                    author_ids: str = '',
+                    yearRange: yearRange_list = '5yrs',
+                    subjectAreaFilterURI: str = '',
+                    includeSelfCitations: bool = True,
+                    byYear: bool = True,
+                    includedDocs: includedDocs_list = 'AllPublicationTypes',
+                    journalImpactType: journalImpactType_list = 'CiteScore',
+                    showAsFieldWeighted: bool = False,
+                    indexType: indexType_list = 'hIndex') -> None:
+        """Request several metric types in a single call.  Subsequent calls
+        of the `get_metrics_*()` methods with the same parameters read from
+        this bundle instead of requesting one metric type each.
+
+        :param metricTypes: The metric types to request.
+        :param author_ids: The (comma-separated) IDs of the authors, by
+                           default the ID of the instance.  The metrics
+                           of each author are read with `author_ids` set
+                           to the ID of that author.
+
+        The remaining parameters are those of the `get_metrics_*()` methods.
+        `journalImpactType` only matters for PublicationsInTopJournalPercentiles.
+        """
+        author_ids = self._id if author_ids == '' else author_ids
+
+        params = {
+            "authors": author_ids,
+            "metricTypes": ",".join(metricTypes),
+            "yearRange": yearRange,
+            "subjectAreaFilterURI": subjectAreaFilterURI,
+            "includeSelfCitations": includeSelfCitations,
+            "byYear": byYear,
+            "includedDocs": includedDocs,
+            "journalImpactType": journalImpactType,
+            "showAsFieldWeighted": showAsFieldWeighted,
+            "indexType": indexType
+        }
+
+        response = self._get_cached_json(URLS['AuthorLookup']+'metrics', 'AuthorLookup', params, 'metrics', **self.kwds)
+        for result in response['results']:
+            author_params = {**params, "authors": str(chained_get(result, ['author', 'id']))}
+            for data in result['metrics']:
+                self._prefetched[self._prefetch_key(data['metricType'], author_params)] = data
+
+    def prefetch_metrics_batch(self,
+                    author_ids: Sequence[Union[int, str]],
+                    metricTypes: Sequence[metricType_liste],
+                    **kwds) -> None:
+        """Prefetch the metrics of many authors with `SCIVAL_MAX_AUTHORS`
+        authors per request.  Afterwards, the `get_metrics_*()` methods
+        called with `author_ids` set to one of these IDs and the same
+        parameters make no request.
+
+        :param author_ids: The IDs or EIDs of the authors.
+        :param metricTypes: The metric types to request.
+        :param kwds: The remaining parameters of `prefetch_metrics()`.
+        """
+        author_ids = list(dict.fromkeys(str(a).split('-')[-1] for a in author_ids))
+        for start in range(0, len(author_ids), SCIVAL_MAX_AUTHORS):
+            chunk = author_ids[start:start+SCIVAL_MAX_AUTHORS]
+            self.prefetch_metrics(metricTypes, author_ids=",".join(chunk), **kwds)
+
+    def metrics_table(self,
+                    author_ids: Sequence[Union[int, str]],
+                    metricTypes: Sequence[metricType_liste],
+                    **kwds) -> pd.DataFrame:
+        """Return the metrics of many authors as a table with one row per
+        author, metric type, sub-type (collabType or threshold, if any)
+        and year, requested with `SCIVAL_MAX_AUTHORS` authors per request.
+
+        :param author_ids: The IDs or EIDs of the authors.
+        :param metricTypes: The metric types to request.
+        :param kwds: The remaining parameters of `prefetch_metrics()`,
+                     but `byYear`.
+        """
+        kwds['byYear'] = True
+        self.prefetch_metrics_batch(author_ids, metricTypes, **kwds)
+        rows = []
+        for author_id in dict.fromkeys(str(a).split('-')[-1] for a in author_ids):
+            for metricType in metricTypes:
+                data = self._get_metrics_rawdata(author_id, metricType, **kwds)
+                if isinstance(data, dict):
+                    data = [{'valueByYear': data}]
+                for item in data:
+                    sub_type = item.get('collabType', item.get('threshold'))
+                    percentages = item.get('percentageByYear') or {}
+                    for year, value in (item.get('valueByYear') or {}).items():
+                        rows.append((author_id, metricType, sub_type, int(year),
+                                     value, percentages.get(year)))
+        columns = ['author_id', 'metricType', 'subType', 'year', 'value', 'percentage']
+        return pd.DataFrame(rows, columns=columns)
+
+    def _prefetch_key(self, metricType: str, params: dict) -> tuple:
+        """Key of a prefetched metric: its type and all other parameters
+        that influence its values.
+        """
+        others = {k: v for k, v in params.items() if k != 'metricTypes'}
+        if metricType not in self.journal_metrics:
+            others['journalImpactType'] = None
+        return (metricType, *sorted(others.items()))
     
     def get_metrics_Collaboration(self, 
                 author_ids: str = '',
@@ -235,6 +344,13 @@ class AuthorLookup(Lookup):
         return result_dict
 
 
+class AsyncAuthorLookup(AsyncBase, AuthorLookup):
+    """Asynchronous variant of `AuthorLookup`: use
+    `await AsyncAuthorLookup.create(...)` or
+    `await AsyncAuthorLookup.create_many([...], ...)` with the parameters
+    of `AuthorLookup`.
+    """
+
 
 class MetricsFormatage():
     @property
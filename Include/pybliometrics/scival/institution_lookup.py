@@ -2,7 +2,6 @@ from typing import Union, Literal
 import pandas as pd
 
 from ..superclasses.insLookup import InsLookup
-from ..utils.get_content import get_content
 from ..utils.parse_content import chained_get
 from ..utils.constants import URLS
 
@@ -96,8 +95,8 @@ class InstitutionLookup(InsLookup):
             "insttoken":self._token,
         }
 
-        response = get_content(url=URLS['InstitutionLookup']+'metrics', api='InstitutionLookup', params=params, **self.kwds)
-        data = response.json()['results'][0]['metrics'][0]
+        response = self._get_cached_json(URLS['InstitutionLookup']+'metrics', 'InstitutionLookup', params, 'metrics', **self.kwds)
+        data = response['results'][0]['metrics'][0]
         # data = response.json()['results'][0]['metrics'][0]
         '''last_key = list(data.keys())[-1]
         return data[last_key]'''
@@ -0,0 +1,71 @@
+"""Tests for `scival.author_lookup` module."""
+
+import os
+from time import sleep, time
+
+from Include.pybliometrics.scival.author_lookup import AuthorLookup
+from Include.pybliometrics.utils.cache import FileCache, get_memory_cache
+
+
+def metrics_keys():
+    """The keys of the cached metrics responses."""
+    return {key for key in FileCache().keys()
+            if key[0] == 'AuthorLookup' and key[1] == 'metrics'}
+
+
+def age(key, days):
+    """Make the file cache entry `key` older by `days`."""
+    mtime = time() - days*86400
+    os.utime(FileCache().path(key), (mtime, mtime))
+    get_memory_cache().discard(key)
+
+
+def test_metrics_refresh_days(server):
+    before = metrics_keys()
+    au = AuthorLookup('7004212775', refresh=10)
+    au.prefetch_metrics(['ScholarlyOutput', 'CitationCount'])
+    (key,) = metrics_keys() - before
+    # Stale under the default policy (max-age=7), but younger than refresh
+    age(key, 8)
+    requests = server.requests
+    AuthorLookup('7004212775', refresh=10).prefetch_metrics(
+        ['ScholarlyOutput', 'CitationCount'])
+    sleep(0.2)  # No revalidation in the background either
+    assert server.requests == requests
+    # Older than refresh: downloaded again before use
+    age(key, 12)
+    AuthorLookup('7004212775', refresh=10).prefetch_metrics(
+        ['ScholarlyOutput', 'CitationCount'])
+    assert server.requests == requests + 1
+
+
+def test_prefetch_metrics_batch(server):
+    au = AuthorLookup('7004212776')
+    author_ids = [str(7100000000 + i) for i in range(250)]
+    requests = server.requests
+    au.prefetch_metrics_batch(author_ids + author_ids[:10],
+                              ['ScholarlyOutput', 'CitationCount'])
+    # One request per SCIVAL_MAX_AUTHORS authors, duplicates ignored
+    assert server.requests == requests + 3
+    for author_id in (author_ids[0], author_ids[-1]):
+        au.get_metrics_Other(author_ids=author_id, metricType='CitationCount')
+    assert server.requests == requests + 3
+
+
+def test_encadre_of_many_authors(server):
+    # The encadré of the department-wide report in Include/Donnees.py
+    from Include.Donnees import METRIQUES_ENCADRE, _calcul_encadre, \
+        _precharger_metriques, valeurs_encadre_auteurs
+
+    author_ids = [str(7200000000 + i) for i in range(150)]
+    years = list(range(2016, 2027))
+    requests = server.requests
+    valeurs = valeurs_encadre_auteurs(author_ids, years)
+    # The instance, then two batches per combination of metrics
+    assert server.requests == requests + 1 + 2*len(METRIQUES_ENCADRE)
+    assert list(valeurs) == author_ids
+    # Same values as the report of a single author
+    for author_id in (author_ids[0], author_ids[-1]):
+        au = AuthorLookup(author_id)
+        _precharger_metriques(au)
+        assert valeurs[author_id] == _calcul_encadre(au, '', years)[0]
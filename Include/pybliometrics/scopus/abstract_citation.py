@@ -1,10 +1,13 @@
 from collections import namedtuple
 from datetime import datetime
 from hashlib import md5
+from json import loads
 from typing import List, NamedTuple, Optional, Tuple, Union
 from warnings import warn
 
+from ..superclasses.async_base import AsyncBase
 from ..superclasses.retrieval import Retrieval
+from ..utils.cache import get_cache
 from ..utils.parse_content import chained_get
 from ..utils.checks import check_parameter_value
 
@@ -238,9 +241,14 @@ class CitationOverview(Retrieval):
 
         Notes
         -----
-        The directory for cached results is `{path}/STANDARD/{id}-{citation}`,
-        where `path` is specified in your configuration file, and `id` the
-        md5-hashed version of a string joining `identifier` on underscore.
+        The directory for cached results is
+        `{path}/STANDARD/{id}-{start}-{end}-{citation}`, where `path` is
+        specified in your configuration file, `id` the md5-hashed version of
+        a string joining `identifier` on underscore, and `-{citation}` is
+        omitted if `citation` is None.  Entries of earlier versions, cached
+        as `{path}/STANDARD/{id}` whatever the years and the citations, are
+        moved to the new name if they cover the same years and `citation`
+        is None, and ignored otherwise.
 
         Your API Key needs to be augmented by Elsevier's Scopus
         Integration Team to access this API.
@@ -272,7 +280,12 @@ class CitationOverview(Retrieval):
         # Get file content
         date = f'{start}-{end}'
         kwds.update({id_type: identifier})
-        stem = md5("_".join(identifier).encode('utf8')).hexdigest()
+        legacy = md5("_".join(identifier).encode('utf8')).hexdigest()
+        stem = f'{legacy}-{self._start}-{self._end}'
+        if citation:
+            stem += f'-{citation}'
+        else:
+            _migrate_legacy(legacy, stem, self._start, self._end)
         Retrieval.__init__(self, stem, api='CitationOverview', date=date,
                            citation=citation, **kwds)
         self._data = self._json['abstract-citations-response']
@@ -298,6 +311,36 @@ class CitationOverview(Retrieval):
         return s
 
 
+class AsyncCitationOverview(AsyncBase, CitationOverview):
+    """Asynchronous variant of `CitationOverview`: use
+    `await AsyncCitationOverview.create(...)` or
+    `await AsyncCitationOverview.create_many([...], ...)` with the parameters
+    of `CitationOverview`.
+    """
+
+
+def _migrate_legacy(legacy, stem, start, end):
+    """Auxiliary function to move the entry cached under the stem of earlier
+    versions, which ignored the years, to `stem` if it covers the years
+    `start` to `end`.
+    """
+    cache = get_cache()
+    old = ("CitationOverview", "STANDARD", legacy)
+    if cache.mtime(old) is None or \
+            cache.mtime(("CitationOverview", "STANDARD", stem)) is not None:
+        return
+    try:
+        header = loads(cache.read(old))['abstract-citations-response']
+        headings = header['citeColumnTotalXML']['citeCountHeader']['columnHeading']
+    except (KeyError, TypeError, ValueError):
+        return
+    if isinstance(headings, dict):
+        headings = [headings]
+    years = [int(h['$']) for h in headings]
+    if years == list(range(start, end + 1)):
+        cache.rename(old, ("CitationOverview", "STANDARD", stem))
+
+
 def _parse_dict(dct):
     """Auxiliary function to change the keys of a dictionary."""
     return {k.split(":", 1)[-1]: v for k, v in dct.items()}
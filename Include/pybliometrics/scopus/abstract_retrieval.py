@@ -1,6 +1,7 @@
 from collections import namedtuple
 from typing import List, NamedTuple, Optional, Tuple, Union
 
+from ..superclasses.async_base import AsyncBase
 from ..superclasses.retrieval import Retrieval
 from ..utils.parse_content import chained_get, get_link,deduplicate, \
     listify, make_int_if_possible, parse_date_created, get_id
@@ -69,7 +70,7 @@ class AbstractRetrieval(Retrieval):
                  'addresspart country collaboration auid orcid indexed_name '\
                  'surname given_name'
         auth = namedtuple('Author', fields)
-        items = listify(self._head.get('author-group', []))
+        items = list(listify(self._head.get('author-group', [])))
         index_path = ['preferred-name', 'ce:indexed-name']
         # Check for collaboration
         keys = [k for x in items for k in list(x.keys())]
@@ -863,6 +864,14 @@ class AbstractRetrieval(Retrieval):
         return ris
 
 
+class AsyncAbstractRetrieval(AsyncBase, AbstractRetrieval):
+    """Asynchronous variant of `AbstractRetrieval`: use
+    `await AsyncAbstractRetrieval.create(...)` or
+    `await AsyncAbstractRetrieval.create_many([...], ...)` with the parameters
+    of `AbstractRetrieval`.
+    """
+
+
 def _get_org(aff):
     """Auxiliary function to extract org information from affiliation
     for authorgroup.
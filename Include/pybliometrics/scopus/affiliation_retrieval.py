@@ -1,6 +1,7 @@
 from collections import namedtuple
 from typing import List, NamedTuple, Optional, Tuple, Union
 
+from ..superclasses.async_base import AsyncBase
 from ..superclasses.retrieval import Retrieval
 from ..utils.parse_content import chained_get,\
     get_id, get_link, parse_date_created, make_int_if_possible # , VIEWS
@@ -187,3 +188,11 @@ class AffiliationRetrieval(Retrieval):
             f"{int(self.author_count):,} associated author(s) and "\
             f"{int(self.document_count):,} associated document(s) as of {date}"
         return s
+
+
+class AsyncAffiliationRetrieval(AsyncBase, AffiliationRetrieval):
+    """Asynchronous variant of `AffiliationRetrieval`: use
+    `await AsyncAffiliationRetrieval.create(...)` or
+    `await AsyncAffiliationRetrieval.create_many([...], ...)` with the parameters
+    of `AffiliationRetrieval`.
+    """
@@ -1,6 +1,7 @@
 from collections import namedtuple
 from typing import List, NamedTuple, Optional, Tuple, Union
 
+from ..superclasses.async_base import AsyncBase
 from ..superclasses.search import Search
 from ..utils.parse_content import check_integrity,\
     check_field_consistency, make_int_if_possible, make_search_summary
@@ -97,7 +98,8 @@ class AffiliationSearch(Search):
         -----
         The directory for cached results is `{path}/STANDARD/{fname}`,
         where  `path` is specified in your configuration file and `fname` is
-        the md5-hashed version of `query`.
+        the md5 hash of the canonical form of `query` and of the
+        parameters changing the results, see `utils/query.py`.
         """
         # Check
         allowed = ("warn", "raise")
@@ -120,3 +122,11 @@ class AffiliationSearch(Search):
         """Return a summary string."""
         res = [a['affiliation-name'] for a in self._json]
         return make_search_summary(self, "affiliation", res)
+
+
+class AsyncAffiliationSearch(AsyncBase, AffiliationSearch):
+    """Asynchronous variant of `AffiliationSearch`: use
+    `await AsyncAffiliationSearch.create(...)` or
+    `await AsyncAffiliationSearch.create_many([...], ...)` with the parameters
+    of `AffiliationSearch`.
+    """
@@ -6,6 +6,7 @@ from json import loads
 
 from .author_search import AuthorSearch
 from .scopus_search import ScopusSearch
+from ..superclasses.async_base import AsyncBase
 from ..superclasses.retrieval import Retrieval
 from ..utils.parse_content import chained_get, filter_digits, get_link, html_unescape, \
     listify, make_int_if_possible, parse_affiliation, parse_date_created
@@ -326,19 +327,25 @@ class AuthorRetrieval(Retrieval):
 
     def get_documents(self,
                       subtypes: List[str] = None,
+                      fields: List[str] = None,
                       *args: str, **kwds: str
                       ) -> Optional[List[NamedTuple]]:
         """Return list of the author's publications using a ScopusSearch()
         query, where publications may fit a specified set of document subtypes.
 
         :param subtypes: The type of documents that should be returned.
+        :param fields: The fields of the publications to download, see
+                       parameter `fields` of ScopusSearch().  The other
+                       fields are None.  If None, downloads all fields.
         :param args: Parameters to be passed on to ScopusSearch().
         :param kwds: Parameters to be passed on to ScopusSearch().
 
         Note: To update these results, use `refresh`; the class' `refresh`
         parameter is not used here.
         """
-        s = ScopusSearch(f'AU-ID({self.identifier})', **kwds)
+        if fields and subtypes:
+            fields = list(fields) + ['subtype']
+        s = ScopusSearch(f'AU-ID({self.identifier})', fields=fields, **kwds)
         if subtypes:
             return [p for p in s.results if p.subtype in subtypes]
         else:
@@ -380,3 +387,11 @@ class AuthorRetrieval(Retrieval):
             query = f"AUTHLAST({self.surname}) AND AUTHFIRST({self.given_name})"
         s = AuthorSearch(query, *args, **kwds)
         return s.get_results_size()
+
+
+class AsyncAuthorRetrieval(AsyncBase, AuthorRetrieval):
+    """Asynchronous variant of `AuthorRetrieval`: use
+    `await AsyncAuthorRetrieval.create(...)` or
+    `await AsyncAuthorRetrieval.create_many([...], ...)` with the parameters
+    of `AuthorRetrieval`.
+    """
@@ -3,6 +3,7 @@ from typing import List, NamedTuple, Optional, Tuple, Union
 
 from warnings import warn
 
+from ..superclasses.async_base import AsyncBase
 from ..superclasses.search import Search
 from ..utils.parse_content import check_integrity, check_field_consistency, listify, make_search_summary
 from ..utils.checks import check_parameter_value
@@ -107,7 +108,8 @@ class AuthorSearch(Search):
         -----
         The directory for cached results is `{path}/STANDARD/{fname}`,
         where  `path` is specified in your configuration file, and `fname` is
-        the md5-hashed version of `query`.
+        the md5 hash of the canonical form of `query` and of the
+        parameters changing the results, see `utils/query.py`.
         """
         # Checks
         allowed = ("warn", "raise")
@@ -133,3 +135,11 @@ class AuthorSearch(Search):
                  f'{n["dc:identifier"]} ({int(n["document-count"]):,} document(s))'
                  for n in self._json]
         return make_search_summary(self, "author", names)
+
+
+class AsyncAuthorSearch(AsyncBase, AuthorSearch):
+    """Asynchronous variant of `AuthorSearch`: use
+    `await AsyncAuthorSearch.create(...)` or
+    `await AsyncAuthorSearch.create_many([...], ...)` with the parameters
+    of `AuthorSearch`.
+    """
@@ -1,11 +1,71 @@
-from collections import namedtuple
-from typing import List, NamedTuple, Optional, Tuple, Union
+from collections import OrderedDict, namedtuple
+from json import dumps, loads
+from threading import Lock
+from time import localtime, strftime, time
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
 
+import pandas as pd
+
+from .exception import ScopusQueryError
+from ..superclasses.async_base import AsyncBase
+from ..superclasses.base import _download_search, _iter_search
 from ..superclasses.search import Search
+from ..utils.constants import SEARCH_MAX_ENTRIES
+from ..utils.get_content import get_content, map_in_background
 from ..utils.parse_content import check_integrity, check_field_consistency, deduplicate,\
     get_freetoread, listify, make_search_summary
 from ..utils.checks import check_parameter_value
 
+# Fields of the documents of `ScopusSearch.results`
+DOCUMENT_FIELDS = 'eid doi pii pubmed_id title subtype subtypeDescription ' \
+                  'creator afid affilname affiliation_city ' \
+                  'affiliation_country author_count author_names author_ids '\
+                  'author_afids coverDate coverDisplayDate publicationName '\
+                  'issn source_id eIssn aggregationType volume '\
+                  'issueIdentifier article_number pageRange description '\
+                  'authkeywords citedby_count openaccess freetoread '\
+                  'freetoreadLabel fund_acr fund_no fund_sponsor'
+Document = namedtuple('Document', DOCUMENT_FIELDS)
+
+# Elements of the results, as named by the `field` parameter of the API,
+# from which each field of `Document` is parsed
+API_FIELDS = {
+    'eid': ('eid',), 'doi': ('prism:doi',), 'pii': ('pii',),
+    'pubmed_id': ('pubmed-id',), 'title': ('dc:title',),
+    'subtype': ('subtype',), 'subtypeDescription': ('subtypeDescription',),
+    'creator': ('dc:creator',), 'afid': ('afid',),
+    'affilname': ('affilname',), 'affiliation_city': ('affiliation-city',),
+    'affiliation_country': ('affiliation-country',),
+    'author_count': ('author-count',),
+    'author_names': ('surname', 'given-name'), 'author_ids': ('authid',),
+    'author_afids': ('afid',), 'coverDate': ('prism:coverDate',),
+    'coverDisplayDate': ('prism:coverDisplayDate',),
+    'publicationName': ('prism:publicationName',),
+    'issn': ('prism:issn',), 'source_id': ('source-id',),
+    'eIssn': ('prism:eIssn',), 'aggregationType': ('prism:aggregationType',),
+    'volume': ('prism:volume',),
+    'issueIdentifier': ('prism:issueIdentifier',),
+    'article_number': ('article-number',), 'pageRange': ('prism:pageRange',),
+    'description': ('dc:description',), 'authkeywords': ('authkeywords',),
+    'citedby_count': ('citedby-count',), 'openaccess': ('openaccess',),
+    'freetoread': ('freetoread',), 'freetoreadLabel': ('freetoreadLabel',),
+    'fund_acr': ('fund-acr',), 'fund_no': ('fund-no',),
+    'fund_sponsor': ('fund-sponsor',)
+}
+
+# Document types by which parts of a partitioned search covering a single
+# year are split further, see `_partition()`
+PARTITION_DOCTYPES = ('ar', 'cp', 're', 'ch', 'bk', 'ed', 'le', 'no', 'sh',
+                      'er', 'cr', 'dp', 'tb', 'ab', 'bz', 'pr')
+# Earliest year of the year ranges bisected by `_partition()`
+PARTITION_FIRST_YEAR = 1900
+
+# Parsed records of the latest results, keyed by cache key and modification
+# time, such that instances sharing their results parse them once
+_RECORDS_MAX = 32
+_records: OrderedDict = OrderedDict()
+_records_lock = Lock()
+
 
 class ScopusSearch(Search):
     @property
@@ -34,85 +94,68 @@ class ScopusSearch(Search):
         Notes
         -----
         The list of authors and the list of affiliations per author are
-        deduplicated.
+        deduplicated.  The results are parsed once and shared by all
+        instances with the same cached results.  Fields not requested with
+        `fields` are None.
         """
-        # Initiate namedtuple with ordered list of fields
-        fields = 'eid doi pii pubmed_id title subtype subtypeDescription ' \
-                 'creator afid affilname affiliation_city ' \
-                 'affiliation_country author_count author_names author_ids '\
-                 'author_afids coverDate coverDisplayDate publicationName '\
-                 'issn source_id eIssn aggregationType volume '\
-                 'issueIdentifier article_number pageRange description '\
-                 'authkeywords citedby_count openaccess freetoread '\
-                 'freetoreadLabel fund_acr fund_no fund_sponsor'
-        doc = namedtuple('Document', fields)
-        check_field_consistency(self._integrity, fields)
-        # Parse elements one-by-one
-        out = []
-        for item in self._json:
-            info = {}
-            # Parse affiliations
-            info["affilname"] = _join(item, 'affilname')
-            info["afid"] = _join(item, 'afid')
-            info["aff_city"] = _join(item, 'affiliation-city')
-            info["aff_country"] = _join(item, 'affiliation-country')
-            # Parse authors
-            try:
-                # Deduplicate list of authors
-                authors = deduplicate(item['author'])
-                # Extract information
-                surnames = _replace_none([d['surname'] for d in authors])
-                firstnames = _replace_none([d['given-name'] for d in authors])
-                info["auth_names"] = ";".join([", ".join([t[0], t[1]]) for t in
-                                               zip(surnames, firstnames)])
-                info["auth_ids"] = ";".join([d['authid'] for d in authors])
-                affs = []
-                for auth in authors:
-                    aff = listify(deduplicate(auth.get('afid', [])))
-                    affs.append('-'.join([d['$'] for d in aff]))
-                if [a for a in affs if a]:
-                    info["auth_afid"] = ';'.join(affs)
-                else:
-                    info["auth_afid"] = None
-            except KeyError:
-                pass
-            date = item.get('prism:coverDate')
-            if isinstance(date, list):
-                date = date[0].get('$')
-            default = [None, {"$": None}]
-            freetoread = get_freetoread(item, ["freetoread", "value"], default)
-            freetoreadLabel = get_freetoread(item, ["freetoreadLabel", "value"], default)
-            new = doc(article_number=item.get('article-number'),
-                      title=item.get('dc:title'), fund_no=item.get('fund-no'),
-                      fund_sponsor=item.get('fund-sponsor'),
-                      subtype=item.get('subtype'), doi=item.get('prism:doi'),
-                      subtypeDescription=item.get('subtypeDescription'),
-                      issn=item.get('prism:issn'), creator=item.get('dc:creator'),
-                      affilname=info.get("affilname"),
-                      author_names=info.get("auth_names"),
-                      coverDate=date, volume=item.get('prism:volume'),
-                      coverDisplayDate=item.get('prism:coverDisplayDate'),
-                      publicationName=item.get('prism:publicationName'),
-                      source_id=item.get('source-id'), author_ids=info.get("auth_ids"),
-                      aggregationType=item.get('prism:aggregationType'),
-                      issueIdentifier=item.get('prism:issueIdentifier'),
-                      pageRange=item.get('prism:pageRange'),
-                      author_afids=info.get("auth_afid"),
-                      affiliation_country=info.get("aff_country"),
-                      citedby_count=int(item['citedby-count']),
-                      openaccess=int(item['openaccess']),
-                      freetoread=freetoread, freetoreadLabel=freetoreadLabel,
-                      eIssn=item.get('prism:eIssn'),
-                      author_count=item.get('author-count', {}).get('$'),
-                      affiliation_city=info.get("aff_city"), afid=info.get("afid"),
-                      description=item.get('dc:description'), pii=item.get('pii'),
-                      authkeywords=item.get('authkeywords'), eid=item.get('eid'),
-                      fund_acr=item.get('fund-acr'), pubmed_id=item.get('pubmed-id'))
-            out.append(new)
+        check_field_consistency(self._integrity, DOCUMENT_FIELDS)
+        out = [Document._make(record) for record in self._records()]
         # Finalize
         check_integrity(out, self._integrity, self._action)
         return out or None
 
+    def to_frame(self) -> pd.DataFrame:
+        """Return the results as DataFrame with one row per document and
+        the fields of `results` as columns, without building the
+        namedtuples.  The DataFrame has no rows if there are no results.
+
+        Raises
+        ------
+        ValueError
+            If the elements provided in integrity_fields do not match the
+            actual field names.
+        """
+        check_field_consistency(self._integrity, DOCUMENT_FIELDS)
+        df = pd.DataFrame.from_records(self._records(),
+                                       columns=Document._fields)
+        if self._integrity:
+            check_integrity(list(df.itertuples(index=False)),
+                            self._integrity, self._action)
+        return df
+
+    def iter_results(self) -> Iterator[NamedTuple]:
+        """Yield the documents of `results` one by one, page by page as the
+        pages are downloaded, see `iter_pages()`.
+
+        Raises
+        ------
+        ValueError
+            If the elements provided in integrity_fields do not match the
+            actual field names.
+        """
+        check_field_consistency(self._integrity, DOCUMENT_FIELDS)
+        for page in self.iter_pages():
+            docs = [Document._make(_parse_document(item)) for item in page]
+            check_integrity(docs, self._integrity, self._action)
+            yield from docs
+
+    def _records(self) -> List[Tuple]:
+        """Return the parsed results as tuples in the order of
+        `DOCUMENT_FIELDS`, parsing them at first use only.
+        """
+        key = (self._cache_key, self._mdate)
+        with _records_lock:
+            records = _records.get(key)
+            if records is not None:
+                _records.move_to_end(key)
+                return records
+        records = [_parse_document(item) for item in self._json]
+        with _records_lock:
+            _records[key] = records
+            while len(_records) > _RECORDS_MAX:
+                _records.popitem(last=False)
+        return records
+
     def __init__(self,
                  query: str,
                  refresh: Union[bool, int] = False,
@@ -123,6 +166,9 @@ class ScopusSearch(Search):
                  integrity_action: str = "raise",
                  subscriber: bool = True,
                 timeout: Optional[int] = 300,  # Ajout du timeout ici, par défaut 5 minutes
+                 incremental: bool = False,
+                 partition: bool = False,
+                 fields: Union[List[str], Tuple[str, ...]] = None,
                  **kwds: str
                  ) -> None:
         """Interaction with the Scopus Search API.
@@ -158,6 +204,24 @@ class ScopusSearch(Search):
                            used.  Sets the number of entries in each query
                            iteration to the maximum number allowed by the
                            corresponding view.
+        :param incremental: Whether to update an outdated cached file
+                            incrementally instead of downloading all
+                            results again: only results loaded or updated
+                            since the file was written are downloaded
+                            entirely, the others get their citation count
+                            updated.
+        :param partition: Whether to download searches with more results
+                          than allowed without cursor (5000) in parts:  The
+                          query is restricted to ranges of publication years,
+                          and single years to document types, until each
+                          part fits.  The parts are downloaded in parallel
+                          and their results merged by EID.  This also
+                          speeds up large searches with cursor.
+        :param fields: Names of the fields of `results` to download (e.g.
+                       `['eid', 'coverDate']`), such that the API returns
+                       the corresponding elements only.  The other fields
+                       of `results` are None.  EIDs are always downloaded.
+                       If None, downloads all fields of the view.
         :param kwds: Keywords passed on as query parameters.  Must contain
                      fields and values mentioned in the API specification at
                      https://dev.elsevier.com/documentation/ScopusSearchAPI.wadl.
@@ -165,23 +229,30 @@ class ScopusSearch(Search):
         Raises
         ------
         ScopusQueryError
-            For non-subscribers, if the number of search results exceeds 5000.
+            For non-subscribers, if the number of search results exceeds 5000
+            and `partition=False`, or if a part of a single year and
+            document type still does.
 
         ValueError
-            If any of the parameters `integrity_action`, `refresh` or `view`
-            is not one of the allowed values.
+            If any of the parameters `integrity_action`, `refresh`, `view`
+            or `fields` is not one of the allowed values.
 
         Notes
         -----
         The directory for cached results is `{path}/{view}/{fname}`,
         where `path` is specified in your configuration file and `fname` is
-        the md5-hashed version of `query`.
+        the md5 hash of the canonical form of `query` and of the
+        parameters changing the results, see `utils/query.py`.  Partitioned
+        searches are cached as a whole, under the same key; searches
+        restricted to `fields` under keys of their own.
         """
         # Checks
         if view:
             check_parameter_value(view, ('STANDARD', 'COMPLETE'), "view")
         allowed = ("warn", "raise")
         check_parameter_value(integrity_action, allowed, "integrity_action")
+        for field in fields or []:
+            check_parameter_value(field, API_FIELDS, "fields")
 
         # Parameters
         if not view:
@@ -198,13 +269,18 @@ class ScopusSearch(Search):
         if "count" in kwds:
             count = kwds["count"]
             kwds.pop("count")
+        if fields:
+            kwds["field"] = _api_fields(fields)
 
         # Query
         self._action = integrity_action
         self._integrity = integrity_fields or []
         self._refresh = refresh
+        self._incremental = incremental
         self._query = query
         self._view = view
+        self._partition = partition
+        self._plan = None
         self._timeout = timeout  # Ajout du timeout
         Search.__init__(self, query=query, api='ScopusSearch', count=count,
                         cursor=subscriber, download=download,
@@ -218,6 +294,320 @@ class ScopusSearch(Search):
         """EIDs of retrieved documents."""
         return [d['eid'] for d in self._json]
 
+    def _download_entry(self, cache, cache_key, url, api, params, download,
+                        verbose, *args, **kwds):
+        """Download the results entirely, in parts if `partition=True` and
+        there are more results than allowed.
+        """
+        plan = self._partition_plan(url, api, params, *args, **kwds)
+        if plan is None or plan[2] is None:
+            return Search._download_entry(self, cache, cache_key, url, api,
+                                          params, download, verbose,
+                                          *args, **kwds)
+        n, header, parts = plan
+        if not download:
+            return [], n, header, time(), 0
+        if verbose:
+            print(f'Downloading results for query "{params["query"]}" '
+                  f'in {len(parts)} parts.')
+        results = map_in_background(
+            lambda query: _download_search(url, api, _restart(params, query),
+                                           True, False, *args, **kwds)[0],
+            parts)
+        data = _merge(results)
+        text = "\n".join([dumps(item, separators=(',', ':')) for item in data])
+        cache.write(cache_key, text)
+        return data or "", len(data), header, time(), len(text)
+
+    def _pages(self, url, api, params):
+        """Yield the pages streamed by `iter_pages()`, part after part if
+        the search is partitioned.
+        """
+        plan = self._partition_plan(url, api, params)
+        if plan is None or plan[2] is None:
+            return Search._pages(self, url, api, params)
+        return _iter_parts(url, api, params, *plan)
+
+    def _partition_plan(self, url, api, params, *args, **kwds):
+        """Return the partition of the search, see `_plan_partition()`,
+        if `partition=True`.  The response for the first page, which gives
+        the number of results, is kept unless the search is partitioned.
+        """
+        if self._partition and self._plan is None:
+            first = self._first
+            if first is None:
+                first = get_content(url, api, params, *args, **kwds)
+            self._plan = _plan_partition(url, api, params, first,
+                                         *args, **kwds)
+            self._first = first if self._plan[2] is None else None
+        return self._plan
+
+    def _update_cache(self, cache, cache_key, url, api, params, verbose,
+                      *args, **kwds):
+        """Update the cached results incrementally if `incremental=True`.
+
+        Downloads the results loaded or updated since the cached file was
+        written (with a margin of one day), the EIDs and citation counts
+        of all results, and the results missing from the cached file.
+        Results no longer found are dropped.
+        """
+        if not self._incremental:
+            return None
+        mod_ts = cache.mtime(cache_key)
+        content = cache.read(cache_key)
+        if mod_ts is None or content is None:
+            return None
+        cached = {}
+        for line in content.split("\n"):
+            if line:
+                item = loads(line)
+                cached[item.get('eid')] = item
+        query = params['query']
+        since = strftime('%Y%m%d', localtime(mod_ts - 86400))
+        # The listing of all results needs two fields only: the STANDARD
+        # view allows the largest pages to subscribers
+        listing = {**_restart(params, query), 'field': 'eid,citedby-count',
+                   'view': 'STANDARD'}
+        if 'cursor' in params:
+            listing['count'] = 200
+        try:
+            recent, _, _ = _download_search(
+                url, api, _restart(params, f'({query}) AND LOAD-DATE AFT {since}'),
+                True, verbose, *args, **kwds)
+            current, n, header = _download_search(
+                url, api, listing, True, verbose, *args, **kwds)
+        except ScopusQueryError:
+            # Too many results without cursor: download entirely, eventually
+            # in parts
+            return None
+        recent = {item['eid']: item for item in recent or []}
+        current = current or []
+        missing = [item['eid'] for item in current
+                   if item['eid'] not in recent and item['eid'] not in cached]
+        for start in range(0, len(missing), 25):
+            eids = " OR ".join(f"EID({eid})" for eid in missing[start:start+25])
+            found, _, _ = _download_search(url, api, _restart(params, eids),
+                                           True, False, *args, **kwds)
+            recent.update((item['eid'], item) for item in found or [])
+        # Merge in the current order of the results
+        data = []
+        for item in current:
+            eid = item['eid']
+            if eid in recent:
+                data.append(recent[eid])
+            elif eid in cached:
+                data.append({**cached[eid], 'citedby-count': item['citedby-count']})
+        text = "\n".join([dumps(item, separators=(',', ':')) for item in data])
+        cache.write(cache_key, text)
+        return data or "", n, header, time(), len(text)
+
+
+class AsyncScopusSearch(AsyncBase, ScopusSearch):
+    """Asynchronous variant of `ScopusSearch`: use
+    `await AsyncScopusSearch.create(...)` or
+    `await AsyncScopusSearch.create_many([...], ...)` with the parameters
+    of `ScopusSearch`.
+    """
+
+
+def _restart(params, query):
+    """Auxiliary function to return a copy of the parameters of a search
+    with another query, starting at the first result.
+    """
+    params = {**params, 'query': query}
+    if 'cursor' in params:
+        params['cursor'] = '*'
+    else:
+        params['start'] = 0
+    return params
+
+
+def _plan_partition(url, api, params, first, *args, **kwds):
+    """Auxiliary function to return the number of results of a search, the
+    header of the response `first` for its first page and, if there are
+    more results than `SEARCH_MAX_ENTRIES`, the queries of the parts of the
+    search, see `_partition()`; otherwise None.  The numbers of results of
+    the parts are probed with requests for one result.
+    """
+    def probe(query):
+        probe_params = {**_restart(params, query), 'count': 1, 'field': 'eid'}
+        resp = get_content(url, api, probe_params, *args, **kwds)
+        res = resp.json()['search-results']
+        return int(res.get('opensearch:totalResults', 0))
+
+    res = first.json()['search-results']
+    n = int(res.get('opensearch:totalResults', 0))
+    if n <= SEARCH_MAX_ENTRIES:
+        return n, first.headers, None
+    return n, first.headers, _partition(probe, params['query'])
+
+
+def _partition(count, query):
+    """Auxiliary function to return the queries of parts of a search with
+    at most `SEARCH_MAX_ENTRIES` results each, and together all results.
+    Ranges of publication years with too many results are bisected, single
+    years split by document type.  `count` returns the number of results of
+    a query; the ranges of each round are probed in parallel.
+
+    Raises
+    ------
+    ScopusQueryError
+        If a part of a single year and document type still has too many
+        results.
+    """
+    year = localtime().tm_year
+    pending = [(None, PARTITION_FIRST_YEAR - 1),
+               (PARTITION_FIRST_YEAR, year + 1), (year + 2, None)]
+    parts = []
+    while pending:
+        queries = [_restrict_years(query, first, last)
+                   for first, last in pending]
+        split = []
+        for (first, last), part, n in zip(pending, queries,
+                                          map_in_background(count, queries)):
+            if not n:
+                continue
+            if n <= SEARCH_MAX_ENTRIES:
+                parts.append(part)
+            elif first is not None and last is not None and first < last:
+                middle = (first + last)//2
+                split.extend([(first, middle), (middle + 1, last)])
+            else:
+                parts.extend(_split_doctypes(count, part))
+        pending = split
+    return parts
+
+
+def _restrict_years(query, first, last):
+    """Auxiliary function to restrict a query to the publication years
+    from `first` to `last` (None for no limit).
+    """
+    if first is not None and first == last:
+        return f"({query}) AND PUBYEAR IS {first}"
+    conditions = []
+    if first is not None:
+        conditions.append(f"PUBYEAR AFT {first - 1}")
+    if last is not None:
+        conditions.append(f"PUBYEAR BEF {last + 1}")
+    return " AND ".join([f"({query})"] + conditions)
+
+
+def _split_doctypes(count, part):
+    """Auxiliary function to split a part of a search by document type,
+    see `_partition()`.
+    """
+    queries = [f"{part} AND DOCTYPE({doctype})"
+               for doctype in PARTITION_DOCTYPES]
+    others = " OR ".join(f"DOCTYPE({doctype})" for doctype in PARTITION_DOCTYPES)
+    queries.append(f"{part} AND NOT ({others})")
+    parts = []
+    for query, n in zip(queries, map_in_background(count, queries)):
+        if n > SEARCH_MAX_ENTRIES:
+            text = f'Found {n:,} matches for part "{query}" of a partitioned '\
+                   f'search.  The query fails to return more than '\
+                   f'{SEARCH_MAX_ENTRIES} entries.  Change your query such '\
+                   'that it returns fewer entries.'
+            raise ScopusQueryError(text)
+        if n:
+            parts.append(query)
+    return parts
+
+
+def _iter_parts(url, api, params, n, header, parts):
+    """Auxiliary function to yield the pages of the parts of a search one
+    part after the other, without the results of earlier parts.
+    """
+    seen = set()
+    for query in parts:
+        pages = _iter_search(url, api, _restart(params, query), read_ahead=True)
+        for entries, _, header in pages:
+            entries = [item for item in entries if item.get('eid') not in seen]
+            seen.update(item.get('eid') for item in entries)
+            yield entries, n, header
+
+
+def _merge(results):
+    """Auxiliary function to merge the results of the parts of a search,
+    keeping the first result of each EID.
+    """
+    seen = set()
+    data = []
+    for entries in results:
+        for item in entries or []:
+            if item.get('eid') not in seen:
+                seen.add(item.get('eid'))
+                data.append(item)
+    return data
+
+
+def _api_fields(fields):
+    """Auxiliary function to return the value of the `field` parameter of
+    the API downloading `fields` of `Document` and the EID, in the order of
+    `DOCUMENT_FIELDS` whatever the order of `fields`.
+    """
+    names = ['eid'] + [name for name in DOCUMENT_FIELDS.split()
+                       if name in fields]
+    return ",".join(dict.fromkeys(e for name in names
+                                  for e in API_FIELDS[name]))
+
+
+def _parse_document(item):
+    """Auxiliary function to return the fields of a search result as tuple
+    in the order of `DOCUMENT_FIELDS`.
+    """
+    # Parse authors
+    auth_names = auth_ids = auth_afid = None
+    if 'author' in item:
+        # Deduplicate list of authors
+        authors = deduplicate(item['author'])
+        # Extract information; results restricted to some fields lack part
+        # of it
+        try:
+            surnames = _replace_none([d['surname'] for d in authors])
+            firstnames = _replace_none([d['given-name'] for d in authors])
+            auth_names = ";".join([", ".join([t[0], t[1]]) for t in
+                                   zip(surnames, firstnames)])
+        except KeyError:
+            pass
+        try:
+            auth_ids = ";".join([d['authid'] for d in authors])
+        except KeyError:
+            pass
+        affs = []
+        for auth in authors:
+            aff = listify(deduplicate(auth.get('afid', [])))
+            affs.append('-'.join([d['$'] for d in aff]))
+        if [a for a in affs if a]:
+            auth_afid = ';'.join(affs)
+    date = item.get('prism:coverDate')
+    if isinstance(date, list):
+        date = date[0].get('$')
+    default = [None, {"$": None}]
+    return (item.get('eid'), item.get('prism:doi'), item.get('pii'),
+            item.get('pubmed-id'), item.get('dc:title'), item.get('subtype'),
+            item.get('subtypeDescription'), item.get('dc:creator'),
+            _join(item, 'afid'), _join(item, 'affilname'),
+            _join(item, 'affiliation-city'),
+            _join(item, 'affiliation-country'),
+            item.get('author-count', {}).get('$'), auth_names, auth_ids,
+            auth_afid, date, item.get('prism:coverDisplayDate'),
+            item.get('prism:publicationName'), item.get('prism:issn'),
+            item.get('source-id'), item.get('prism:eIssn'),
+            item.get('prism:aggregationType'), item.get('prism:volume'),
+            item.get('prism:issueIdentifier'), item.get('article-number'),
+            item.get('prism:pageRange'), item.get('dc:description'),
+            item.get('authkeywords'), _int(item.get('citedby-count')),
+            _int(item.get('openaccess')),
+            get_freetoread(item, ["freetoread", "value"], default),
+            get_freetoread(item, ["freetoreadLabel", "value"], default),
+            item.get('fund-acr'), item.get('fund-no'),
+            item.get('fund-sponsor'))
+
+
+def _int(value):
+    """Auxiliary function to convert a value to int, if any."""
+    return None if value is None else int(value)
+
 
 def _join(item, key, sep=";"):
     """Auxiliary function to join same elements of a list of dictionaries if
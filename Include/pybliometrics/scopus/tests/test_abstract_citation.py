@@ -0,0 +1,55 @@
+"""Tests for `scopus.abstract_citation` module."""
+
+from hashlib import md5
+from json import dumps
+
+from Include.pybliometrics.scopus.abstract_citation import CitationOverview
+from Include.pybliometrics.utils.cache import get_cache, get_memory_cache
+from Include.pybliometrics.utils.standin_server import citation_overview
+
+IDS = ['85000000101', '85000000102']
+LEGACY = ('CitationOverview', 'STANDARD',
+          md5("_".join(IDS).encode('utf8')).hexdigest())
+
+
+def test_citation_overview_years_in_key(server):
+    requests = server.requests
+    first = CitationOverview(IDS, start=2015, end=2020, refresh=30)
+    other = CitationOverview(IDS, start=2018, end=2020, refresh=30)
+    assert server.requests == requests + 2
+    assert first._cache_key != other._cache_key
+    assert len(first.columnTotal) == 6
+    assert len(other.columnTotal) == 3
+    # Each range is cached under its own key
+    again = CitationOverview(IDS, start=2015, end=2020, refresh=30)
+    assert server.requests == requests + 2
+    assert again.columnTotal == first.columnTotal
+
+
+def test_citation_overview_citation_in_key(server):
+    requests = server.requests
+    all_ = CitationOverview(IDS, start=2019, end=2020, refresh=30)
+    own = CitationOverview(IDS, start=2019, end=2020, refresh=30,
+                           citation='exclude-self')
+    assert server.requests == requests + 2
+    assert all_._cache_key != own._cache_key
+    assert own._cache_key[2].endswith('-2019-2020-exclude-self')
+
+
+def test_citation_overview_legacy_entry(server):
+    cache = get_cache()
+    get_memory_cache().clear()
+    response = citation_overview(IDS, '2010-2012')
+    response['abstract-citations-response']['h-index'] = '99'
+    cache.write(LEGACY, dumps(response))
+    requests = server.requests
+    # Another range doesn't use the legacy entry and leaves it in place
+    co = CitationOverview(IDS, start=2010, end=2011, refresh=30)
+    assert server.requests == requests + 1
+    assert cache.mtime(LEGACY) is not None
+    # Counts without exclusions for the same range move it to the new key
+    co = CitationOverview(IDS, start=2010, end=2012, refresh=30)
+    assert server.requests == requests + 1
+    assert co.h_index == 99
+    assert cache.mtime(LEGACY) is None
+    assert cache.read(co._cache_key) is not None
@@ -0,0 +1,72 @@
+"""Tests for `scopus.scopus_search` module."""
+
+import os
+from json import dumps, loads
+from time import localtime, strftime, time
+
+from Include.pybliometrics.scopus.scopus_search import ScopusSearch
+from Include.pybliometrics.superclasses import base
+from Include.pybliometrics.utils.cache import get_cache, get_memory_cache
+from Include.pybliometrics.utils.standin_server import load_date, search_entry
+
+QUERY = 'AU-ID(7004212774)'
+
+
+def test_incremental_update(server, monkeypatch):
+    server.size = 20
+    s = ScopusSearch(QUERY, refresh=5, incremental=True)
+    assert s.get_results_size() == 20
+    # Outdate the entry, written half a year ago: three results are missing, the others carry
+    # outdated citation counts, and one result is no longer found
+    cache = get_cache()
+    items = [loads(line) for line in cache.read(s._cache_key).split("\n")]
+    dropped = {item['eid'] for item in items[:3]}
+    kept = [{**item, 'citedby-count': '-1', 'cached': True}
+            for item in items[3:]]
+    gone = {**items[0], 'eid': '2-s2.0-1', 'cached': True}
+    cache.write(s._cache_key, "\n".join(dumps(i) for i in kept + [gone]))
+    mod_ts = time() - 180*86400
+    os.utime(cache.path(s._cache_key), (mod_ts, mod_ts))
+    get_memory_cache().clear()
+    # Five new results
+    server.size = 25
+
+    queries = []
+    original = base.get_content
+
+    def recording(url, api, params=None, *args, **kwds):
+        queries.append(dict(params))
+        return original(url, api, params, *args, **kwds)
+
+    monkeypatch.setattr(base, 'get_content', recording)
+    updated = ScopusSearch(QUERY, refresh=5, incremental=True)
+
+    expected = [search_entry('ScopusSearch', QUERY, i) for i in range(25)]
+    since = strftime('%Y%m%d', localtime(mod_ts - 86400))
+    recent = {e['eid'] for i, e in enumerate(expected)
+              if load_date('ScopusSearch', QUERY, i) > since}
+    new = {e['eid'] for e in expected[20:]}
+    assert recent - dropped - new  # Some cached results were updated
+    # Requests: the results loaded since the entry was written, the listing
+    # of EIDs and citation counts, and the EIDs still missing
+    assert queries[0]['query'] == f'({QUERY}) AND LOAD-DATE AFT {since}'
+    assert queries[1]['query'] == QUERY
+    assert queries[1]['field'] == 'eid,citedby-count'
+    looked_up = set()
+    for params in queries[2:]:
+        looked_up.update(e.strip(")") for e in
+                         params['query'].replace("EID(", "").split(" OR "))
+    assert looked_up == (dropped | new) - recent
+    assert len(queries) == 2 + (len(looked_up) > 0)
+    # The merged entry follows the current order of the results, with
+    # current citation counts; results neither new nor updated are those
+    # of the cache
+    assert [r['eid'] for r in updated._json] == [e['eid'] for e in expected]
+    assert [r['citedby-count'] for r in updated._json] == \
+        [e['citedby-count'] for e in expected]
+    for result in updated._json:
+        cached = result['eid'] not in recent | dropped | new
+        assert result.get('cached', False) == cached
+    assert updated.get_results_size() == 25
+    merged = [loads(line) for line in cache.read(s._cache_key).split("\n")]
+    assert merged == updated._json
@@ -0,0 +1,42 @@
+"""Mixin class providing asynchronous constructors for all API classes."""
+
+from asyncio import gather
+from typing import Iterable, List
+
+from ..utils.get_content import run_in_executor
+
+
+class AsyncBase:
+    @classmethod
+    async def create(cls, *args: str, **kwds: str):
+        """Asynchronously construct an object of the class.
+
+        The regular constructor, that is cache lookup, download and parsing,
+        runs on the pooled executor of `get_content()`.  The returned object
+        is a fully initialized instance and offers all the properties of
+        its synchronous parent class.
+
+        :param args: Parameters passed on to the class' constructor.
+        :param kwds: Parameters passed on to the class' constructor.
+        """
+        return await run_in_executor(cls, *args, **kwds)
+
+    @classmethod
+    async def create_many(cls,
+                          identifiers: Iterable,
+                          return_exceptions: bool = False,
+                          **kwds: str
+                          ) -> List:
+        """Asynchronously construct one object per identifier, with all
+        requests overlapping within the limits of the executor and of
+        the throttling.
+
+        :param identifiers: The first positional parameter for each object,
+                            e.g. the queries or the IDs.
+        :param return_exceptions: Whether to return the exceptions raised
+                                  for single objects in place of the object
+                                  instead of raising the first one.
+        :param kwds: Parameters passed on to each constructor.
+        """
+        tasks = [cls.create(identifier, **kwds) for identifier in identifiers]
+        return await gather(*tasks, return_exceptions=return_exceptions)
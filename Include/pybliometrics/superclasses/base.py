@@ -1,15 +1,26 @@
 """Base class object for superclasses."""
 
+from collections import deque
+from hashlib import md5
+from itertools import islice
 from json import dumps, loads
 from math import ceil
 from time import localtime, strftime, time
 from typing import Dict, Optional
 
-from ..scopus.exception import ScopusQueryError
-from ..utils.get_content import get_content
+from ..scopus.exception import Scopus404Error, ScopusQueryError
+from ..utils.cache import get_cache, get_memory_cache
+from ..utils.freshness import STALE, EXPIRED, get_negative_ttl, get_policy
+from ..utils.get_content import _max_workers, get_content, in_executor, \
+    run_in_background
+from ..utils.metrics import METRICS
+from ..utils.single_flight import SingleFlight, flight_key
 from ..utils.constants import SEARCH_MAX_ENTRIES
 from tqdm import tqdm
 
+# Calls of `_download()` in flight, shared by identical requests
+_flights = SingleFlight()
+
 
 class Base:
     def __init__(self,
@@ -31,8 +42,20 @@ class Base:
         :param args: Keywords passed on `get_content()`
         :param kwds: Keywords passed on `get_content()`
 
+        The freshness policy of the API in the configuration file, if any,
+        replaces a boolean `self._refresh`; stale entries are then used
+        immediately and refreshed in the background.  A number of days
+        takes precedence over the policy.  Searches without results and
+        retrievals not found are cached as well, with the shorter negative
+        TTL of the configuration file.  With locking enabled in the
+        configuration file, an entry refreshed meanwhile by another process
+        is used instead of downloading it again.
+
         Raises
         ------
+        Scopus404Error
+            If the retrieval is not found, also if cached as not found.
+
         ValueError
             If `self._refresh` is neither boolean nor numeric.
         """
@@ -43,74 +66,137 @@ class Base:
             msg = "Parameter refresh needs to be numeric or boolean."
             raise ValueError(msg)
 
-        # Compare age of file to test whether we refresh
-        self._refresh, mod_ts = _check_file_age(self)
+        # Compare age of file to test whether we refresh; parsed entries
+        # kept in memory spare reading and parsing the cached file
+        cache = get_cache()
+        memory = get_memory_cache()
+        remembered = memory.get(self._cache_key)
+        if remembered:
+            mod_ts = remembered[1]
+        else:
+            mod_ts = cache.mtime(self._cache_key)
+        self._ttl = self._refresh
+        self._refresh, revalidate = _check_file_age(self._ttl, mod_ts,
+                                                    get_policy(api))
 
-        # Read or download, possibly with caching
-        fname = self._cache_file_path
+        # Read or download, possibly with caching; cached misses are used
+        # while younger than the negative TTL whatever the refresh, and
+        # refreshed once older
         search_request = "query" in params
-        if fname.exists() and not self._refresh:
-            self._mdate = mod_ts
+        negative_ttl = get_negative_ttl()
+        recent = negative_ttl is not None and mod_ts is not None and \
+            time() - mod_ts <= negative_ttl*86400
+        content = None
+        if mod_ts is not None and not remembered and \
+                (not self._refresh or recent):
+            content = cache.read(self._cache_key)
+        cached = remembered[0] if remembered else content
+        if negative_ttl is not None and cached is not None and \
+                _is_negative(cached, search_request):
+            self._refresh, revalidate = not recent, False
+        # Whether the instance holds all results
+        self._complete = True
+        if remembered and not self._refresh:
+            METRICS.record_cache(api, 'hit')
+            self._json, self._mdate = remembered
             if search_request:
-                self._json = [loads(line) for line in
-                              fname.read_text().split("\n") if line]
                 self._n = len(self._json)
-            else:
-                self._json = loads(fname.read_text())
+        elif content is not None and not self._refresh:
+            METRICS.record_cache(api, 'hit')
+            self._mdate = mod_ts
+            self._json, n = _parse_entry(content, search_request)
+            if search_request:
+                self._n = n
+            memory.put(self._cache_key, self._json, mod_ts, len(content))
         else:
-            resp = get_content(url, api, params, *args, **kwds)
-            header = resp.headers
+            revalidate = False
+            METRICS.record_cache(api, 'miss' if mod_ts is None else 'stale')
+            # Concurrent identical requests share one download and one write;
+            # outdated entries may be updated incrementally
+            update = self._update_cache if mod_ts is not None else None
+            key = flight_key(url, params, api) + (download,)
+            self._json, n, header, self._mdate, size = _flights.do(
+                key, _refresh_entry, update, self._download_entry, cache,
+                self._cache_key, mod_ts, url, api, params, download, verbose,
+                *args, **kwds)
+            if header is not None:
+                self._header = header
             if search_request:
-                # Get number of results
-                res = resp.json()
-                n = int(res['search-results'].get('opensearch:totalResults', 0))
                 self._n = n
-                # Results size check
-                cursor_exists = "cursor" in params
-                if not cursor_exists and n > SEARCH_MAX_ENTRIES:
-                    # Stop if there are too many results
-                    text = f'Found {n:,} matches.  The query fails to return '\
-                           f'more than {SEARCH_MAX_ENTRIES} entries.  Change '\
-                           'your query such that it returns fewer entries.'
-                    raise ScopusQueryError(text)
-                self._json = []
-                # Download results page-wise
-                if download:
-                    data = res.get('search-results', {}).get('entry', [])
-                    if not n:
-                        data = ""
-                    if not cursor_exists:
-                        start = params["start"]
-                    # Download the remaining information in chunks
-                    if verbose:
-                        print(f'Downloading results for query "{params["query"]}":')
-                    n_chunks = ceil(n/params['count'])
-                    for i in tqdm(range(1, n_chunks), disable=not verbose,
-                                  initial=1, total=n_chunks):
-                        if cursor_exists:
-                            cursor = res['search-results']['cursor']['@next']
-                            params.update({'cursor': cursor})
-                        else:
-                            start += params["count"]
-                            params.update({'start': start})
-                        resp = get_content(url, api, params, *args, **kwds)
-                        res = resp.json()
-                        data.extend(res.get('search-results', {}).get('entry', []))
-                    header = resp.headers  # Use header of final call
-                    self._json = data
-                else:
-                    data = None
-            else:
-                data = loads(resp.text)
-                self._json = data
-                data = [data]
-            # Set private variables
-            self._mdate = time()
-            self._header = header
-            # Finally write data unless download=False
+            self._complete = download
             if download:
-                text = [dumps(item, separators=(',', ':')) for item in data]
-                fname.write_text("\n".join(text))
+                memory.put(self._cache_key, self._json, self._mdate, size)
+        if revalidate:
+            run_in_background(_revalidate, self._update_cache,
+                              self._download_entry, cache, self._cache_key,
+                              mod_ts, url, api, params, *args, **kwds)
+
+    def _update_cache(self, cache, cache_key, url, api, params, verbose,
+                      *args, **kwds):
+        """Update an outdated cache entry without downloading it entirely
+        and return the same as `_download()`, or return None to download
+        it entirely.  Subclasses supporting incremental updates override
+        this method.
+        """
+        return None
+
+    def _download_entry(self, cache, cache_key, url, api, params, download,
+                        verbose, *args, **kwds):
+        """Download an entry entirely and return the same as `_download()`.
+        Subclasses downloading their results differently override this
+        method.
+        """
+        return _download(cache, cache_key, url, api, params, download,
+                         verbose, *args, **kwds)
+
+    def _get_cached_json(self,
+                         url: str,
+                         api: str,
+                         params: Dict,
+                         view: str,
+                         **kwds: str
+                         ) -> Dict:
+        """Return the parsed response to a request besides the main one,
+        e.g. the metrics of a SciVal lookup.  The response is cached under
+        `view` with the md5 hash of all parameters (but the credentials) as
+        stem and refreshed like the main response, i.e. according to the
+        `refresh` parameter of the instance if it is a number of days and
+        to the freshness policy of the API otherwise.
+
+        :param url: The URL to be accessed.
+        :param api: The API to be accessed.
+        :param params: The query parameters.
+        :param view: The subfolder of the cached responses.
+        :param kwds: Keywords passed on to `get_content()`.
+        """
+        hashed = {k: v for k, v in {**params, **kwds}.items()
+                  if k.lower() not in ('apikey', 'insttoken')}
+        stem = md5(dumps(hashed, sort_keys=True, default=str).encode('utf8'))
+        cache_key = (api, view, stem.hexdigest())
+        cache = get_cache()
+        memory = get_memory_cache()
+        remembered = memory.get(cache_key)
+        mod_ts = remembered[1] if remembered else cache.mtime(cache_key)
+        refresh, revalidate = _check_file_age(self._ttl, mod_ts,
+                                              get_policy(api))
+        data = None
+        if not refresh:
+            if remembered:
+                data = remembered[0]
+            else:
+                content = cache.read(cache_key)
+                if content is not None:
+                    data = loads(content)
+                    memory.put(cache_key, data, mod_ts, len(content))
+        if data is None:
+            METRICS.record_cache(api, 'miss' if mod_ts is None else 'stale')
+            return _fetch_json(cache, cache_key, mod_ts, url, api, params,
+                               **kwds)
+        METRICS.record_cache(api, 'hit')
+        if revalidate:
+            run_in_background(_fetch_json, cache, cache_key, mod_ts, url, api,
+                              dict(params), **kwds)
+        return data
 
     def get_cache_file_age(self) -> int:
         """Return the age of the cached file in days."""
@@ -141,17 +227,298 @@ class Base:
             return None
 
 
-def _check_file_age(self):
-    """Whether a file needs to be refreshed based on its age."""
-    refresh = self._refresh
-    try:
-        mod_ts = self._cache_file_path.stat().st_mtime
-        if not isinstance(refresh, bool):
-            diff = time() - mod_ts
-            days = int(diff / 86400) + 1
-            allowed_age = int(self._refresh)
-            refresh = allowed_age < days
-    except FileNotFoundError:
+def _check_file_age(refresh, mod_ts, policy=None):
+    """Whether a file needs to be refreshed before use and whether it needs
+    to be refreshed in the background after use, based on parameter
+    `refresh` if it is a number of days, on the freshness policy of the API
+    if any otherwise, and on its modification time `mod_ts` (None if there
+    is no file).
+    """
+    if policy is not None and isinstance(refresh, bool):
+        state = policy.state(mod_ts)
+        return state == EXPIRED, state == STALE
+    if mod_ts is None:
         refresh = True
-        mod_ts = None
-    return refresh, mod_ts
+    elif not isinstance(refresh, bool):
+        diff = time() - mod_ts
+        days = int(diff / 86400) + 1
+        allowed_age = int(refresh)
+        refresh = allowed_age < days
+    return refresh, False
+
+
+def _parse_entry(content, search_request):
+    """Return the parsed content of a cache entry and its number of results
+    (None for retrievals).
+
+    Raises
+    ------
+    Scopus404Error
+        If the entry records a retrieval not found.
+    """
+    if search_request:
+        json = [loads(line) for line in content.split("\n") if line]
+        return json, len(json)
+    json = loads(content)
+    if 'service-error' in json:
+        raise Scopus404Error(json['service-error']['status']['statusText'])
+    return json, None
+
+
+def _is_negative(cached, search_request):
+    """Whether the content of a cache entry, or its parsed content kept in
+    memory, records a miss: a search without results or a retrieval not
+    found.
+    """
+    if search_request:
+        return not cached
+    return isinstance(cached, str) and cached.startswith('{"service-error"')
+
+
+def _not_found(error):
+    """Return the cache entry recording a retrieval not found, in the form
+    of the error responses of the APIs.
+    """
+    status = {'statusCode': 'RESOURCE_NOT_FOUND', 'statusText': str(error)}
+    return dumps({'service-error': {'status': status}}, separators=(',', ':'))
+
+
+def _read_newer(cache, cache_key, mod_ts):
+    """Return the content and the modification time of a cache entry
+    written after `mod_ts` (e.g. by another process), or None.  To be
+    called while holding the lock of the entry.
+    """
+    current = cache.mtime(cache_key)
+    if current is None or (mod_ts is not None and current <= mod_ts):
+        return None
+    content = cache.read(cache_key)
+    return None if content is None else (content, current)
+
+
+def _refresh_entry(update, fetch, cache, cache_key, mod_ts, url, api, params,
+                   download, verbose, *args, **kwds):
+    """Update a cache entry with `update`, if given and possible, and
+    download it entirely with `fetch` otherwise, unless the entry changed
+    since its modification time `mod_ts`.  Return the same as
+    `_download()`, with None as header if no request was made.
+    """
+    if not download:
+        return fetch(cache, cache_key, url, api, params, download, verbose,
+                     *args, **kwds)
+    with cache.lock(cache_key):
+        newer = _read_newer(cache, cache_key, mod_ts)
+        if newer is not None:
+            content, current = newer
+            json, n = _parse_entry(content, "query" in params)
+            return json, n, None, current, len(content)
+        if update is not None:
+            result = update(cache, cache_key, url, api, params, verbose,
+                            *args, **kwds)
+            if result is not None:
+                return result
+        return fetch(cache, cache_key, url, api, params, download, verbose,
+                     *args, **kwds)
+
+
+def _revalidate(update, fetch, cache, cache_key, mod_ts, url, api, params,
+                *args, **kwds):
+    """Refresh a stale cache entry in the background; failures leave the
+    stale entry in place for the next attempt.  The entry is written even
+    for instances created with `download=False`, which read it as well.
+    """
+    key = flight_key(url, params, api) + (True,)
+    try:
+        json, _, _, mdate, size = _flights.do(
+            key, _refresh_entry, update, fetch, cache, cache_key, mod_ts,
+            url, api, dict(params), True, False, *args, **kwds)
+    except Exception:
+        return
+    get_memory_cache().put(cache_key, json, mdate, size)
+
+
+def _fetch_json(cache, cache_key, mod_ts, url, api, params, **kwds):
+    """Download the JSON response to a request, write it to the cache and
+    return it parsed, unless the entry changed since its modification time
+    `mod_ts`.
+    """
+    with cache.lock(cache_key):
+        newer = _read_newer(cache, cache_key, mod_ts)
+        if newer is not None:
+            content, current = newer
+            data = loads(content)
+            get_memory_cache().put(cache_key, data, current, len(content))
+            return data
+        data = get_content(url, api, params, **kwds).json()
+        content = dumps(data, separators=(',', ':'))
+        cache.write(cache_key, content)
+    get_memory_cache().put(cache_key, data, time(), len(content))
+    return data
+
+
+def _download(cache, cache_key, url, api, params, download, verbose,
+              *args, first=None, **kwds):
+    """Download the results of a request and write them to the cache
+    unless `download=False`.  Return the parsed content, the number of
+    results (None for retrievals), the header of the final response, the
+    modification time and the size of the written content.  `first` is
+    the response for the first page of a search, if already received.
+    """
+    n = None
+    if "query" in params:
+        json, n, header = _download_search(url, api, params, download,
+                                           verbose, *args, first=first,
+                                           **kwds)
+        data = json
+    else:
+        try:
+            resp = get_content(url, api, params, *args, **kwds)
+        except Scopus404Error as err:
+            # Record the miss, see `get_negative_ttl()`
+            if download and get_negative_ttl() is not None:
+                cache.write(cache_key, _not_found(err))
+                get_memory_cache().discard(cache_key)
+            raise
+        header = resp.headers
+        json = loads(resp.text)
+        data = [json]
+    # Finally write data unless download=False
+    size = 0
+    if download:
+        text = "\n".join([dumps(item, separators=(',', ':')) for item in data])
+        cache.write(cache_key, text)
+        size = len(text)
+    return json, n, header, time(), size
+
+
+def _download_search(url, api, params, download=True, verbose=False,
+                     *args, first=None, **kwds):
+    """Download all results of a search page-wise, unless
+    `download=False`.  Return the results, their number and the header of
+    the final response.  `first` is the response for the first page, if
+    already received.
+
+    Raises
+    ------
+    ScopusQueryError
+        If the search without cursor has more results than allowed.
+    """
+    pages = _iter_search(url, api, params, *args, first=first, **kwds)
+    data, n, header = next(pages)
+    if not download:
+        pages.close()
+        return [], n, header
+    # Download the remaining information in chunks
+    if verbose:
+        print(f'Downloading results for query "{params["query"]}":')
+    n_chunks = ceil(n/params['count'])
+    for entries, _, header in tqdm(pages, disable=not verbose, initial=1,
+                                   total=n_chunks):
+        data.extend(entries)
+    if not n:
+        data = ""
+    return data, n, header  # Header of final call
+
+
+def _iter_search(url, api, params, *args, read_ahead=False, first=None,
+                 **kwds):
+    """Yield the results of a search page by page, each with the number of
+    results and the header of its response.  The pages of a search without
+    cursor are downloaded concurrently once the number of results is known,
+    within the concurrency and rate limits of the API, and yielded in
+    order.  With `read_ahead=True`, each page of a search with cursor is
+    downloaded in the background while the previous one is processed.
+    `first` is the response for the first page, if already received.
+
+    Raises
+    ------
+    ScopusQueryError
+        If the search without cursor has more results than allowed.
+    """
+    resp = first
+    if resp is None:
+        resp = get_content(url, api, params, *args, **kwds)
+    res = resp.json()
+    n = _search_size(res, params)
+    cursor_exists = "cursor" in params
+    n_pages = max(ceil(n/params['count']), 1)
+    # Workers of the pooled executor waiting for further tasks of the
+    # executor could block it, hence they download sequentially
+    background = not in_executor()
+    if not cursor_exists:
+        yield _page_entries(res, n), n, resp.headers
+        first = params["start"] + params["count"]
+        starts = range(first, first + (n_pages - 1)*params["count"],
+                       params["count"])
+        yield from _offset_pages(url, api, params, starts, n, background,
+                                 *args, **kwds)
+        return
+    for i in range(1, n_pages + 1):
+        entries = _page_entries(res, n)
+        header = resp.headers
+        following = None
+        if i < n_pages:
+            cursor = res['search-results']['cursor']['@next']
+            params.update({'cursor': cursor})
+            if read_ahead and background:
+                following = run_in_background(get_content, url, api,
+                                              dict(params), *args, **kwds)
+        yield entries, n, header
+        if i < n_pages:
+            if following is not None:
+                resp = following.result()
+            else:
+                resp = get_content(url, api, params, *args, **kwds)
+            res = resp.json()
+
+
+def _search_size(res, params):
+    """Auxiliary function to return the number of results of a search
+    from the response for one of its pages.
+
+    Raises
+    ------
+    ScopusQueryError
+        If the search without cursor has more results than allowed.
+    """
+    n = int(res['search-results'].get('opensearch:totalResults', 0))
+    if "cursor" not in params and n > SEARCH_MAX_ENTRIES:
+        # Stop if there are too many results
+        text = f'Found {n:,} matches.  The query fails to return '\
+               f'more than {SEARCH_MAX_ENTRIES} entries.  Change '\
+               'your query such that it returns fewer entries.'
+        raise ScopusQueryError(text)
+    return n
+
+
+def _offset_pages(url, api, params, starts, n, background, *args, **kwds):
+    """Auxiliary function to yield the pages of a search without cursor at
+    offsets `starts`, in order.  In the background, at most `_max_workers`
+    pages are requested ahead of the page yielded, and the requests not
+    started yet are cancelled when the iteration stops early.
+    """
+    def fetch(start):
+        return get_content(url, api, {**params, 'start': start},
+                           *args, **kwds)
+
+    if not background:
+        for start in starts:
+            resp = fetch(start)
+            yield _page_entries(resp.json(), n), n, resp.headers
+        return
+    starts = iter(starts)
+    pending = deque(run_in_background(fetch, start)
+                    for start in islice(starts, _max_workers))
+    try:
+        while pending:
+            resp = pending.popleft().result()
+            pending.extend(run_in_background(fetch, start)
+                           for start in islice(starts, 1))
+            yield _page_entries(resp.json(), n), n, resp.headers
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _page_entries(res, n):
+    """Auxiliary function to return the entries of a page of results."""
+    return res.get('search-results', {}).get('entry', []) if n else []
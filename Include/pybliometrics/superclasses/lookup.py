@@ -4,7 +4,6 @@ from typing import Union, Literal
 
 from .base import Base
 from ..utils.constants import URLS
-from ..utils.get_content import get_folder
 
 
 class Lookup(Base):
@@ -35,12 +34,12 @@ class Lookup(Base):
         KeyError
             If parameter `api` is not one of the allowed values.
         """
-        # Construct URL and cache file name
+        # Construct URL and cache key
         url = URLS[api] + complement
         if identifier != None:
             stem = identifier.replace('/', '_')
 
-        self._cache_file_path = get_folder(api, None)/stem
+        self._cache_key = (api, None, stem)
 
         # Parse file contents
         params = {'authors': str(identifier),
@@ -3,7 +3,6 @@
 from typing import Union
 
 from .base import Base
-from ..utils.get_content import get_folder
 from ..utils.constants import URLS
 
 
@@ -31,7 +30,7 @@ class Retrieval(Base):
         KeyError
             If parameter `api` is not one of the allowed values.
         """
-        # Construct URL and cache file name
+        # Construct URL and cache key
         url = URLS[api]
         if api in ("AbstractRetrieval", "PlumXMetrics"):
             url += id_type + "/"
@@ -42,7 +41,7 @@ class Retrieval(Base):
         else:
             url += identifier
             stem = identifier.replace('/', '_')
-        self._cache_file_path = get_folder(api, self._view)/stem
+        self._cache_key = (api, self._view, stem)
 
         # Parse file contents
         params = {'view': self._view, **kwds}
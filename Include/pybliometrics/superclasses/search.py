@@ -1,10 +1,16 @@
 """Superclass to access all Scopus search APIs and dump the results."""
 
 from hashlib import md5
+from json import dumps
+from time import time
+from typing import Dict, Iterator, List
 
-from .base import Base
-from ..utils.get_content import get_folder
+from .base import Base, _download, _iter_search, _parse_entry, _read_newer, \
+    _search_size
+from ..utils.cache import get_cache, get_memory_cache
 from ..utils.constants import URLS
+from ..utils.get_content import get_content
+from ..utils.query import cache_stem, key_params
 
 
 class Search(Base):
@@ -55,14 +61,101 @@ class Search(Base):
             if "start" not in params:
                 params['start'] = 0
 
-        # Construct cache file path
-        stem = md5(name.encode('utf8')).hexdigest()
-        self._cache_file_path = get_folder(api, self._view)/stem
+        # Construct cache key from the canonical form of the query and the
+        # parameters changing the results, such that equivalent queries
+        # share their entry; entries of earlier versions, keyed by the hash
+        # of the query as is, are moved to the new key
+        stem = cache_stem(query, params)
+        self._cache_key = (api, self._view, stem)
+        legacy = (api, self._view, md5(name.encode('utf8')).hexdigest())
+        if legacy != self._cache_key and not key_params(query, params):
+            cache = get_cache()
+            if cache.mtime(self._cache_key) is None and \
+                    cache.mtime(legacy) is not None:
+                cache.rename(legacy, self._cache_key)
 
         # Init
+        self._search = (URLS[api], api, dict(params))
+        # Response for the first page, received but not used yet
+        self._first = None
         Base.__init__(self, params=params, url=URLS[api], download=download,
                       api=api, verbose=verbose)
 
+    def iter_pages(self) -> Iterator[List[Dict]]:
+        """Yield the results page by page, as lists of their JSON entries.
+
+        If the instance was created with `download=False` and the results
+        are not cached, the pages are yielded as they arrive, each while the
+        next one is downloaded, and appended to the cache entry.  The entry
+        is complete, and used by later instances, once the last page has
+        been received.  The instance doesn't keep these results, such that
+        they never need to be in memory at once.  Otherwise the results of
+        the instance (after an incremental update of an outdated cache
+        entry, if supported) are yielded in pages.
+        """
+        url, api, params = self._search
+        params = dict(params)
+        cache = get_cache()
+        if not self._complete:
+            mod_ts = cache.mtime(self._cache_key)
+            # The entry stays locked until the last page has been received,
+            # such that other processes wait for it instead of downloading
+            # the same results; an entry written meanwhile is used instead
+            with cache.lock(self._cache_key):
+                newer = _read_newer(cache, self._cache_key, mod_ts)
+                if newer is not None:
+                    content, self._mdate = newer
+                    self._json, self._n = _parse_entry(content, True)
+                    self._complete = True
+                elif mod_ts is not None:
+                    result = self._update_cache(cache, self._cache_key, url,
+                                                api, params, False)
+                    if result is not None:
+                        self._json, self._n, self._header, self._mdate, _ = result
+                        self._json = self._json or []
+                        self._complete = True
+                if not self._complete:
+                    yield from self._stream(cache, url, api, params)
+                    return
+        for start in range(0, len(self._json), params['count']):
+            yield self._json[start:start + params['count']]
+
+    def _stream(self, cache, url, api, params):
+        """Yield the pages of `_pages()` while appending them to the cache
+        entry, which is complete once the last page has been received.
+        """
+        with cache.writer(self._cache_key) as writer:
+            for entries, self._n, self._header in self._pages(url, api, params):
+                text = "\n".join(dumps(item, separators=(',', ':'))
+                                 for item in entries)
+                if text:
+                    writer.append(("\n" if writer.size else "") + text)
+                yield entries
+        get_memory_cache().discard(self._cache_key)
+
+    def _download_entry(self, cache, cache_key, url, api, params, download,
+                        verbose, *args, **kwds):
+        """Download the results entirely, or only their number if
+        `download=False`.  The response for the first page is then kept,
+        such that `iter_pages()` yields it without requesting it again.
+        """
+        first, self._first = self._first, None
+        if download:
+            return _download(cache, cache_key, url, api, params, download,
+                             verbose, *args, first=first, **kwds)
+        if first is None:
+            first = get_content(url, api, params, *args, **kwds)
+        n = _search_size(first.json(), params)
+        self._first = first
+        return [], n, first.headers, time(), 0
+
+    def _pages(self, url, api, params):
+        """Yield the pages streamed by `iter_pages()`, each with the number
+        of results and the header of its response.
+        """
+        first, self._first = self._first, None
+        return _iter_search(url, api, params, read_ahead=True, first=first)
+
     def get_results_size(self) -> int:
         """Return the number of results (works even if download=False)."""
         return self._n
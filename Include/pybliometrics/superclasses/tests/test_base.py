@@ -0,0 +1,80 @@
+"""Tests for `superclasses.base` module."""
+
+import os
+from time import sleep, time
+
+import pytest
+
+from Include.pybliometrics.scopus.author_retrieval import AuthorRetrieval
+from Include.pybliometrics.scopus.scopus_search import ScopusSearch
+from Include.pybliometrics.superclasses.base import _check_file_age
+from Include.pybliometrics.utils.cache import FileCache, get_memory_cache
+from Include.pybliometrics.utils.freshness import FreshnessPolicy
+
+
+def age(key, days):
+    """Make the file cache entry `key` older by `days`."""
+    path = FileCache().path(key)
+    mtime = time() - days*86400
+    os.utime(path, (mtime, mtime))
+    get_memory_cache().discard(key)
+    return mtime
+
+
+def wait_for_write(key, mtime, timeout=10):
+    """Wait until the file cache entry `key` is newer than `mtime`."""
+    cache = FileCache()
+    deadline = time() + timeout
+    while time() < deadline:
+        current = cache.mtime(key)
+        if current is not None and current > mtime:
+            return current
+        sleep(0.05)
+    pytest.fail(f"Entry {key} was not refreshed.")
+
+
+def test_stale_retrieval_revalidated(server):
+    first = AuthorRetrieval('7004212772')
+    # Stale under the default policy: max-age=1, stale-while-revalidate=30
+    mtime = age(first._cache_key, 5)
+    requests = server.requests
+    stale = AuthorRetrieval('7004212772')
+    assert stale._mdate == pytest.approx(mtime)
+    wait_for_write(first._cache_key, mtime)
+    assert server.requests == requests + 1
+
+
+def test_stale_search_revalidated_without_download(server):
+    query = 'AF-ID(60000001)'
+    first = ScopusSearch(query, subscriber=False)
+    assert first.get_results_size() == server.size
+    # Stale under the default policy: max-age=10, stale-while-revalidate=30
+    mtime = age(first._cache_key, 15)
+    stale = ScopusSearch(query, subscriber=False, download=False)
+    assert len(stale.results) == server.size
+    # The background refresh writes the entry despite download=False
+    wait_for_write(first._cache_key, mtime)
+    requests = server.requests
+    fresh = ScopusSearch(query, subscriber=False, download=False)
+    assert server.requests == requests
+    assert fresh._mdate > mtime
+
+
+def test_check_file_age():
+    policy = FreshnessPolicy(max_age=10, stale_while_revalidate=30)
+    assert _check_file_age(False, None, policy) == (True, False)
+    # Booleans follow the policy
+    for refresh in (False, True):
+        assert _check_file_age(refresh, time() - 5*86400, policy) == \
+            (False, False)
+        assert _check_file_age(refresh, time() - 15*86400, policy) == \
+            (False, True)
+        assert _check_file_age(refresh, time() - 50*86400, policy) == \
+            (True, False)
+    # A number of days takes precedence over the policy
+    assert _check_file_age(3, time() - 5*86400, policy) == (True, False)
+    assert _check_file_age(30, time() - 15*86400, policy) == (False, False)
+    # Without policy, `refresh` decides
+    assert _check_file_age(True, time(), None) == (True, False)
+    assert _check_file_age(False, time() - 500*86400, None) == (False, False)
+    assert _check_file_age(7, time() - 5*86400, None) == (False, False)
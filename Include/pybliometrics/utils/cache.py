@@ -0,0 +1,568 @@
+"""Pluggable storage of the cached API responses."""
+
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from contextlib import nullcontext
+from hashlib import md5
+from io import BytesIO
+from pathlib import Path
+from threading import Lock, local
+from time import sleep, time
+from typing import (Any, BinaryIO, Callable, ContextManager, Dict, Iterator,
+                    Optional, Tuple, Union)
+
+from .compression import compress, compressing_writer, decompress, \
+    resolve_method
+from .file_lock import FileLock
+from .get_content import get_folder
+from .startup import config
+
+# An entry is identified by the API, the view (None for APIs without view)
+# and the stem of the request, e.g. an ID or the md5 hash of a query
+CacheKey = Tuple[str, Optional[str], str]
+
+# Resolution in seconds of the access times used for LRU eviction: reads
+# update the access time of an entry only if it is older, which spares a
+# write per read
+ATIME_RESOLUTION = 3600
+
+# Number of lock files of the entries: entries share lock files by the hash
+# of their key, which bounds the number of files
+LOCK_STRIPES = 4096
+
+
+class CacheBackend:
+    """Interface of the cache backends.  Entries are texts identified by
+    a key (api, view, stem), each with its modification time.  Backends
+    store the entries compressed with `compression` ('zstd', 'gzip' or
+    'none') and detect the compression when reading.
+    """
+    compression = 'none'
+    # Directory of the inter-process locks of the entries, or None if
+    # entries are not locked
+    lock_dir: Optional[Path] = None
+
+    def lock(self, key: CacheKey) -> ContextManager:
+        """Return the lock of the entry, shared by all threads and processes
+        using the same `lock_dir`, to be held while refreshing the entry.
+        Without `lock_dir`, return a context manager doing nothing.
+        """
+        if self.lock_dir is None:
+            return nullcontext()
+        stripe = int(md5(repr(key).encode('utf8')).hexdigest(), 16)
+        path = self.lock_dir/f"{stripe % LOCK_STRIPES:03x}.lock"
+        return _EntryLock(key, _stripe_lock(path))
+
+    def mtime(self, key: CacheKey) -> Optional[float]:
+        """Return the modification time of the entry, or None if there is
+        no entry.
+        """
+        raise NotImplementedError
+
+    def read(self, key: CacheKey) -> Optional[str]:
+        """Return the content of the entry, or None if there is no entry."""
+        raise NotImplementedError
+
+    def write(self, key: CacheKey, content: str) -> None:
+        """Create or replace the entry."""
+        raise NotImplementedError
+
+    def writer(self, key: CacheKey) -> "EntryWriter":
+        """Return a writer creating or replacing the entry in parts."""
+        raise NotImplementedError
+
+    def delete(self, key: CacheKey) -> None:
+        """Remove the entry, if any."""
+        raise NotImplementedError
+
+    def rename(self, key: CacheKey, target: CacheKey) -> None:
+        """Move the entry with its modification time to key `target`,
+        replacing the entry of `target`, if any.
+        """
+        raise NotImplementedError
+
+    def keys(self) -> Iterator[CacheKey]:
+        """Iterate over the keys of all entries."""
+        raise NotImplementedError
+
+    def entries(self) -> Iterator[Tuple[CacheKey, int, float]]:
+        """Iterate over the key, the stored size in bytes and the last
+        access time of all entries.
+        """
+        raise NotImplementedError
+
+
+class FileCache(CacheBackend):
+    def __init__(self, compression: str = 'none') -> None:
+        """Cache storing each entry in the file `{path}/{view}/{stem}`,
+        where `path` is the directory of the API in the configuration file.
+
+        :param compression: The compression of new entries: 'auto', 'zstd',
+                            'gzip' or 'none'.
+        """
+        self.compression = resolve_method(compression)
+
+    def path(self, key: CacheKey) -> Path:
+        """Return the path of the file of the entry."""
+        api, view, stem = key
+        return get_folder(api, view)/stem
+
+    def mtime(self, key):
+        try:
+            return self.path(key).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def read(self, key):
+        path = self.path(key)
+        try:
+            content = decompress(path.read_bytes())
+            # Record the access explicitly, as file systems mounted with
+            # noatime or relatime don't
+            stat = path.stat()
+            if stat.st_atime < time() - ATIME_RESOLUTION:
+                os.utime(path, (time(), stat.st_mtime))
+        except FileNotFoundError:
+            return None
+        return content
+
+    def write(self, key, content):
+        # Write to a temporary file next to the entry and rename it, such
+        # that readers see either the previous or the new entry in full
+        path = self.path(key)
+        fd, temp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp",
+                                    dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as ouf:
+                ouf.write(compress(content, self.compression))
+            _replace(temp, path)
+        except BaseException:
+            Path(temp).unlink(missing_ok=True)
+            raise
+
+    def writer(self, key):
+        path = self.path(key)
+        fd, temp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp",
+                                    dir=path.parent)
+        sink = os.fdopen(fd, "wb")
+
+        def commit():
+            sink.close()
+            _replace(temp, path)
+
+        def abort():
+            sink.close()
+            Path(temp).unlink(missing_ok=True)
+
+        return EntryWriter(sink, self.compression, commit, abort)
+
+    def delete(self, key):
+        self.path(key).unlink(missing_ok=True)
+
+    def rename(self, key, target):
+        try:
+            _replace(str(self.path(key)), self.path(target))
+        except FileNotFoundError:
+            pass
+
+    def keys(self):
+        if not config.has_section('Directories'):
+            return
+        for api, folder in config.items('Directories'):
+            folder = Path(folder)
+            if not folder.is_dir():
+                continue
+            for fname in folder.rglob("*"):
+                # Hidden files are temporary files of unfinished writes
+                if fname.is_file() and not fname.name.startswith("."):
+                    parent = fname.parent.relative_to(folder)
+                    view = str(parent) if parent.parts else None
+                    yield api, view, fname.name
+
+    def entries(self):
+        for key in self.keys():
+            try:
+                stat = self.path(key).stat()
+            except FileNotFoundError:
+                continue
+            yield key, stat.st_size, stat.st_atime
+
+
+class SQLiteCache(CacheBackend):
+    def __init__(self,
+                 path: Union[str, Path],
+                 compression: str = 'none'
+                 ) -> None:
+        """Cache storing all entries in a single SQLite database, which
+        can be shared by several threads and processes.
+
+        :param path: The path of the database file.  The file and its
+                     parent directories are created if they don't exist.
+        :param compression: The compression of new entries: 'auto', 'zstd',
+                            'gzip' or 'none'.
+        """
+        self.path = Path(path)
+        self.compression = resolve_method(compression)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = local()
+        with self._connection() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS entries ("
+                        "api TEXT NOT NULL, view TEXT NOT NULL, "
+                        "key TEXT NOT NULL, mtime REAL NOT NULL, "
+                        "content BLOB NOT NULL, atime REAL, "
+                        "PRIMARY KEY (api, view, key)) WITHOUT ROWID")
+            columns = [row[1] for row in
+                       con.execute("PRAGMA table_info(entries)")]
+            if "atime" not in columns:  # Databases of earlier versions
+                con.execute("ALTER TABLE entries ADD COLUMN atime REAL")
+
+    def _connection(self):
+        """Return the connection of the current thread."""
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=30)
+            # Readers don't block the writer and vice versa
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    def mtime(self, key):
+        api, view, stem = key
+        row = self._connection().execute(
+            "SELECT mtime FROM entries WHERE api=? AND view=? AND key=?",
+            (api, view or "", stem)).fetchone()
+        return row[0] if row else None
+
+    def read(self, key):
+        api, view, stem = key
+        con = self._connection()
+        row = con.execute(
+            "SELECT content, atime FROM entries "
+            "WHERE api=? AND view=? AND key=?",
+            (api, view or "", stem)).fetchone()
+        if not row:
+            return None
+        if (row[1] or 0) < time() - ATIME_RESOLUTION:
+            with con:
+                con.execute("UPDATE entries SET atime=? "
+                            "WHERE api=? AND view=? AND key=?",
+                            (time(), api, view or "", stem))
+        return decompress(row[0])
+
+    def write(self, key, content, mtime=None):
+        self._write_blob(key, compress(content, self.compression), mtime)
+
+    def writer(self, key):
+        sink = BytesIO()
+        return EntryWriter(sink, self.compression,
+                           lambda: self._write_blob(key, sink.getvalue()),
+                           lambda: None)
+
+    def _write_blob(self, key, blob, mtime=None):
+        """Create or replace the entry with compressed content `blob`."""
+        api, view, stem = key
+        with self._connection() as con:
+            con.execute("INSERT OR REPLACE INTO entries "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (api, view or "", stem, mtime or time(), blob,
+                         time()))
+
+    def delete(self, key):
+        api, view, stem = key
+        with self._connection() as con:
+            con.execute("DELETE FROM entries WHERE api=? AND view=? AND key=?",
+                        (api, view or "", stem))
+
+    def rename(self, key, target):
+        if self.mtime(key) is None:
+            return
+        with self._connection() as con:
+            con.execute("DELETE FROM entries WHERE api=? AND view=? AND key=?",
+                        (target[0], target[1] or "", target[2]))
+            con.execute("UPDATE entries SET api=?, view=?, key=? "
+                        "WHERE api=? AND view=? AND key=?",
+                        (target[0], target[1] or "", target[2],
+                         key[0], key[1] or "", key[2]))
+
+    def keys(self):
+        rows = self._connection().execute(
+            "SELECT api, view, key FROM entries").fetchall()
+        for api, view, stem in rows:
+            yield api, view or None, stem
+
+    def entries(self):
+        rows = self._connection().execute(
+            "SELECT api, view, key, length(content), coalesce(atime, mtime) "
+            "FROM entries").fetchall()
+        for api, view, stem, size, atime in rows:
+            yield (api, view or None, stem), size, atime
+
+    def import_files(self, source: Optional[FileCache] = None) -> int:
+        """Copy all entries of the file cache with their modification
+        times into the database.  Return the number of entries copied.
+        """
+        source = source or FileCache()
+        n = 0
+        for key in source.keys():
+            content = source.read(key)
+            if content is not None:
+                self.write(key, content, source.mtime(key))
+                n += 1
+        return n
+
+
+class EntryWriter:
+    def __init__(self,
+                 sink: BinaryIO,
+                 compression: str,
+                 commit: Callable[[], None],
+                 abort: Callable[[], None]
+                 ) -> None:
+        """Writer of a cache entry in parts, to be used as context manager.
+        The parts are compressed into `sink` as they are appended.  The
+        entry is created by `commit` when the context exits normally, and
+        discarded by `abort` when it exits with an exception, such that
+        readers never see a partial entry.
+        """
+        self.size = 0
+        self._sink = sink
+        self._stream = compressing_writer(sink, compression)
+        self._commit = commit
+        self._abort = abort
+
+    def append(self, content: str) -> None:
+        """Append text to the entry."""
+        self._stream.write(content.encode('utf8'))
+        self.size += len(content)
+
+    def __enter__(self) -> "EntryWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is not None:
+            self._abort()
+            return
+        if self._stream is not self._sink:
+            self._stream.close()
+        self._commit()
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256*2**20
+                 ) -> None:
+        """In-process least-recently-used store of parsed cache entries, in
+        front of the cache backend.  The parsed objects are shared by all
+        readers and must not be modified.
+
+        :param max_entries: The maximum number of entries.  Zero disables
+                            the store.
+        :param max_bytes: The maximum total size of the entries, measured
+                          as the length of their serialized content.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[Tuple[Any, float]]:
+        """Return the parsed entry and its modification time, or None."""
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            value, mtime, _ = self._entries[key]
+            return value, mtime
+
+    def put(self, key: CacheKey, value: Any, mtime: float, size: int) -> None:
+        """Store the parsed entry, evicting the least recently used entries
+        beyond the limits.  Entries larger than `max_bytes` are not stored.
+        """
+        if not self.max_entries or size > self.max_bytes:
+            self.discard(key)
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.size -= old[2]
+            self._entries[key] = (value, mtime, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or \
+                    self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def discard(self, key: CacheKey) -> None:
+        """Remove the entry, if any."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.size -= old[2]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def _replace(source: str, target: Path, attempts: int = 10) -> None:
+    """Auxiliary function to rename `source` to `target` atomically.  On
+    Windows, the rename fails while another process reads `target`, hence
+    several attempts.
+    """
+    for attempt in range(attempts):
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            sleep(0.05*(attempt + 1))
+
+
+class _StripeLock:
+    """Auxiliary class holding the lock file of a stripe for the process as
+    long as one of its threads holds an entry of the stripe.  Threads
+    holding different entries of a stripe don't wait for each other, e.g.
+    while a search streamed page by page keeps its entry locked, its
+    consumer can refresh other entries; other processes wait for the
+    stripe.
+    """
+    def __init__(self, path: Path) -> None:
+        self._file_lock = FileLock(path)
+        self._lock = Lock()
+        self._holders = 0
+
+    def acquire(self) -> None:
+        with self._lock:
+            if not self._holders:
+                self._file_lock.acquire()
+            self._holders += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._holders -= 1
+            if not self._holders:
+                self._file_lock.release()
+
+
+class _EntryLock:
+    """Auxiliary class to lock an entry: against the threads of the process
+    by a lock of the key, against other processes by the lock of its
+    stripe.
+    """
+    def __init__(self, key: CacheKey, stripe: _StripeLock) -> None:
+        self._key = key
+        self._stripe = stripe
+
+    def __enter__(self):
+        lock = _key_lock(self._key, 1)
+        lock.acquire()
+        try:
+            self._stripe.acquire()
+        except BaseException:
+            lock.release()
+            _key_lock(self._key, -1)
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            self._stripe.release()
+        finally:
+            _key_lock(self._key, -1).release()
+
+
+_stripe_locks: Dict[Path, _StripeLock] = {}
+_key_locks: Dict[CacheKey, list] = {}
+_stripe_locks_lock = Lock()
+
+
+def _stripe_lock(path: Path) -> _StripeLock:
+    """Auxiliary function to return the lock of a lock file, shared by all
+    threads of the process.
+    """
+    with _stripe_locks_lock:
+        if path not in _stripe_locks:
+            _stripe_locks[path] = _StripeLock(path)
+        return _stripe_locks[path]
+
+
+def _key_lock(key: CacheKey, users: int) -> Lock:
+    """Auxiliary function to return the lock of a key within the process,
+    after adding `users` to the number of its users; the lock is dropped
+    when it has no users left.
+    """
+    with _stripe_locks_lock:
+        entry = _key_locks.setdefault(key, [Lock(), 0])
+        entry[1] += users
+        if not entry[1]:
+            del _key_locks[key]
+        return entry[0]
+
+
+_cache = None
+_memory_cache = None
+_cache_lock = Lock()
+
+
+def get_cache() -> CacheBackend:
+    """Return the cache backend selected in section `[Cache]` of the
+    configuration file: `Backend = file` (default) for one file per entry,
+    or `Backend = sqlite` for a single database at `Path`.  New entries are
+    compressed according to `Compression` ('auto' by default, i.e. zstd if
+    the package zstandard is installed and gzip otherwise).
+    Size limits (`MaxSize` and section `[Cache Quotas]`) start the eviction
+    of least recently used entries in the background, see
+    `utils/housekeeping.py`.  A directory `LockDir` enables the locking of
+    entries while they are refreshed, such that several processes can
+    share the cache without downloading the same entry twice.
+
+    Raises
+    ------
+    ValueError
+        If the backend or the compression is not one of the allowed values.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from .constants import DEFAULT_CACHE_DB
+
+            backend = config.get('Cache', 'Backend', fallback='file').lower()
+            compression = config.get('Cache', 'Compression', fallback='auto')
+            if backend == 'file':
+                _cache = FileCache(compression)
+            elif backend == 'sqlite':
+                path = config.get('Cache', 'Path', fallback=str(DEFAULT_CACHE_DB))
+                _cache = SQLiteCache(path, compression)
+            else:
+                msg = "Cache backend must be one of 'file', 'sqlite'."
+                raise ValueError(msg)
+            lock_dir = config.get('Cache', 'LockDir', fallback='').strip()
+            if lock_dir:
+                _cache.lock_dir = Path(lock_dir)
+            from .housekeeping import start_housekeeping
+            start_housekeeping(_cache)
+        return _cache
+
+
+def get_memory_cache() -> MemoryCache:
+    """Return the in-process store of parsed entries, bounded by
+    `MemoryEntries` entries and `MemoryBytes` bytes in section `[Cache]` of
+    the configuration file.
+    """
+    global _memory_cache
+    with _cache_lock:
+        if _memory_cache is None:
+            entries = config.getint('Cache', 'MemoryEntries', fallback=256)
+            size = config.getint('Cache', 'MemoryBytes', fallback=256*2**20)
+            _memory_cache = MemoryCache(entries, size)
+        return _memory_cache
@@ -0,0 +1,83 @@
+"""Transparent compression of the cache entries."""
+
+import gzip
+from typing import BinaryIO, Union
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+METHODS = ('auto', 'zstd', 'gzip', 'none')
+
+
+def resolve_method(method: str) -> str:
+    """Return the compression method to use for `method`, where 'auto'
+    means zstd if the package `zstandard` is installed and gzip otherwise.
+
+    Raises
+    ------
+    ValueError
+        If the method is not one of the allowed values, or if it is 'zstd'
+        and the package `zstandard` is not installed.
+    """
+    method = method.lower()
+    if method not in METHODS:
+        raise ValueError(f"Compression must be one of {', '.join(METHODS)}.")
+    if method == 'auto':
+        method = 'zstd' if zstandard else 'gzip'
+    if method == 'zstd' and not zstandard:
+        raise ValueError("Compression 'zstd' requires package zstandard.")
+    return method
+
+
+def compress(content: str, method: str = 'gzip') -> bytes:
+    """Return `content` encoded as UTF-8 and compressed with `method`
+    ('zstd', 'gzip' or 'none').
+    """
+    data = content.encode('utf8')
+    if method == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if method == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    return data
+
+
+def compressing_writer(fileobj: BinaryIO, method: str = 'gzip') -> BinaryIO:
+    """Return a stream compressing what is written to it with `method`
+    ('zstd', 'gzip' or 'none') into `fileobj`.  Closing the stream
+    finishes the compressed data but leaves `fileobj` open.
+    """
+    if method == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=3)
+        return compressor.stream_writer(fileobj, closefd=False)
+    if method == 'gzip':
+        return gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=6,
+                             mtime=0)
+    return fileobj
+
+
+def decompress(data: Union[bytes, str]) -> str:
+    """Return the text of a cache entry, detecting the compression from
+    the leading bytes such that uncompressed entries keep working.
+
+    Raises
+    ------
+    ValueError
+        If the entry is compressed with zstd and the package `zstandard`
+        is not installed.
+    """
+    if isinstance(data, str):
+        return data
+    if data.startswith(ZSTD_MAGIC):
+        if not zstandard:
+            raise ValueError("Reading zstd-compressed cache entries "
+                             "requires package zstandard.")
+        # Entries written in parts don't record their size in the frame
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        return decompressor.decompress(data).decode('utf8')
+    if data.startswith(GZIP_MAGIC):
+        return gzip.decompress(data).decode('utf8')
+    return data.decode('utf8')
@@ -0,0 +1,134 @@
+"""Adaptive limitation of the number of concurrent requests per API."""
+
+from threading import Condition
+from time import monotonic, time
+from typing import Mapping, Optional
+
+# Longest pause in seconds taken from an `X-RateLimit-Reset` header; later
+# resets denote an exhausted quota, which is the business of the key pool
+MAX_RESET_PAUSE = 60
+
+
+class AdaptiveLimiter:
+    def __init__(self,
+                 ceiling: int,
+                 initial: int = 1,
+                 increase: float = 1.0,
+                 decrease: float = 0.5,
+                 spike_factor: float = 3.0,
+                 name: str = "limiter"
+                 ) -> None:
+        """Additive-increase/multiplicative-decrease (AIMD) limit of the
+        number of requests in flight.
+
+        Each fast and successful response raises the limit by
+        `increase`/limit, i.e. by `increase` per round of requests, up to
+        `ceiling`.  A 429 response or a latency spike cuts the limit by
+        factor `decrease`, at most once per round.  `Retry-After` and
+        near `X-RateLimit-Reset` headers of 429 responses pause all
+        requests until the indicated time.
+
+        :param ceiling: The maximum number of concurrent requests.
+        :param initial: The initial number of concurrent requests.
+        :param increase: The additive increase of the limit per round.
+        :param decrease: The multiplicative decrease of the limit.
+        :param spike_factor: The multiple of the average latency above
+                             which a response counts as latency spike.
+        :param name: The name of the limiter, usually the API name.
+        """
+        self.ceiling = max(int(ceiling), 1)
+        self.limit = float(min(max(initial, 1), self.ceiling))
+        self.increase = increase
+        self.decrease = decrease
+        self.spike_factor = spike_factor
+        self.name = name
+        self._cond = Condition()
+        self._in_flight = 0
+        self._epoch = 0
+        self._latency: Optional[float] = None
+        self._samples = 0
+        self._paused_until = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently in flight."""
+        return self._in_flight
+
+    def acquire(self) -> int:
+        """Block until a request may start.  Return the token to pass on
+        to `release()` once the response arrived.
+        """
+        with self._cond:
+            while True:
+                pause = self._paused_until - monotonic()
+                if pause <= 0 and self._in_flight < int(self.limit):
+                    break
+                self._cond.wait(pause if pause > 0 else None)
+            self._in_flight += 1
+            return self._epoch
+
+    def release(self,
+                token: int,
+                latency: float,
+                status: Optional[int] = None,
+                headers: Optional[Mapping] = None
+                ) -> None:
+        """Account for the response of a request and adapt the limit.
+
+        :param token: The token returned by `acquire()`.
+        :param latency: The duration of the request in seconds.
+        :param status: The HTTP status code, or None if the request failed
+                       without response (e.g. timeout).
+        :param headers: The headers of the response.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if status == 429:
+                self._pause(headers or {})
+                self._cut(token)
+            elif status is None:
+                self._cut(token)
+            else:
+                spike = self._is_spike(latency)
+                if status < 400:
+                    self._learn(latency)
+                if spike:
+                    self._cut(token)
+                elif status < 400 and self.limit < self.ceiling:
+                    self.limit = min(self.ceiling,
+                                     self.limit + self.increase/int(self.limit))
+            self._cond.notify_all()
+
+    def _cut(self, epoch):
+        """Cut the limit once per round: responses to requests started
+        before the last cut don't cut again.
+        """
+        if epoch == self._epoch:
+            self.limit = max(1.0, self.limit*self.decrease)
+            self._epoch += 1
+
+    def _is_spike(self, latency):
+        """Whether the latency exceeds the average latency by far."""
+        return self._samples >= 5 and \
+            latency > self.spike_factor*self._latency
+
+    def _learn(self, latency):
+        """Update the moving average of the latency."""
+        self._samples += 1
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += 0.1*(latency - self._latency)
+
+    def _pause(self, headers):
+        """Pause all requests as indicated by the headers of a 429."""
+        try:
+            pause = float(headers['Retry-After'])
+        except (KeyError, TypeError, ValueError):
+            try:
+                pause = float(headers['X-RateLimit-Reset']) - time()
+            except (KeyError, TypeError, ValueError):
+                return
+            if pause > MAX_RESET_PAUSE:
+                return
+        self._paused_until = max(self._paused_until, monotonic() + pause)
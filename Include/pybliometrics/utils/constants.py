@@ -42,6 +42,20 @@ DEFAULT_PATHS = {
     'WorldLookup': BASE_PATH_SCIVAL/'world_lookup'
 }
 
+# Database of the SQLite cache backend
+DEFAULT_CACHE_DB = Path.home()/".cache"/"pybliometrics"/"cache.sqlite"
+
+# Freshness policies of the APIs, see `utils/freshness.py`: written to new
+# configuration files and used if the configuration file has no section
+# `[Freshness]`
+DEFAULT_FRESHNESS = {
+    'AuthorSearch': 'max-age=7, stale-while-revalidate=30',
+    'AuthorRetrieval': 'max-age=1, stale-while-revalidate=30',
+    'AuthorLookup': 'max-age=7, stale-while-revalidate=30',
+    'CitationOverview': 'max-age=7, stale-while-revalidate=30',
+    'ScopusSearch': 'max-age=10, stale-while-revalidate=30'
+}
+
 # Configuration file location
 if 'PYB_CONFIG_FILE' in environ:
     CONFIG_FILE = Path(environ['PYB_CONFIG_FILE'])
@@ -53,10 +67,12 @@ else:
     else:
         CONFIG_FILE = Path.home()/".config"/"pybliometrics.cfg"
 
-# URLs for all classes
-RETRIEVAL_BASE = 'https://api.elsevier.com/content/'
-SEARCH_BASE = 'https://api.elsevier.com/content/search/'
-LOOKUP_BASE = 'https://api.elsevier.com/analytics/scival/'
+# URLs for all classes; PYB_API_BASE redirects all requests to another
+# host, e.g. the local stand-in server of `utils/standin_server.py`
+API_BASE = environ.get('PYB_API_BASE', 'https://api.elsevier.com').rstrip('/')
+RETRIEVAL_BASE = API_BASE + '/content/'
+SEARCH_BASE = API_BASE + '/content/search/'
+LOOKUP_BASE = API_BASE + '/analytics/scival/'
 URLS = {
     'AbstractRetrieval': RETRIEVAL_BASE + 'abstract/',
     'AffiliationRetrieval': RETRIEVAL_BASE + 'affiliation/affiliation_id/',
@@ -68,7 +84,7 @@ URLS = {
     'SerialSearch': RETRIEVAL_BASE + 'serial/title',
     'SerialTitle': RETRIEVAL_BASE + 'serial/title/issn/',
     'SubjectClassifications': RETRIEVAL_BASE + 'subject/scopus',
-    'PlumXMetrics': 'https://api.elsevier.com/analytics/plumx/',
+    'PlumXMetrics': API_BASE + '/analytics/plumx/',
 
     'AuthorLookup': LOOKUP_BASE + 'author/',
     'CountryLookup': LOOKUP_BASE + 'country/',
@@ -112,3 +128,4 @@ RATELIMITS = {
 
 # Other API restrictions
 SEARCH_MAX_ENTRIES = 5_000
+SCIVAL_MAX_AUTHORS = 100  # Authors per request of the SciVal metrics
@@ -1,4 +1,4 @@
-import configparser, os
+import configparser, os, tempfile
 from typing import List, Optional
 from pathlib import Path
 
@@ -13,7 +13,8 @@ def create_config(keys: Optional[List[str]] = None,
     :param insttoken: An InstToken to be used alongside the key(s).  Will only
                       be used if `keys` is not empty.
     """
-    from .constants import CONFIG_FILE, DEFAULT_PATHS
+    from .constants import CONFIG_FILE, DEFAULT_CACHE_DB, DEFAULT_FRESHNESS, \
+        DEFAULT_PATHS
 
     config = configparser.ConfigParser()
     config.optionxform = str
@@ -41,6 +42,37 @@ def create_config(keys: Optional[List[str]] = None,
     config.add_section('Requests')
     config.set('Requests', 'Timeout', '20')
     config.set('Requests', 'Retries', '5')
+    config.set('Requests', 'MaxWorkers', '16')
+    config.set('Requests', 'RateLimitDir',
+               str(Path(tempfile.gettempdir())/"pybliometrics_ratelimit"))
+    config.set('Requests', 'MetricsFile', '')
+
+    # Cache backend: one file per request ('file') or one database ('sqlite'),
+    # with entries compressed by zstd if available or gzip ('auto')
+    config.add_section('Cache')
+    config.set('Cache', 'Backend', 'file')
+    config.set('Cache', 'Path', str(DEFAULT_CACHE_DB))
+    config.set('Cache', 'Compression', 'auto')
+    config.set('Cache', 'MemoryEntries', '256')
+    config.set('Cache', 'MemoryBytes', str(256*2**20))
+
+    # Locking of entries while they are refreshed, for several processes
+    # sharing the cache: set e.g. `LockDir = <folder>` to enable it
+    config.set('Cache', 'LockDir', '')
+
+    # Cache size: no limit by default; set e.g. `MaxSize = 2GB` and per-API
+    # limits such as `AbstractRetrieval = 500MB` to evict old entries
+    config.set('Cache', 'MaxSize', '')
+    config.set('Cache', 'HousekeepingInterval', '3600')
+    config.add_section('Cache Quotas')
+
+    # Freshness per API in days: entries older than max-age but within
+    # stale-while-revalidate are used at once and refreshed in the background
+    config['Freshness'] = DEFAULT_FRESHNESS
+
+    # Searches without results and retrievals not found are cached for one
+    # day, whatever the freshness or `refresh`; 0 disables this
+    config.set('Cache', 'NegativeTTL', '1')
 
     # Définir le chemin dans le fichier de configuration
     config['Docs Path'] = {
@@ -0,0 +1,81 @@
+"""Inter-process lock based on an OS-level lock of a file."""
+
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Union
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+    import fcntl
+
+
+class FileLock:
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Exclusive lock shared by all threads and processes that use the
+        same lock file.  To be used as context manager.
+
+        :param path: The path of the lock file.  The file and its parent
+                     directories are created if they don't exist.  The file
+                     is never removed, its content is irrelevant.
+        """
+        self._path = Path(path)
+        self._fd = None
+        self._thread_lock = Lock()
+
+    def acquire(self) -> None:
+        """Block until the lock is acquired."""
+        self._thread_lock.acquire()
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                _lock_fd(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._fd = fd
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        """Release the lock."""
+        fd, self._fd = self._fd, None
+        try:
+            _unlock_fd(fd)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def _lock_fd(fd):
+    """Auxiliary function to lock the first byte of an open file."""
+    if msvcrt:
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK gives up after 10 seconds
+                continue
+    else:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _unlock_fd(fd):
+    """Auxiliary function to unlock a file locked with `_lock_fd()`."""
+    if msvcrt:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
@@ -0,0 +1,106 @@
+"""Per-API freshness policies of the cached entries.
+
+Policies are set in section `[Freshness]` of the configuration file, in
+days and with the directives of HTTP's Cache-Control header, e.g.
+
+    [Freshness]
+    AuthorRetrieval = max-age=1, stale-while-revalidate=30
+    ScopusSearch = max-age=10
+
+An entry younger than `max-age` is fresh and used as is.  An entry older
+than that by at most `stale-while-revalidate` is stale: it is used
+immediately and refreshed in the background for the next use.  Older
+entries are refreshed before use.  A policy replaces the boolean `refresh`
+parameter of all classes of its API, whereas a number of days passed as
+`refresh` takes precedence over the policy.  Without section `[Freshness]`, e.g.
+in configuration files created by earlier versions, the policies of
+`DEFAULT_FRESHNESS` in `utils/constants.py` apply; an empty section
+disables all policies.
+
+Entries recording a miss, i.e. searches without results and retrievals
+not found, are subject to `NegativeTTL` in section `[Cache]` instead, in
+days: they are used as long as they are younger, whatever the policy or
+`refresh`, and refreshed once they are older.
+"""
+
+import re
+from threading import Lock
+from time import time
+from typing import Dict, NamedTuple, Optional
+
+from .constants import DEFAULT_FRESHNESS
+from .startup import config
+
+FRESH, STALE, EXPIRED = 'fresh', 'stale', 'expired'
+
+
+class FreshnessPolicy(NamedTuple):
+    max_age: float
+    stale_while_revalidate: float = 0.0
+
+    def state(self, mod_ts: Optional[float]) -> str:
+        """Return 'fresh', 'stale' or 'expired' for an entry with
+        modification time `mod_ts` (None if there is no entry).
+        """
+        if mod_ts is None:
+            return EXPIRED
+        age = (time() - mod_ts)/86400
+        if age <= self.max_age:
+            return FRESH
+        if age <= self.max_age + self.stale_while_revalidate:
+            return STALE
+        return EXPIRED
+
+
+def parse_policy(value: str) -> FreshnessPolicy:
+    """Return the policy of a value such as 'max-age=1,
+    stale-while-revalidate=30' or '7' (the maximum age only), in days.
+
+    Raises
+    ------
+    ValueError
+        If the value contains unknown directives or invalid numbers.
+    """
+    directives = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        match = re.fullmatch(r"(?:([a-z-]+)\s*=\s*)?(\d+(?:\.\d+)?)", part)
+        name = match and (match.group(1) or 'max-age')
+        if name not in ('max-age', 'stale-while-revalidate'):
+            raise ValueError(f"Invalid freshness policy: '{value}'.")
+        directives[name] = float(match.group(2))
+    if 'max-age' not in directives:
+        raise ValueError(f"Freshness policy '{value}' lacks max-age.")
+    return FreshnessPolicy(directives['max-age'],
+                           directives.get('stale-while-revalidate', 0.0))
+
+
+_policies: Optional[Dict[str, FreshnessPolicy]] = None
+_policies_lock = Lock()
+
+
+def get_policy(api: str) -> Optional[FreshnessPolicy]:
+    """Return the freshness policy of `api` in the configuration file (the
+    default policy if the file has no section `[Freshness]`), or None if
+    there is none.
+    """
+    global _policies
+    with _policies_lock:
+        if _policies is None:
+            _policies = {}
+            if config.has_section('Freshness'):
+                items = config.items('Freshness')
+            else:
+                items = DEFAULT_FRESHNESS.items()
+            for name, value in items:
+                if value.strip():
+                    _policies[name] = parse_policy(value)
+        return _policies.get(api)
+
+
+def get_negative_ttl() -> Optional[float]:
+    """Return the maximum age in days of cached misses, i.e. `NegativeTTL`
+    in section `[Cache]` of the configuration file (1 by default), or None
+    if misses are not cached.
+    """
+    ttl = config.getfloat('Cache', 'NegativeTTL', fallback=1)
+    return ttl if ttl > 0 else None
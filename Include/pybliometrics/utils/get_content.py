@@ -1,8 +1,16 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import current_thread
+from time import perf_counter
+
 from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
 from ..scopus.exception import *
+from .metrics import METRICS
+from .single_flight import SingleFlight, flight_key
 from .startup import config
 
 # Define user agent string for HTTP requests
@@ -14,12 +22,19 @@ errors = {400: Scopus400Error, 401: Scopus401Error,
           414: Scopus414Error, 429: Scopus429Error}
 
 _retries = config.getint("Requests", "Retries", fallback=5)
+# Retries on server errors only: 429s are left to the adaptive concurrency
+# limiter and to the key pool
 retry = Retry(total=_retries, status_forcelist=[500, 501, 502, 503, 504, 524],
-              backoff_factor=0.1)
-adapter = HTTPAdapter(max_retries=retry)
+              backoff_factor=0.1, respect_retry_after_header=False)
+# Connection pool shared by the synchronous and the asynchronous transport
+_max_workers = config.getint("Requests", "MaxWorkers", fallback=16)
+adapter = HTTPAdapter(max_retries=retry, pool_maxsize=_max_workers)
 session = Session()
 session.mount('http://', adapter)
 session.mount('https://', adapter)
+_executor = ThreadPoolExecutor(max_workers=_max_workers,
+                               thread_name_prefix='pybliometrics')
+_flights = SingleFlight()
 
 def get_content(url, api, params=None, **kwds):
     """Helper function to download a file and return its content.
@@ -53,54 +68,71 @@ def get_content(url, api, params=None, **kwds):
     -------
     resp : byte-like object
         The content of the file, which needs to be serialized.
+
+    Notes
+    -----
+    Concurrent calls with the same URL, parameters and API share a
+    single HTTP request and receive the same response object.
     """
-    from random import shuffle
-    from time import sleep, time
+    params = params or {}
+    params.update(**kwds)
+    return _flights.do(flight_key(url, params, api), _get_content,
+                       url, api, params)
 
-    from .startup import _throttling_params, KEYS
 
-    # Set header, params and proxy
-    try:
-        header = {'X-ELS-APIKey': KEYS[0],
-                  'Accept': 'application/json',
-                  'User-Agent': user_agent}
-    except IndexError:
-        raise errors[429]
+def _get_content(url, api, params):
+    """Auxiliary function performing the request of `get_content()`."""
+    from .startup import KEY_POOL
 
+    # Set header, params and proxy; explicitly provided credentials
+    # replace the keys of the pool
+    pooled = "apikey" not in params
+    key = KEY_POOL.get(api) if pooled else params.pop("apikey")
+    if not key:
+        raise errors[429]
+    header = {'X-ELS-APIKey': key,
+              'Accept': 'application/json',
+              'User-Agent': user_agent}
     if config.has_option('Authentication', 'InstToken'):
         token = config.get('Authentication', 'InstToken')
         header['X-ELS-Insttoken'] = token
-    params = params or {}
-    params.update(**kwds)
-    proxies = dict(config._sections.get("Proxy", {}))
-
-    # Replace credentials if provided
-    if "apikey" in params:
-        header['X-ELS-APIKey'] = params.pop("apikey")
     if "insttoken" in params:
         header['X-ELS-Insttoken'] = params.pop("insttoken")
+    proxies = dict(config._sections.get("Proxy", {}))
 
-    # Eventually wait bc of throttling
-    if len(_throttling_params[api]) == _throttling_params[api].maxlen:
-        try:
-            sleep(1 - (time() - _throttling_params[api][0]))
-        except (IndexError, ValueError):
-            pass
-    
-    # Perform request, eventually replacing the current key
+    # Perform request, eventually switching to the key with the most
+    # remaining quota when a key is exhausted; exhausted keys return to the
+    # pool after their reset.  Throttled requests are repeated with the
+    # same key once the concurrency limiter allows it again.  Keys put
+    # aside briefly (responses without reset time) may return while still
+    # exhausted, hence a bound on the switches as well.
     timeout = config.getint("Requests", "Timeout", fallback=20)
-    resp = session.get(url, headers=header, proxies=proxies, params=params,
-                      timeout=timeout)
+    resp = _timed_get(api, url, headers=header, proxies=proxies,
+                      params=params, timeout=timeout)
+    if pooled:
+        KEY_POOL.update(key, api, resp.headers)
+    throttled = switched = 0
     while resp.status_code == 429:
-        try:
-            KEYS.pop(0)  # Remove current key
-            shuffle(KEYS)
-            header['X-ELS-APIKey'] = KEYS[0].strip()
-            resp = session.get(url, headers=header, proxies=proxies,
-                               params=params, timeout=timeout)
-        except IndexError:  # All keys depleted
-            break
-    _throttling_params[api].append(time())
+        if _quota_exceeded(resp.headers):
+            if not pooled:
+                break
+            KEY_POOL.exhaust(key, api, resp.headers)
+            switched += 1
+            if switched > len(KEY_POOL.keys)*_retries:
+                break
+            key = KEY_POOL.get(api)
+            if not key:  # All keys depleted
+                break
+            header['X-ELS-APIKey'] = key
+        else:
+            throttled += 1
+            if throttled > _retries:
+                break
+        METRICS.record_retry(api)
+        resp = _timed_get(api, url, headers=header, proxies=proxies,
+                          params=params, timeout=timeout)
+        if pooled:
+            KEY_POOL.update(key, api, resp.headers)
     # Eventually raise error, if possible with supplied error message
     try:
         error_type = errors[resp.status_code]
@@ -117,6 +149,80 @@ def get_content(url, api, params=None, **kwds):
     return resp
 
 
+def _timed_get(api, url, **kwds):
+    """Auxiliary function performing a GET request with the shared session
+    within the limits of throttling and of the adaptive concurrency, and
+    recording it in `METRICS`.
+    """
+    from .startup import _concurrency, _rate_limiters
+
+    token = _concurrency[api].acquire()
+    status = headers = None
+    # Eventually wait bc of throttling
+    _rate_limiters[api].acquire()
+    start = perf_counter()
+    try:
+        resp = session.get(url, **kwds)
+        status, headers = resp.status_code, resp.headers
+    finally:
+        latency = perf_counter() - start
+        _concurrency[api].release(token, latency, status, headers)
+    # Retries of urllib3 on server errors happen within the request
+    history = getattr(getattr(resp.raw, 'retries', None), 'history', None) or ()
+    METRICS.record_request(api, latency, len(resp.content), resp.status_code,
+                           len(history), sum(h.status == 429 for h in history))
+    return resp
+
+
+def _quota_exceeded(headers):
+    """Whether the headers of a 429 response denote an exhausted quota of
+    the key, as opposed to a throttled request.
+    """
+    return headers.get('X-RateLimit-Remaining') == '0' or \
+        'QUOTA_EXCEEDED' in headers.get('X-ELS-Status', '')
+
+
+async def async_get_content(url, api, params=None, **kwds):
+    """Asynchronous version of `get_content()`.
+
+    The request is performed on the pooled executor, such that many
+    requests can wait on the network at the same time while sharing the
+    connection pool and the throttling of `get_content()`.  Parameters,
+    return value and exceptions are the same as for `get_content()`.
+    """
+    return await run_in_executor(get_content, url, api, params, **kwds)
+
+
+async def run_in_executor(func, *args, **kwds):
+    """Await `func(*args, **kwds)` executed on the pooled executor."""
+    loop = get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwds))
+
+
+def run_in_background(func, *args, **kwds):
+    """Execute `func(*args, **kwds)` on the pooled executor and return the
+    future of its result.
+    """
+    return _executor.submit(func, *args, **kwds)
+
+
+def map_in_background(func, items):
+    """Return the results of `func` applied to each of `items`, computed
+    concurrently on the pooled executor.  Workers of the executor compute
+    them sequentially, since waiting on further tasks of the executor could
+    block it.
+    """
+    if in_executor():
+        return [func(item) for item in items]
+    futures = [_executor.submit(func, item) for item in items]
+    return [future.result() for future in futures]
+
+
+def in_executor():
+    """Whether the calling thread is a worker of the pooled executor."""
+    return current_thread().name.startswith('pybliometrics')
+
+
 def detect_id_type(sid):
     """Method that tries to infer the type of abstract ID.
 
@@ -0,0 +1,196 @@
+"""Size limits of the cache with least-recently-used eviction.
+
+The limits are set in the configuration file: `MaxSize` in section
+`[Cache]` bounds the whole cache and section `[Cache Quotas]` bounds
+single APIs, e.g.
+
+    [Cache]
+    MaxSize = 2GB
+    HousekeepingInterval = 3600
+
+    [Cache Quotas]
+    AbstractRetrieval = 500MB
+
+Usage report and eviction from the command line:
+
+    python -m Include.pybliometrics.utils.housekeeping [--evict]
+"""
+
+import argparse
+import re
+from collections import defaultdict
+from threading import Event, Thread
+from typing import Dict, List, Optional
+
+from .cache import CacheBackend, get_cache
+from .startup import config
+
+UNITS = {'': 1, 'B': 1, 'KB': 10**3, 'MB': 10**6, 'GB': 10**9, 'TB': 10**12,
+         'KIB': 2**10, 'MIB': 2**20, 'GIB': 2**30, 'TIB': 2**40}
+
+
+def parse_size(value: str) -> Optional[int]:
+    """Return the number of bytes of a size such as '500MB', '2 GiB' or
+    '1048576', or None for an empty value (no limit).
+
+    Raises
+    ------
+    ValueError
+        If the value is not a valid size.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([a-zA-Z]*)", value)
+    if not match or match.group(2).upper() not in UNITS:
+        raise ValueError(f"Invalid cache size: '{value}'.")
+    return int(float(match.group(1))*UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    """Return a size in bytes in human-readable form."""
+    for unit in ('B', 'kB', 'MB', 'GB'):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} TB"
+
+
+def get_limits() -> Dict[Optional[str], int]:
+    """Return the size limits in bytes of the configuration file, keyed by
+    API and by None for the whole cache.
+    """
+    limits = {}
+    total = parse_size(config.get('Cache', 'MaxSize', fallback=''))
+    if total is not None:
+        limits[None] = total
+    if config.has_section('Cache Quotas'):
+        for api, value in config.items('Cache Quotas'):
+            size = parse_size(value)
+            if size is not None:
+                limits[api] = size
+    return limits
+
+
+def usage(cache: Optional[CacheBackend] = None) -> Dict[str, Dict[str, int]]:
+    """Return the number of entries and their stored size in bytes per API.
+    """
+    cache = cache or get_cache()
+    result = defaultdict(lambda: {'entries': 0, 'bytes': 0})
+    for (api, _, _), size, _ in cache.entries():
+        result[api]['entries'] += 1
+        result[api]['bytes'] += size
+    return dict(result)
+
+
+def evict(cache: Optional[CacheBackend] = None,
+          limits: Optional[Dict[Optional[str], int]] = None
+          ) -> Dict[str, int]:
+    """Delete the least recently used entries until each API fits its
+    limit and then the whole cache fits the global limit.  Return the
+    number of deleted entries per API.
+
+    :param cache: The cache backend, by default the configured one.
+    :param limits: The size limits in bytes keyed by API and by None for
+                   the whole cache, by default those of the configuration
+                   file.
+    """
+    cache = cache or get_cache()
+    limits = get_limits() if limits is None else limits
+    deleted = defaultdict(int)
+    if not limits:
+        return {}
+    # Oldest entries first
+    entries = sorted(cache.entries(), key=lambda entry: entry[2])
+    sizes = defaultdict(int)
+    for (api, _, _), size, _ in entries:
+        sizes[api] += size
+    # First the limits of the APIs, then the global limit with what remains
+    kept = []
+    for key, size, atime in entries:
+        api = key[0]
+        if api in limits and sizes[api] > limits[api]:
+            cache.delete(key)
+            sizes[api] -= size
+            deleted[api] += 1
+        else:
+            kept.append((key, size, atime))
+    total = sum(sizes.values())
+    for key, size, _ in kept:
+        if None not in limits or total <= limits[None]:
+            break
+        cache.delete(key)
+        total -= size
+        deleted[key[0]] += 1
+    return dict(deleted)
+
+
+class Housekeeper(Thread):
+    def __init__(self,
+                 cache: CacheBackend,
+                 limits: Dict[Optional[str], int],
+                 interval: float = 3600
+                 ) -> None:
+        """Daemon thread evicting least recently used entries of `cache`
+        beyond `limits` at start and then every `interval` seconds.
+        """
+        super().__init__(name="pybliometrics-housekeeping", daemon=True)
+        self.cache = cache
+        self.limits = limits
+        self.interval = interval
+        self._stopped = Event()
+
+    def run(self) -> None:
+        while True:
+            try:
+                evict(self.cache, self.limits)
+            except OSError:
+                pass  # E.g. a file deleted by another process; try again later
+            if self._stopped.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        """Stop the thread after the current eviction, if any."""
+        self._stopped.set()
+
+
+def start_housekeeping(cache: CacheBackend) -> Optional[Housekeeper]:
+    """Start the background eviction of `cache` if the configuration file
+    sets size limits and `HousekeepingInterval` in section `[Cache]` is not
+    zero.  Return the thread, or None.
+    """
+    limits = get_limits()
+    interval = config.getfloat('Cache', 'HousekeepingInterval', fallback=3600)
+    if not limits or interval <= 0:
+        return None
+    housekeeper = Housekeeper(cache, limits, interval)
+    housekeeper.start()
+    return housekeeper
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Report the cache usage per API from the command line."""
+    parser = argparse.ArgumentParser(description="Report the cache usage "
+                                     "per API and its limits.")
+    parser.add_argument("--evict", action="store_true",
+                        help="delete least recently used entries beyond the "
+                             "limits first")
+    opts = parser.parse_args(args)
+    limits = get_limits()
+    if opts.evict:
+        for api, n in sorted(evict(limits=limits).items()):
+            print(f"Evicted {n:,} entries of {api}")
+    stats = usage()
+    print(f"{'API':<26}{'entries':>10}{'size':>12}{'limit':>12}")
+    for api in sorted(stats):
+        limit = format_size(limits[api]) if api in limits else "-"
+        print(f"{api:<26}{stats[api]['entries']:>10,}"
+              f"{format_size(stats[api]['bytes']):>12}{limit:>12}")
+    limit = format_size(limits[None]) if None in limits else "-"
+    print(f"{'Total':<26}{sum(s['entries'] for s in stats.values()):>10,}"
+          f"{format_size(sum(s['bytes'] for s in stats.values())):>12}"
+          f"{limit:>12}")
+
+
+if __name__ == '__main__':
+    main()
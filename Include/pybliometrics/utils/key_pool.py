@@ -0,0 +1,74 @@
+"""Quota-aware pool of API keys."""
+
+from threading import Lock
+from time import time
+from typing import Dict, List, Optional, Tuple
+
+
+class KeyPool:
+    def __init__(self, keys: List[str]) -> None:
+        """Pool of API keys that tracks the remaining quota of each key for
+        each API, as reported in the `X-RateLimit-*` response headers.
+
+        :param keys: The API keys, in the order of preference.
+        """
+        self._keys = [k.strip() for k in keys if k.strip()]
+        self._quota: Dict[Tuple[str, str], Tuple[Optional[int], float]] = {}
+        self._lock = Lock()
+
+    @property
+    def keys(self) -> List[str]:
+        """The API keys of the pool."""
+        return list(self._keys)
+
+    def get(self, api: str) -> Optional[str]:
+        """Return the key with the most remaining quota for `api`, or None
+        if all keys are exhausted.  Keys without known quota and keys whose
+        reset time has passed count as having their full quota.
+        """
+        now = time()
+        best, best_remaining = None, -1
+        with self._lock:
+            for key in self._keys:
+                remaining, reset = self._quota.get((key, api), (None, 0))
+                if remaining is None or reset <= now:
+                    remaining = float("inf")
+                if remaining > best_remaining:
+                    best, best_remaining = key, remaining
+        if best_remaining <= 0:
+            return None
+        return best
+
+    def update(self, key: str, api: str, headers) -> None:
+        """Record the quota of `key` for `api` from the response headers."""
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset = float(headers['X-RateLimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self._quota[(key, api)] = (remaining, reset)
+
+    def exhaust(self, key: str, api: str, headers=None) -> None:
+        """Mark `key` as exhausted for `api` until its reset time, taken from
+        the headers of the 429 response.  Without this information the key
+        is put aside for one second.
+        """
+        headers = headers or {}
+        try:
+            reset = float(headers['X-RateLimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            try:
+                reset = time() + float(headers['Retry-After'])
+            except (KeyError, TypeError, ValueError):
+                reset = time() + 1
+        with self._lock:
+            self._quota[(key, api)] = (0, reset)
+
+    def status(self, api: str) -> Dict[str, Tuple[Optional[int], float]]:
+        """Return the (remaining, reset) pair of each key for `api`, where
+        `remaining` is None for keys that have not been used yet.
+        """
+        with self._lock:
+            return {key: self._quota.get((key, api), (None, 0))
+                    for key in self._keys}
@@ -0,0 +1,184 @@
+"""Per-API instrumentation of the requests and of the cache lookups."""
+
+import json
+from copy import deepcopy
+from math import inf
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Dict, Optional, Tuple, Union
+
+# Upper bounds in seconds of the buckets of the latency histograms
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, inf)
+
+CACHE_OUTCOMES = ('hit', 'miss', 'stale')
+
+
+class Metrics:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Thread-safe registry of counters per API: number of requests,
+        latency histogram, bytes downloaded, retries, 429 responses and
+        outcomes of the cache lookups.
+
+        :param buckets: The ascending upper bounds in seconds of the
+                        buckets of the latency histograms.  The last bound
+                        should be `inf`.
+        """
+        self.buckets = tuple(buckets)
+        self._lock = Lock()
+        self._apis: Dict[str, Dict] = {}
+        self.started = time()
+
+    def _counters(self, api):
+        """Return the counters of `api`, creating them if necessary."""
+        try:
+            return self._apis[api]
+        except KeyError:
+            counters = {'requests': 0, 'errors': 0, 'retries': 0,
+                        'throttled': 0, 'bytes': 0, 'latency_sum': 0.0,
+                        'latency_buckets': [0]*len(self.buckets),
+                        'cache_hit': 0, 'cache_miss': 0, 'cache_stale': 0}
+            self._apis[api] = counters
+            return counters
+
+    def record_request(self,
+                       api: str,
+                       latency: float,
+                       nbytes: int,
+                       status: int,
+                       retries: int = 0,
+                       throttled: int = 0
+                       ) -> None:
+        """Record one HTTP response.
+
+        :param api: The name of the API.
+        :param latency: The duration of the request in seconds.
+        :param nbytes: The size of the response body in bytes.
+        :param status: The HTTP status code.
+        :param retries: The number of transparent retries that preceded
+                        the response.
+        :param throttled: The number of 429 responses among these retries.
+        """
+        with self._lock:
+            counters = self._counters(api)
+            counters['requests'] += 1
+            counters['retries'] += retries
+            counters['bytes'] += nbytes
+            counters['latency_sum'] += latency
+            counters['throttled'] += throttled
+            if status == 429:
+                counters['throttled'] += 1
+            elif status >= 400:
+                counters['errors'] += 1
+            for i, bound in enumerate(self.buckets):
+                if latency <= bound:
+                    counters['latency_buckets'][i] += 1
+                    break
+
+    def record_retry(self, api: str) -> None:
+        """Record one retry of a request performed by pybliometrics."""
+        with self._lock:
+            self._counters(api)['retries'] += 1
+
+    def record_cache(self, api: str, outcome: str) -> None:
+        """Record the outcome of a cache lookup: 'hit' for a fresh cached
+        file, 'miss' for a missing file and 'stale' for a file that is
+        refreshed.
+        """
+        if outcome not in CACHE_OUTCOMES:
+            raise ValueError(f"Outcome must be one of {CACHE_OUTCOMES}.")
+        with self._lock:
+            self._counters(api)['cache_' + outcome] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return a copy of the counters of all APIs."""
+        with self._lock:
+            return deepcopy(self._apis)
+
+    def reset(self) -> None:
+        """Set all counters back to zero."""
+        with self._lock:
+            self._apis.clear()
+            self.started = time()
+
+    def quantile(self, api: str, q: float) -> Optional[float]:
+        """Return the upper bound of the histogram bucket containing the
+        `q`-quantile of the latency of `api`, or None without requests.
+        """
+        with self._lock:
+            counters = self._apis.get(api)
+            if not counters or not counters['requests']:
+                return None
+            rank = q*counters['requests']
+            seen = 0
+            for bound, n in zip(self.buckets, counters['latency_buckets']):
+                seen += n
+                if seen >= rank:
+                    return bound
+        return self.buckets[-1]
+
+    def hit_ratio(self, api: str) -> Optional[float]:
+        """Return the share of cache lookups of `api` served by the cache,
+        or None without lookups.
+        """
+        with self._lock:
+            counters = self._apis.get(api, {})
+            hits = counters.get('cache_hit', 0)
+            total = hits + counters.get('cache_miss', 0) + \
+                counters.get('cache_stale', 0)
+        return hits/total if total else None
+
+    def to_json(self) -> str:
+        """Return the counters of all APIs as JSON."""
+        data = {'started': self.started, 'buckets': [str(b) for b in self.buckets],
+                'apis': self.snapshot()}
+        return json.dumps(data, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Return the counters of all APIs in the text format of
+        Prometheus.
+        """
+        lines = []
+        names = (('requests', 'requests_total', 'counter'),
+                 ('errors', 'errors_total', 'counter'),
+                 ('retries', 'retries_total', 'counter'),
+                 ('throttled', 'throttled_total', 'counter'),
+                 ('bytes', 'downloaded_bytes_total', 'counter'))
+        apis = self.snapshot()
+        for key, name, kind in names:
+            lines.append(f"# TYPE pybliometrics_{name} {kind}")
+            lines.extend(f'pybliometrics_{name}{{api="{api}"}} {c[key]}'
+                         for api, c in apis.items())
+        lines.append("# TYPE pybliometrics_cache_lookups_total counter")
+        for api, c in apis.items():
+            for outcome in CACHE_OUTCOMES:
+                lines.append(f'pybliometrics_cache_lookups_total{{api="{api}",'
+                             f'outcome="{outcome}"}} {c["cache_" + outcome]}')
+        lines.append("# TYPE pybliometrics_request_duration_seconds histogram")
+        for api, c in apis.items():
+            cumulated = 0
+            for bound, n in zip(self.buckets, c['latency_buckets']):
+                cumulated += n
+                le = "+Inf" if bound == inf else str(bound)
+                lines.append(f'pybliometrics_request_duration_seconds_bucket'
+                             f'{{api="{api}",le="{le}"}} {cumulated}')
+            lines.append(f'pybliometrics_request_duration_seconds_sum'
+                         f'{{api="{api}"}} {c["latency_sum"]}')
+            lines.append(f'pybliometrics_request_duration_seconds_count'
+                         f'{{api="{api}"}} {c["requests"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: Union[str, Path]) -> None:
+        """Write the counters to `path`, in the text format of Prometheus
+        if the suffix is `.prom` and as JSON otherwise.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".prom":
+            path.write_text(self.to_prometheus())
+        else:
+            path.write_text(self.to_json())
+
+
+# Registry shared by `get_content()` and `Base`
+METRICS = Metrics()
@@ -57,13 +57,45 @@ def check_field_consistency(needles, haystack):
 
 
 def deduplicate(lst):
-    """Auxiliary function to deduplicate a list while preserving its order."""
-    new = reduce(lambda x, y: x + y if y[0] not in x else x,
-                 map(lambda x: [x], lst),
-                 [])
+    """Auxiliary function to deduplicate a list while preserving its order.
+    Long lists are deduplicated in linear time: elements are grouped by
+    their hashable content (for dicts, the items with scalar values) and
+    compared within their group only.
+    """
+    if len(lst) <= _SHORT_LIST:
+        new = []
+        for item in lst:
+            if item not in new:
+                new.append(item)
+        return new
+    groups = {}
+    new = []
+    for item in lst:
+        group = groups.setdefault(_group_key(item), [])
+        if item not in group:
+            group.append(item)
+            new.append(item)
     return new
 
 
+# Length up to which comparing each element with all previous ones is
+# faster than grouping them
+_SHORT_LIST = 256
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _group_key(item):
+    """Auxiliary function to return a hashable key equal for equal items."""
+    if isinstance(item, dict):
+        return frozenset((k, v) for k, v in item.items()
+                         if isinstance(v, _SCALARS))
+    try:
+        hash(item)
+    except TypeError:
+        return None
+    return item
+
+
 def get_id(s, integer=True):
     """Helper function to return the Scopus ID at a fixed position."""
     path = ['coredata', 'dc:identifier']
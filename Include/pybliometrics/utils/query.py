@@ -0,0 +1,132 @@
+"""Canonical form of the search queries, for the keys of cached searches.
+
+Queries differing only in the case of field codes, operators and values,
+in whitespace, or in the order of the operands of a list of ORs or of a
+list of ANDs return the same results and share their cache entry, e.g.
+
+    AUTHLAST(Smith) and AUTHFIRST(John)
+    authfirst (john) AND authlast(smith)
+
+Operands of lists mixing operators keep their order, whatever the
+precedence of the operators.
+"""
+
+import re
+from hashlib import md5
+from typing import Dict, List, Tuple, Union
+
+# Search parameters that don't change the results
+IGNORED_PARAMS = ('apikey', 'api_key', 'insttoken', 'token', 'count',
+                  'start', 'cursor', 'view', 'query', 'timeout')
+
+_TOKENS = re.compile(r'"[^"]*"|\{[^}]*\}|\(|\)|[^\s(){}"]+')
+_FIELD = re.compile(r'[A-Za-z][A-Za-z0-9-]*')
+_OPERATORS = re.compile(r'AND|OR|NOT|(?:W|PRE)/\d+', re.IGNORECASE)
+_COMMUTATIVE = ('AND', 'OR')
+
+
+def canonical_query(query: str) -> str:
+    """Return the canonical form of a search query: field codes and
+    operators in upper case, values in lower case, single spaces, and the
+    operands of lists of ORs or of ANDs sorted.  Queries with unbalanced
+    parentheses only get their case and whitespace normalized.
+    """
+    try:
+        tokens = _tokenize(query)
+        result, i = _expression(tokens, 0)
+        if i != len(tokens):
+            raise ValueError("Unbalanced parentheses.")
+        return result
+    except ValueError:
+        return " ".join(query.split()).lower()
+
+
+def cache_stem(query: Union[str, Dict[str, str]], params: Dict) -> str:
+    """Return the stem of the cache entry of a search: the md5 hash of
+    the canonical form of `query` and of the search parameters that change
+    the results (e.g. `field` or `date`).
+
+    :param query: The query, as string or as dict of fields and values.
+    :param params: All parameters of the search request.
+    """
+    if isinstance(query, dict):
+        name = "&".join(f"{k}={canonical_query(str(v))}"
+                        for k, v in sorted(query.items()))
+    else:
+        name = canonical_query(query)
+    extra = key_params(query, params)
+    if extra:
+        name += "|" + "&".join(f"{k}={params[k]}" for k in extra)
+    return md5(name.encode('utf8')).hexdigest()
+
+
+def key_params(query: Union[str, Dict[str, str]], params: Dict) -> List[str]:
+    """Return the names of the search parameters included in the cache
+    key besides the query.
+    """
+    return sorted(k for k in params if k.lower() not in IGNORED_PARAMS
+                  and not (isinstance(query, dict) and k in query))
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    """Auxiliary function to split a query into (kind, value) tokens of
+    kinds 'field' (a field code followed by an opening parenthesis),
+    'open', 'close', 'op' and 'atom'.
+    """
+    tokens = []
+    for match in _TOKENS.finditer(query):
+        value = match.group()
+        following = query[match.end():].lstrip()[:1]
+        if value == "(":
+            if tokens and tokens[-1][0] == 'field':
+                continue  # Part of the field token
+            tokens.append(('open', value))
+        elif value == ")":
+            tokens.append(('close', value))
+        elif _OPERATORS.fullmatch(value):
+            value = value.upper()
+            if value == 'NOT' and tokens and tokens[-1] == ('op', 'AND'):
+                tokens[-1] = ('op', 'AND NOT')
+            else:
+                tokens.append(('op', value))
+        elif following == "(" and _FIELD.fullmatch(value):
+            tokens.append(('field', value.upper()))
+        elif value[0] in '"{':
+            tokens.append(('atom', " ".join(value.split()).lower()))
+        else:
+            tokens.append(('atom', value.lower()))
+    return tokens
+
+
+def _expression(tokens, i):
+    """Auxiliary function to return the canonical form of the expression
+    starting at token `i`, up to the closing parenthesis or the end, and
+    the index of the token after it.
+    """
+    operands, operators, current = [], [], []
+    while i < len(tokens):
+        kind, value = tokens[i]
+        if kind == 'close':
+            break
+        if kind == 'op':
+            operands.append(" ".join(current))
+            operators.append(value)
+            current = []
+            i += 1
+        elif kind in ('open', 'field'):
+            inner, i = _expression(tokens, i + 1)
+            if i >= len(tokens):
+                raise ValueError("Unbalanced parentheses.")
+            prefix = value if kind == 'field' else ""
+            current.append(f"{prefix}({inner})")
+            i += 1
+        else:
+            current.append(value)
+            i += 1
+    operands.append(" ".join(current))
+    if len(set(operators)) == 1 and operators[0] in _COMMUTATIVE:
+        operands.sort()
+    result = operands[0]
+    for operator, operand in zip(operators, operands[1:]):
+        result += f" {operator} {operand}"
+    return result, i
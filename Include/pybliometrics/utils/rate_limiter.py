@@ -0,0 +1,97 @@
+"""Token-bucket rate limiting of the API requests."""
+
+from pathlib import Path
+from threading import Lock
+from time import sleep, time
+from typing import Optional, Union
+
+from .file_lock import FileLock
+
+
+class TokenBucket:
+    def __init__(self,
+                 rate: float,
+                 capacity: Optional[float] = None,
+                 state_dir: Union[str, Path, None] = None,
+                 name: str = "bucket"
+                 ) -> None:
+        """Token bucket that refills with `rate` tokens per second up to
+        `capacity` tokens.  Each request takes one token and waits only as
+        long as necessary for it, such that bursts up to `capacity` requests
+        pass without delay.
+
+        :param rate: The number of tokens added per second.  Zero means that
+                     the bucket never limits.
+        :param capacity: The maximum number of tokens in the bucket.
+                         Defaults to `rate`, i.e. a burst of one second.
+        :param state_dir: The directory in which the state of the bucket is
+                          stored.  All threads and processes using the same
+                          directory and name share the same bucket.  If
+                          None, the bucket is shared by the threads of this
+                          process only.
+        :param name: The name of the bucket, usually the API name.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.name = name
+        self._lock = Lock()
+        self._tokens = self.capacity
+        self._stamp = time()
+        if state_dir:
+            state_dir = Path(state_dir)
+            self._state_file = state_dir/f"{name}.bucket"
+            self._file_lock = FileLock(state_dir/f"{name}.lock")
+        else:
+            self._state_file = None
+            self._file_lock = None
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Take `tokens` tokens from the bucket, blocking until they are
+        available.  Return the time waited in seconds.
+        """
+        if not self.rate:
+            return 0.0
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            sleep(wait)
+            waited += wait
+
+    def _try_acquire(self, tokens):
+        """Take the tokens and return 0 if they are available, otherwise
+        return the time to wait until they are.
+        """
+        with self._locked():
+            self._load()
+            now = time()
+            elapsed = max(now - self._stamp, 0)
+            self._tokens = min(self.capacity, self._tokens + elapsed*self.rate)
+            self._stamp = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                wait = 0.0
+            else:
+                wait = (tokens - self._tokens) / self.rate
+            self._save()
+        return wait
+
+    def _locked(self):
+        """Return the lock protecting the state of the bucket."""
+        return self._file_lock or self._lock
+
+    def _load(self):
+        """Read the shared state of the bucket, if any."""
+        if not self._state_file:
+            return
+        try:
+            tokens, stamp = self._state_file.read_text().split()
+            self._tokens, self._stamp = float(tokens), float(stamp)
+        except (FileNotFoundError, ValueError):
+            self._tokens, self._stamp = self.capacity, time()
+
+    def _save(self):
+        """Write the shared state of the bucket, if any."""
+        if self._state_file:
+            self._state_file.write_text(f"{self._tokens} {self._stamp}")
@@ -0,0 +1,55 @@
+"""Coalescing of concurrent identical calls into a single call."""
+
+from threading import Event, Lock
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """Registry of calls in flight.  While a call for a key is running,
+        callers with the same key wait for it and share its result (or its
+        exception) instead of performing the call themselves.
+        """
+        self._lock = Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable, *args, **kwds):
+        """Return `func(*args, **kwds)`, sharing the execution with all
+        concurrent callers using the same `key`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args, **kwds)
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class _Call:
+    """Auxiliary class holding the state of a call in flight."""
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+def flight_key(url: str, params: Optional[Dict], api: str) -> Tuple:
+    """Return the key identifying a request by its URL, its query
+    parameters and the API.
+    """
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return api, url, items
@@ -0,0 +1,724 @@
+"""Local stand-in for the Elsevier APIs, to run pybliometrics offline.
+
+The server answers the endpoints of `URLS` in `utils/constants.py` with
+recorded responses (cassettes) or with synthetic responses of configurable
+size, and simulates latency, 429 errors and the `X-RateLimit-*` headers.
+Point pybliometrics to it with the environment variable `PYB_API_BASE`,
+which must be set before pybliometrics is imported:
+
+    python -m Include.pybliometrics.utils.standin_server --port 8080
+    PYB_API_BASE=http://127.0.0.1:8080 python AutoBibPlus.py
+
+Plain HTTP requests sent through the `[Proxy]` section of the configuration
+file are answered as well.  IDs made of zeros only don't exist: their
+retrievals fail with 404 errors and searches for them, e.g. `AF-ID(0)`, find
+nothing.
+"""
+
+import argparse
+import json
+import re
+from functools import lru_cache
+from hashlib import md5
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from random import Random
+from threading import Lock, Thread
+from time import localtime, sleep, strftime, time
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+# Query parameters that do not change the response
+CREDENTIALS = ('apikey', 'apiKey', 'insttoken')
+
+SEARCH_APIS = ('AffiliationSearch', 'AuthorSearch', 'ScopusSearch')
+SUPPORTED_APIS = SEARCH_APIS + ('AbstractRetrieval', 'AffiliationRetrieval',
+                                'AuthorRetrieval', 'CitationOverview',
+                                'AuthorLookup', 'InstitutionLookup')
+
+COLLAB_TYPES = {
+    'AcademicCorporateCollaboration': ('Academic-corporate collaboration',
+                                       'No academic-corporate collaboration'),
+    'Collaboration': ('Institutional collaboration',
+                      'International collaboration',
+                      'National collaboration', 'Single authorship')
+}
+COLLAB_TYPES['AcademicCorporateCollaborationImpact'] = \
+    COLLAB_TYPES['AcademicCorporateCollaboration']
+COLLAB_TYPES['CollaborationImpact'] = COLLAB_TYPES['Collaboration']
+COUNT_METRICS = ('CitationCount', 'CitedPublications', 'ScholarlyOutput')
+PERCENTILE_METRICS = ('OutputsInTopCitationPercentiles',
+                      'PublicationsInTopJournalPercentiles')
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self,
+                 address: Tuple[str, int] = ("127.0.0.1", 0),
+                 cassette_dir: Union[str, Path, None] = None,
+                 record: bool = False,
+                 upstream: str = "https://api.elsevier.com",
+                 size: int = 25,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 quota: int = 20_000,
+                 quota_reset: float = 7*24*3600,
+                 seed: int = 0,
+                 verbose: bool = False
+                 ) -> None:
+        """HTTP server standing in for the Elsevier APIs.
+
+        :param address: The host and port to listen on.  Port 0 picks a
+                        free port, see property `url`.
+        :param cassette_dir: The directory of the recorded responses.  Each
+                             request with a cassette is replayed.
+        :param record: Whether to forward requests without cassette to
+                       `upstream` and to record the responses in
+                       `cassette_dir`.  Requires valid credentials.
+        :param upstream: The base URL of the real APIs.
+        :param size: The number of results of synthetic searches and of
+                     authors in synthetic institution lookups.
+        :param latency: The delay in seconds before each response.
+        :param error_rate: The probability of a random 429 error.
+        :param quota: The number of requests per key and API before the key
+                      is exhausted.  Zero means no quota and no
+                      `X-RateLimit-*` headers.
+        :param quota_reset: The seconds after the start of the server at
+                            which all quotas reset.
+        :param seed: The seed of the random 429 errors.  Synthetic responses
+                     are deterministic for each request.
+        :param verbose: Whether to log each request.
+
+        Raises
+        ------
+        ValueError
+            If `record=True` without `cassette_dir`.
+        """
+        if record and not cassette_dir:
+            raise ValueError("Recording requires parameter `cassette_dir`.")
+        super().__init__(address, _Handler)
+        self.cassette_dir = Path(cassette_dir) if cassette_dir else None
+        self.record = record
+        self.upstream = upstream.rstrip("/")
+        self.size = size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quota = quota
+        self.quota_reset = quota_reset
+        self.reset = time() + quota_reset
+        self.verbose = verbose
+        self.requests = 0
+        self._random = Random(seed)
+        self._used: Dict[Tuple[str, str], int] = {}
+        self._lock = Lock()
+
+    @property
+    def url(self) -> str:
+        """The base URL to use as `PYB_API_BASE`."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandinServer":
+        """Serve in a daemon thread and return the server."""
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def count(self, key: str, api: str) -> Tuple[int, Optional[str]]:
+        """Count a request of `key` for `api`.  Return the remaining quota
+        and, if the request fails with a 429 error, the reason.
+        """
+        with self._lock:
+            self.requests += 1
+            if self.reset <= time():
+                self._used.clear()
+                self.reset = time() + self.quota_reset
+            used = self._used.get((key, api), 0)
+            if self.quota and used >= self.quota:
+                return 0, "QUOTA_EXCEEDED - Quota Exceeded"
+            if self._random.random() < self.error_rate:
+                return self.quota - used, "TOO_MANY_REQUESTS - Rate Limit Exceeded"
+            self._used[(key, api)] = used + 1
+            return self.quota - used - 1, None
+
+    def cassette(self, api: str, path: str, query: List[Tuple[str, str]]
+                 ) -> Optional[Path]:
+        """Return the path of the cassette of a request, if any."""
+        if not self.cassette_dir:
+            return None
+        return self.cassette_dir/f"{api}-{request_hash(path, query)}.json"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Auxiliary class answering the requests of `StandinServer`."""
+    server: StandinServer
+
+    def do_GET(self):
+        # Requests through a proxy carry the absolute URI
+        parts = urlsplit(self.path)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        params = dict(query)
+        key = self.headers.get('X-ELS-APIKey') or params.get('apiKey') \
+            or params.get('apikey', '')
+        if self.server.latency:
+            sleep(self.server.latency)
+
+        api = match_api(parts.path)
+        if not api:
+            return self._send(*not_found())
+        remaining, error = self.server.count(key, api)
+        headers = {}
+        if self.server.quota:
+            headers = {'X-RateLimit-Limit': str(self.server.quota),
+                       'X-RateLimit-Remaining': str(remaining),
+                       'X-RateLimit-Reset': str(int(self.server.reset))}
+        if error:
+            headers['X-ELS-Status'] = error
+            if error.startswith("TOO_MANY"):
+                headers['Retry-After'] = "1"
+            body = {'error-response': {'error-code': error.split()[0],
+                                       'error-message': error.split(" - ")[-1]}}
+            return self._send(429, json.dumps(body), headers)
+
+        fname = self.server.cassette(api, parts.path, query)
+        if fname and fname.exists():
+            tape = json.loads(fname.read_text())
+            status, body = tape['status'], tape['body']
+        elif self.server.record:
+            status, body = self._forward(parts.path, query)
+            fname.parent.mkdir(parents=True, exist_ok=True)
+            fname.write_text(json.dumps({'status': status, 'body': body}))
+        else:
+            status, body = synthetic_response(api, parts.path, query,
+                                              self.server.size)
+            body = json.dumps(body)
+        self._send(status, body, headers)
+
+    def _forward(self, path, query):
+        """Perform the request against the real APIs."""
+        import requests
+
+        header = {'Accept': 'application/json'}
+        for name in ('X-ELS-APIKey', 'X-ELS-Insttoken'):
+            if self.headers.get(name):
+                header[name] = self.headers[name]
+        resp = requests.get(self.server.upstream + path, params=query,
+                            headers=header, timeout=60)
+        return resp.status_code, resp.text
+
+    def _send(self, status, body, headers=None):
+        """Write the response."""
+        content = body.encode("utf8")
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def match_api(path: str) -> Optional[str]:
+    """Return the name of the API serving `path`, or None."""
+    from .constants import URLS
+
+    best, best_length = None, 0
+    for api in SUPPORTED_APIS:
+        route = urlsplit(URLS[api]).path
+        if api in SEARCH_APIS:
+            matches = path.rstrip("/") == route
+        else:
+            matches = path.startswith(route)
+        if matches and len(route) > best_length:
+            best, best_length = api, len(route)
+    return best
+
+
+def request_hash(path: str, query: List[Tuple[str, str]]) -> str:
+    """Return the hash identifying a request regardless of credentials."""
+    items = sorted((k, v) for k, v in query if k not in CREDENTIALS)
+    return md5(f"{path}?{items}".encode('utf8')).hexdigest()
+
+
+def missing(text: str) -> bool:
+    """Whether an identifier, or an ID in a search query, is made of zeros
+    only and hence doesn't exist.
+    """
+    return re.fullmatch(r"0+", text) is not None or \
+        re.search(r"\(0+\)", text) is not None
+
+
+def not_found() -> Tuple[int, str]:
+    """Return the status and the body of a 404 response."""
+    body = {'service-error': {'status': {
+        'statusCode': 'RESOURCE_NOT_FOUND',
+        'statusText': 'The resource specified cannot be found.'}}}
+    return 404, json.dumps(body)
+
+
+def synthetic_response(api: str,
+                       path: str,
+                       query: List[Tuple[str, str]],
+                       size: int = 25
+                       ) -> Tuple[int, Dict]:
+    """Return the status and the JSON body of a synthetic response of
+    `api` to a request of `path` with query parameters `query`.
+
+    :param api: The name of the API, see `SUPPORTED_APIS`.
+    :param path: The path of the requested URL.
+    :param query: The query parameters as list of (key, value) pairs.
+    :param size: The number of results of searches and institution lookups.
+    """
+    params = dict(query)
+    identifier = path.rstrip("/").split("/")[-1]
+    if api in SEARCH_APIS:
+        return 200, search_page(api, params, size)
+    if missing(identifier):
+        return 404, json.loads(not_found()[1])
+    if api == 'AbstractRetrieval':
+        return 200, abstract(identifier)
+    if api == 'AuthorRetrieval':
+        return 200, author(identifier)
+    if api == 'AffiliationRetrieval':
+        return 200, affiliation(identifier)
+    if api == 'CitationOverview':
+        ids = [i for k, v in query if k in ('scopus_id', 'doi', 'pii',
+                                            'pubmed_id') for i in v.split(",")]
+        return 200, citation_overview(ids, params.get('date', '2015-2020'))
+    if api == 'AuthorLookup' and "/institutionId/" in path:
+        return 200, institution_authors(identifier, params, size)
+    if api in ('AuthorLookup', 'InstitutionLookup'):
+        return 200, metrics(api, params)
+    return 404, json.loads(not_found()[1])
+
+
+def _rng(*parts) -> Random:
+    """Auxiliary function to return a random generator seeded by `parts`."""
+    seed = md5("|".join(str(p) for p in parts).encode('utf8')).hexdigest()
+    return Random(int(seed, 16))
+
+
+def _years(year_range: str) -> List[int]:
+    """Auxiliary function to return the years of a SciVal `yearRange`."""
+    current = localtime().tm_year
+    n = int("".join(filter(str.isdigit, year_range)) or 5)
+    years = list(range(current - n, current))
+    if "Current" in year_range:
+        years.append(current)
+    if "Future" in year_range:
+        years.append(current + 1)
+    return years
+
+
+# Synthetic results served so far by EID, to answer queries for EIDs
+_served: Dict[str, Tuple[str, str, int]] = {}
+
+# Document types of synthetic documents, with their frequencies
+DOCTYPES = ('ar', 'ar', 'ar', 'cp', 'cp', 're', 'ch', 'ed')
+DOCTYPE_NAMES = {'ar': 'Article', 'cp': 'Conference Paper', 're': 'Review',
+                 'ch': 'Book Chapter', 'ed': 'Editorial'}
+
+# Restrictions of a query by publication year and document type, e.g.
+# "(AU-ID(1)) AND PUBYEAR AFT 2009 AND NOT (DOCTYPE(ar) OR DOCTYPE(cp))"
+_RESTRICTION = r"PUBYEAR (?:AFT|BEF|IS) \d{4}|DOCTYPE\(\w+\)|" \
+               r"NOT \(DOCTYPE\(\w+\)(?: OR DOCTYPE\(\w+\))*\)"
+_RESTRICTED = re.compile(rf"\((.*)\)((?: AND (?:{_RESTRICTION}))+)")
+
+
+def search_page(api: str, params: Dict[str, str], size: int) -> Dict:
+    """Return one page of `size` synthetic search results, according to
+    the `count` and the `start` or `cursor` parameters.
+    """
+    count = int(params.get('count', 25))
+    cursor = params.get('cursor')
+    if cursor is not None:
+        start = 0 if cursor == "*" else int(cursor)
+    else:
+        start = int(params.get('start', 0))
+    query = params.get('query', '')
+    eids = re.findall(r"EID\(([^)]+)\)", query)
+    if eids and re.fullmatch(r"EID\([^)]+\)( OR EID\([^)]+\))*", query):
+        # Lookup of results served before
+        results = [_served[eid] for eid in eids if eid in _served]
+    elif missing(query):
+        results = []
+    else:
+        indices = range(size)
+        # Restriction to the records loaded since a date, e.g.
+        # "(AU-ID(1)) AND LOAD-DATE AFT 20240131"
+        match = re.fullmatch(r"\((.*)\) AND LOAD-DATE AFT (\d{8})", query)
+        if match:
+            query, since = match.groups()
+            indices = [i for i in indices
+                       if load_date(api, query, i) > since]
+        match = _RESTRICTED.fullmatch(query)
+        if match and api == 'ScopusSearch':
+            query, restrictions = match.groups()
+            indices = [i for i in indices
+                       if _matches(restrictions, *_year_type(query, i))]
+        results = [(api, query, i) for i in indices]
+    stop = min(start + count, len(results))
+    entries = [search_entry(*result) for result in results[start:stop]]
+    _served.update((e['eid'], result)
+                   for e, result in zip(entries, results[start:stop]))
+    if params.get('field'):
+        fields = params['field'].split(",")
+        entries = [project_entry(e, fields) for e in entries]
+    res = {'opensearch:totalResults': str(len(results)),
+           'opensearch:startIndex': str(start),
+           'opensearch:itemsPerPage': str(len(entries)),
+           'entry': entries or [{'@_fa': 'true',
+                                 'error': 'Result set was empty'}]}
+    if cursor is not None:
+        res['cursor'] = {'@current': cursor, '@next': str(stop)}
+    return {'search-results': res}
+
+
+def project_entry(entry: Dict, fields: List[str]) -> Dict:
+    """Return the elements of a search result named in the `field`
+    parameter, also within its affiliations and its authors.
+    """
+    projected = {k: v for k, v in entry.items() if k in fields}
+    for key in ('affiliation', 'author'):
+        items = [{k: v for k, v in d.items() if k in fields}
+                 for d in entry.get(key, [])]
+        if any(items):
+            projected[key] = items
+    return projected
+
+
+@lru_cache(maxsize=2**16)
+def _year_type(query: str, index: int) -> Tuple[int, str]:
+    """Auxiliary function to return the publication year and the document
+    type of a synthetic document.
+    """
+    entry = search_entry('ScopusSearch', query, index)
+    return int(entry['prism:coverDisplayDate']), entry['subtype']
+
+
+def _matches(restrictions: str, year: int, doctype: str) -> bool:
+    """Auxiliary function to check a year and a document type against the
+    restrictions of a query.
+    """
+    for clause in restrictions.split(" AND ")[1:]:
+        types = re.findall(r"DOCTYPE\((\w+)\)", clause)
+        if clause.startswith("NOT"):
+            ok = doctype not in types
+        elif types:
+            ok = doctype in types
+        else:
+            _, op, value = clause.split()
+            ok = {'AFT': year > int(value), 'BEF': year < int(value),
+                  'IS': year == int(value)}[op]
+        if not ok:
+            return False
+    return True
+
+
+def load_date(api: str, query: str, index: int) -> str:
+    """Return the date (YYYYMMDD) at which the synthetic result number
+    `index` of a search was last loaded, within the past three years.
+    """
+    days = _rng('load-date', api, query, index).randrange(3*365)
+    return strftime('%Y%m%d', localtime(time() - days*86400))
+
+
+def search_entry(api: str, query: str, index: int) -> Dict:
+    """Return the synthetic result number `index` of a search."""
+    rng = _rng(api, query, index)
+    if api == 'AuthorSearch':
+        auth_id = str(rng.randrange(7_000_000_000, 58_000_000_000))
+        aff_id = str(rng.randrange(60_000_000, 60_200_000))
+        return {'eid': f'9-s2.0-{auth_id}',
+                'dc:identifier': f'AUTHOR_ID:{auth_id}',
+                'orcid': None,
+                'preferred-name': {'surname': f'Surname{index}',
+                                   'given-name': f'Given{index}',
+                                   'initials': 'G.'},
+                'document-count': str(rng.randrange(1, 300)),
+                'subject-area': [{'@abbrev': 'ENGI', '@frequency': '10',
+                                  '$': 'Engineering'}],
+                'affiliation-current': {'affiliation-id': aff_id,
+                                        'affiliation-name': f'Institution {aff_id}',
+                                        'affiliation-city': 'Montreal',
+                                        'affiliation-country': 'Canada'}}
+    if api == 'AffiliationSearch':
+        aff_id = str(rng.randrange(60_000_000, 60_200_000))
+        return {'eid': f'10-s2.0-{aff_id}',
+                'dc:identifier': f'AFFILIATION_ID:{aff_id}',
+                'affiliation-name': f'Institution {aff_id}',
+                'city': 'Montreal', 'country': 'Canada',
+                'document-count': str(rng.randrange(1, 100_000)),
+                'name-variant': []}
+    scopus_id = str(rng.randrange(84_000_000_000, 86_000_000_000))
+    year = rng.randrange(2000, localtime().tm_year + 1)
+    n_authors = rng.randrange(1, 8)
+    affs = [str(rng.randrange(60_000_000, 60_200_000))
+            for _ in range(rng.randrange(1, 4))]
+    authors = [{'authid': str(rng.randrange(7_000_000_000, 58_000_000_000)),
+                'authname': f'Surname{i} G.', 'surname': f'Surname{i}',
+                'given-name': f'Given{i}', 'initials': 'G.',
+                'afid': [{'$': rng.choice(affs)}]}
+               for i in range(n_authors)]
+    entry = {'eid': f'2-s2.0-{scopus_id}',
+             'dc:identifier': f'SCOPUS_ID:{scopus_id}',
+             'dc:title': f'Synthetic document {index} for {query}',
+             'dc:creator': authors[0]['authname'],
+             'prism:publicationName': f'Journal {rng.randrange(1, 500)}',
+             'prism:issn': f'{rng.randrange(10_000_000, 99_999_999)}',
+             'prism:volume': str(rng.randrange(1, 80)),
+             'prism:coverDate': f'{year}-{rng.randrange(1, 13):02d}-01',
+             'prism:coverDisplayDate': str(year),
+             'prism:doi': f'10.1000/synthetic.{scopus_id}',
+             'prism:aggregationType': 'Journal',
+             'citedby-count': str(rng.randrange(0, 200)),
+             'openaccess': '0', 'openaccessFlag': False,
+             'source-id': str(rng.randrange(10_000, 30_000)),
+             'affiliation': [{'afid': afid,
+                              'affilname': f'Institution {afid}',
+                              'affiliation-city': 'Montreal',
+                              'affiliation-country': 'Canada'}
+                             for afid in affs],
+             'author-count': {'@limit': '100', '$': str(n_authors)},
+             'author': authors,
+             'authkeywords': 'synthetic | keywords'}
+    # Drawn last such that the other fields don't depend on it
+    entry['subtype'] = rng.choice(DOCTYPES)
+    entry['subtypeDescription'] = DOCTYPE_NAMES[entry['subtype']]
+    return entry
+
+
+def abstract(identifier: str) -> Dict:
+    """Return a synthetic Abstract Retrieval response."""
+    entry = search_entry('ScopusSearch', 'abstract', identifier)
+    scopus_id = identifier.split("-")[-1] if identifier.isdigit() or \
+        identifier.startswith("2-s2.0-") else entry['dc:identifier'][10:]
+    coredata = {k: v for k, v in entry.items()
+                if k.startswith(('dc:', 'prism:', 'subtype', 'citedby'))}
+    coredata.update({'eid': f'2-s2.0-{scopus_id}',
+                     'dc:identifier': f'SCOPUS_ID:{scopus_id}',
+                     'dc:description': f'Synthetic abstract of {scopus_id}.',
+                     'link': [{'@href': f'https://www.scopus.com/{scopus_id}',
+                               '@rel': rel}
+                              for rel in ('self', 'scopus', 'scopus-citedby')]})
+    authors = [{'@auid': a['authid'], 'ce:indexed-name': a['authname'],
+                'ce:surname': a['surname'],
+                'preferred-name': {'ce:given-name': a['given-name']},
+                'affiliation': {'@id': a['afid'][0]['$']}}
+               for a in entry['author']]
+    return {'abstracts-retrieval-response': {
+        'coredata': coredata,
+        'authors': {'author': authors},
+        'affiliation': [{'@id': a['afid'], 'affilname': a['affilname'],
+                         'affiliation-city': a['affiliation-city'],
+                         'affiliation-country': a['affiliation-country']}
+                        for a in entry['affiliation']],
+        'item': {'bibrecord': {'head': {
+            'abstracts': coredata['dc:description']}}}}}
+
+
+def author(identifier: str) -> Dict:
+    """Return a synthetic Author Retrieval response."""
+    rng = _rng('AuthorRetrieval', identifier)
+    aff_id = str(rng.randrange(60_000_000, 60_200_000))
+    url = f'https://api.elsevier.com/content/author/author_id/{identifier}'
+    return {'author-retrieval-response': [{
+        'coredata': {'prism:url': url,
+                     'dc:identifier': f'AUTHOR_ID:{identifier}',
+                     'eid': f'9-s2.0-{identifier}',
+                     'document-count': str(rng.randrange(1, 300)),
+                     'cited-by-count': str(rng.randrange(0, 5000)),
+                     'citation-count': str(rng.randrange(0, 6000)),
+                     'link': [{'@href': url, '@rel': rel} for rel in
+                              ('self', 'search', 'scopus-citedby',
+                               'scopus-author')]},
+        'h-index': str(rng.randrange(0, 60)),
+        'coauthor-count': str(rng.randrange(0, 400)),
+        'author-profile': {
+            'preferred-name': {'surname': f'Surname{identifier[-3:]}',
+                               'given-name': 'Given', 'initials': 'G.',
+                               'indexed-name': f'Surname{identifier[-3:]} G.'},
+            'publication-range': {'@start': '2005', '@end': str(localtime().tm_year)},
+            'affiliation-current': {'affiliation': {
+                '@affiliation-id': aff_id,
+                'ip-doc': {'@id': aff_id, 'afdispname': f'Institution {aff_id}',
+                           'preferred-name': {'$': f'Institution {aff_id}'},
+                           'address': {'country': 'Canada',
+                                       'city': 'Montreal'}}}}}}]}
+
+
+def affiliation(identifier: str) -> Dict:
+    """Return a synthetic Affiliation Retrieval response."""
+    rng = _rng('AffiliationRetrieval', identifier)
+    url = f'https://api.elsevier.com/content/affiliation/affiliation_id/{identifier}'
+    return {'affiliation-retrieval-response': {
+        'coredata': {'prism:url': url, 'eid': f'10-s2.0-{identifier}',
+                     'dc:identifier': f'AFFILIATION_ID:{identifier}',
+                     'document-count': str(rng.randrange(1, 100_000)),
+                     'author-count': str(rng.randrange(1, 10_000)),
+                     'link': [{'@href': url, '@rel': rel} for rel in
+                              ('self', 'search', 'scopus-affiliation')]},
+        'affiliation-name': f'Institution {identifier}',
+        'address': '1100 Notre-Dame St W', 'city': 'Montreal',
+        'country': 'Canada', 'institution-profile': {}}}
+
+
+def citation_overview(identifiers: List[str], date: str) -> Dict:
+    """Return a synthetic Citation Overview response for the documents
+    `identifiers` and the year range `date` (e.g. "2015-2020").
+    """
+    start, end = (int(y) for y in date.split("-"))
+    years = range(start, end + 1)
+    infos, legend = [], []
+    columns = [0]*len(years)
+    prev_total = later_total = 0
+    for identifier in identifiers:
+        rng = _rng('CitationOverview', identifier)
+        cc = [rng.randrange(0, 30) for _ in years]
+        pcc, lcc = rng.randrange(0, 50), rng.randrange(0, 10)
+        columns = [a + b for a, b in zip(columns, cc)]
+        prev_total += pcc
+        later_total += lcc
+        infos.append({
+            'dc:identifier': f'SCOPUS_ID:{identifier}',
+            'prism:url': f'https://api.elsevier.com/content/abstract/scopus_id/{identifier}',
+            'dc:title': f'Synthetic document {identifier}',
+            'citationType': {'@code': 'ar', '$': 'Article'},
+            'author': [{'ce:index-name': 'Surname G.', 'authid': '7000000000',
+                        'ce:surname': 'Surname', 'ce:initials': 'G.'}],
+            'sort-year': str(start), 'prism:publicationName': 'Journal',
+            'pcc': str(pcc), 'cc': [{'$': str(c)} for c in cc],
+            'lcc': str(lcc), 'rangeCount': str(sum(cc)),
+            'rowTotal': str(pcc + sum(cc) + lcc)})
+        legend.append({'@_fa': 'true', 'scopus_id': identifier})
+    range_total = sum(columns)
+    return {'abstract-citations-response': {
+        'h-index': str(len(identifiers)),
+        'identifier-legend': {'identifier': legend},
+        'citeInfoMatrix': {'citeInfoMatrixXML': {
+            'citationMatrix': {'citeInfo': infos}}},
+        'citeColumnTotalXML': {'citeCountHeader': {
+            'columnHeading': [{'$': str(y)} for y in years],
+            'columnTotal': [{'$': str(c)} for c in columns],
+            'prevColumnTotal': str(prev_total),
+            'rangeColumnTotal': str(range_total),
+            'laterColumnTotal': str(later_total),
+            'grandTotal': str(prev_total + range_total + later_total)}}}}
+
+
+def metrics(api: str, params: Dict[str, str]) -> Dict:
+    """Return a synthetic SciVal metrics response with one result per
+    entity and one metric per metric type of the request.
+    """
+    entity = 'author' if api == 'AuthorLookup' else 'institution'
+    ids = params.get('authors') or params.get('institutionIds') or ''
+    years = _years(params.get('yearRange', '5yrs'))
+    by_year = params.get('byYear', 'True').lower() != 'false'
+    results = []
+    for identifier in filter(None, ids.split(",")):
+        identifier = identifier.strip()
+        items = []
+        for metric_type in params.get('metricTypes', 'ScholarlyOutput').split(","):
+            # Values depend neither on the other entities and metric types
+            # of the request nor, but for journal metrics, on the journal
+            # impact type
+            ignored = ['authors', 'institutionIds', 'metricTypes']
+            if metric_type != 'PublicationsInTopJournalPercentiles':
+                ignored.append('journalImpactType')
+            others = sorted((k, v) for k, v in params.items()
+                            if k not in ignored)
+            rng = _rng(api, identifier, metric_type, others)
+            values = _metric_values(rng, metric_type, years, by_year)
+            items.append({'metricType': metric_type, **values})
+        results.append({'metrics': items, entity: {
+            'id': int(identifier) if identifier.isdigit() else identifier,
+            'name': f'{entity.title()} {identifier}',
+            'uri': f'{entity.title()}/{identifier}',
+            'link': {'@ref': 'self', '@type': 'application/json',
+                     '@href': f'https://www.scival.com/{entity}/{identifier}'}}})
+    return {'dataSource': {'sourceName': 'Scopus',
+                           'lastUpdated': '2024-01-01',
+                           'metricStartYear': years[0],
+                           'metricEndYear': years[-1]},
+            'results': results}
+
+
+def _metric_values(rng, metric_type, years, by_year):
+    """Auxiliary function to return the values of one synthetic metric."""
+    def by_years(scale):
+        if metric_type in COUNT_METRICS:
+            values = {str(y): rng.randrange(scale) for y in years}
+        else:
+            values = {str(y): round(rng.random()*scale, 2) for y in years}
+        if by_year:
+            return values
+        return round(sum(values.values()), 2)
+
+    key, pct_key = ('valueByYear', 'percentageByYear') if by_year else \
+        ('value', 'percentage')
+    if metric_type in COLLAB_TYPES:
+        return {'values': [{'collabType': t, key: by_years(20),
+                            pct_key: by_years(100)}
+                           for t in COLLAB_TYPES[metric_type]]}
+    if metric_type in PERCENTILE_METRICS:
+        return {'values': [{'threshold': t, key: by_years(20),
+                            pct_key: by_years(100)}
+                           for t in (1, 5, 10, 25)]}
+    return {key: by_years(30)}
+
+
+def institution_authors(identifier: str, params: Dict[str, str], size: int
+                        ) -> Dict:
+    """Return a synthetic list of the authors of institution `identifier`."""
+    offset = int(params.get('offset', 0))
+    limit = int(params.get('limit', 500))
+    authors = []
+    for index in range(offset, min(offset + limit, size)):
+        rng = _rng('InstitutionAuthors', identifier, index)
+        auth_id = rng.randrange(7_000_000_000, 58_000_000_000)
+        authors.append({'id': auth_id, 'name': f'Surname{index}, G.',
+                        'uri': f'Author/{auth_id}',
+                        'scholarlyOutput': rng.randrange(1, 300),
+                        'link': {'@ref': 'self', '@type': 'application/json',
+                                 '@href': f'https://www.scival.com/author/{auth_id}'}})
+    return {'link': {'@ref': 'self', '@type': 'application/json',
+                     '@href': f'https://www.scival.com/institution/{identifier}'},
+            'authors': authors, 'totalCount': size}
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Run the stand-in server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cassettes", help="directory of recorded responses")
+    parser.add_argument("--record", action="store_true",
+                        help="record missing cassettes from the real APIs")
+    parser.add_argument("--size", type=int, default=25,
+                        help="number of results of synthetic searches")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="delay of each response in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="probability of a random 429 error")
+    parser.add_argument("--quota", type=int, default=20_000,
+                        help="requests per key and API, 0 for no quota")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    opts = parser.parse_args(args)
+    server = StandinServer((opts.host, opts.port), opts.cassettes,
+                           opts.record, size=opts.size, latency=opts.latency,
+                           error_rate=opts.error_rate, quota=opts.quota,
+                           seed=opts.seed, verbose=opts.verbose)
+    print(f"Serving the Elsevier APIs on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,14 @@
+import atexit
 import configparser
-from collections import deque
+from pathlib import Path
+from tempfile import gettempdir
 
 from .constants import CONFIG_FILE, RATELIMITS
+from .concurrency import AdaptiveLimiter
 from .create_config import create_config
+from .key_pool import KeyPool
+from .metrics import METRICS
+from .rate_limiter import TokenBucket
 
 # Read/create config file (with fixture for RTFD.io)
 config = configparser.ConfigParser()
@@ -15,8 +21,32 @@ try:
     KEYS = [k.strip() for k in config.get('Authentication', 'APIKey').split(",")]
     DOCS_PATH = [k.strip() for k in config.get('Docs Path', 'Path').split(",")]
 except EOFError:
-    pass
+    # No configuration (e.g. non-interactive creation): requests fail
+    # for lack of keys
+    KEYS = []
 
-# Throttling params
-_throttling_params = {k: deque(maxlen=v) for k, v in RATELIMITS.items()}
+# Pool of keys routing each request to the key with the most remaining quota
+KEY_POOL = KeyPool(KEYS)
 
+# Throttling params: one token bucket per API, shared by all processes
+# using the same directory (set `RateLimitDir` to an empty value to share
+# them among the threads of this process only)
+_default_dir = Path(gettempdir())/"pybliometrics_ratelimit"
+_rate_limit_dir = config.get('Requests', 'RateLimitDir',
+                             fallback=str(_default_dir)).strip() or None
+_rate_limiters = {k: TokenBucket(v, state_dir=_rate_limit_dir, name=k)
+                  for k, v in RATELIMITS.items()}
+
+# Adaptive concurrency per API, between one request and the throttling
+# limit (or the number of workers, if lower) of the API
+_max_workers = config.getint('Requests', 'MaxWorkers', fallback=16)
+_ceilings = {k: min(v or _max_workers, _max_workers)
+             for k, v in RATELIMITS.items()}
+_concurrency = {k: AdaptiveLimiter(v, initial=max(v//2, 1), name=k)
+                for k, v in _ceilings.items()}
+
+# Instrumentation: eventually dump the counters of all APIs at exit, as
+# Prometheus text if the file ends with `.prom` and as JSON otherwise
+_metrics_file = config.get('Requests', 'MetricsFile', fallback='').strip()
+if _metrics_file:
+    atexit.register(METRICS.dump, _metrics_file)
@@ -0,0 +1,130 @@
+"""Tests for `utils.cache` module."""
+
+from time import time
+
+import pytest
+
+from Include.pybliometrics.utils.cache import FileCache, SQLiteCache
+
+KEY = ('AbstractRetrieval', 'FULL', '85000000001')
+OTHER = ('AbstractRetrieval', 'FULL', '85000000002')
+NO_VIEW = ('CitationOverview', None, 'stem')
+
+
+def clear(cache):
+    """Delete all entries of `cache`."""
+    for key in list(cache.keys()):
+        cache.delete(key)
+
+
+@pytest.fixture(params=['file', 'sqlite'])
+def cache(request, tmp_path):
+    """An empty cache of each backend."""
+    if request.param == 'file':
+        backend = FileCache()
+    else:
+        backend = SQLiteCache(tmp_path/"cache.sqlite")
+    clear(backend)
+    yield backend
+    clear(backend)
+
+
+def test_cache_write_read(cache):
+    assert cache.read(KEY) is None
+    assert cache.mtime(KEY) is None
+    before = time()
+    cache.write(KEY, '{"a": "é"}')
+    assert cache.read(KEY) == '{"a": "é"}'
+    assert cache.mtime(KEY) >= before - 1
+    cache.write(KEY, '{}')
+    assert cache.read(KEY) == '{}'
+
+
+def test_cache_without_view(cache):
+    cache.write(NO_VIEW, 'content')
+    assert cache.read(NO_VIEW) == 'content'
+    assert list(cache.keys()) == [NO_VIEW]
+
+
+def test_cache_delete(cache):
+    cache.write(KEY, 'content')
+    cache.delete(KEY)
+    assert cache.read(KEY) is None
+    cache.delete(KEY)  # Deleting a missing entry is no error
+
+
+def test_cache_rename(cache):
+    cache.write(KEY, 'old')
+    cache.write(OTHER, 'replaced')
+    mtime = cache.mtime(KEY)
+    cache.rename(KEY, OTHER)
+    assert cache.read(KEY) is None
+    assert cache.read(OTHER) == 'old'
+    assert cache.mtime(OTHER) == pytest.approx(mtime)
+    cache.rename(KEY, OTHER)  # Renaming a missing entry is no error
+    assert cache.read(OTHER) == 'old'
+
+
+def test_cache_keys_entries(cache):
+    cache.write(KEY, 'a'*10)
+    cache.write(OTHER, 'b')
+    assert sorted(cache.keys()) == [KEY, OTHER]
+    entries = {key: (size, atime) for key, size, atime in cache.entries()}
+    assert set(entries) == {KEY, OTHER}
+    assert all(size > 0 and atime > 0 for size, atime in entries.values())
+
+
+def test_cache_writer(cache):
+    with cache.writer(KEY) as writer:
+        writer.append('{"a": 1}\n')
+        writer.append('{"b": 2}\n')
+        # Readers don't see the entry before it is complete
+        assert cache.read(KEY) is None
+    assert writer.size == 18
+    assert cache.read(KEY) == '{"a": 1}\n{"b": 2}\n'
+
+
+def test_cache_writer_abort(cache):
+    cache.write(KEY, 'previous')
+    with pytest.raises(RuntimeError):
+        with cache.writer(KEY) as writer:
+            writer.append('partial')
+            raise RuntimeError
+    assert cache.read(KEY) == 'previous'
+    # No temporary file is left behind
+    assert list(cache.keys()) == [KEY]
+
+
+def test_file_cache_ignores_temporary_files():
+    cache = FileCache()
+    clear(cache)
+    cache.write(KEY, 'content')
+    (cache.path(KEY).parent/".85000000003.tmp").write_text('partial')
+    try:
+        assert list(cache.keys()) == [KEY]
+    finally:
+        (cache.path(KEY).parent/".85000000003.tmp").unlink()
+        clear(cache)
+
+
+def test_sqlite_cache_import_files(tmp_path):
+    files = FileCache()
+    clear(files)
+    files.write(KEY, 'first')
+    files.write(NO_VIEW, 'second')
+    try:
+        database = SQLiteCache(tmp_path/"cache.sqlite")
+        assert database.import_files(files) == 2
+        assert database.read(KEY) == 'first'
+        assert database.read(NO_VIEW) == 'second'
+        assert database.mtime(KEY) == pytest.approx(files.mtime(KEY))
+    finally:
+        clear(files)
+
+
+def test_sqlite_cache_shared(tmp_path):
+    # Connections of different instances see the same entries
+    SQLiteCache(tmp_path/"cache.sqlite").write(KEY, 'content', mtime=1000.0)
+    database = SQLiteCache(tmp_path/"cache.sqlite")
+    assert database.read(KEY) == 'content'
+    assert database.mtime(KEY) == 1000.0
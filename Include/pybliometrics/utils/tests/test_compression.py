@@ -0,0 +1,88 @@
+"""Tests for `utils.compression` module."""
+
+import gzip
+from io import BytesIO
+
+import pytest
+
+from Include.pybliometrics.utils.cache import FileCache, SQLiteCache
+from Include.pybliometrics.utils.compression import GZIP_MAGIC, compress, \
+    compressing_writer, decompress, resolve_method, zstandard
+
+CONTENT = '{"abstracts-retrieval-response": {"title": "Théorie"}}'*100
+KEY = ('AbstractRetrieval', 'FULL', '85000000001')
+
+
+def test_resolve_method():
+    assert resolve_method('GZIP') == 'gzip'
+    assert resolve_method('none') == 'none'
+    assert resolve_method('auto') == ('zstd' if zstandard else 'gzip')
+    with pytest.raises(ValueError):
+        resolve_method('bz2')
+
+
+@pytest.mark.skipif(zstandard is not None, reason="zstandard is installed")
+def test_resolve_method_zstd_missing():
+    with pytest.raises(ValueError):
+        resolve_method('zstd')
+
+
+@pytest.mark.parametrize('method', ['gzip', 'none', pytest.param(
+    'zstd', marks=pytest.mark.skipif(zstandard is None,
+                                     reason="requires zstandard"))])
+def test_compress_round_trip(method):
+    data = compress(CONTENT, method)
+    if method != 'none':
+        assert len(data) < len(CONTENT.encode('utf8'))
+    assert decompress(data) == CONTENT
+
+
+@pytest.mark.parametrize('method', ['gzip', 'none', pytest.param(
+    'zstd', marks=pytest.mark.skipif(zstandard is None,
+                                     reason="requires zstandard"))])
+def test_compressing_writer_round_trip(method):
+    sink = BytesIO()
+    stream = compressing_writer(sink, method)
+    for part in CONTENT.split('}}'):
+        stream.write((part + '}}').encode('utf8'))
+    if stream is not sink:
+        stream.close()
+    assert not sink.closed
+    assert decompress(sink.getvalue()).startswith(CONTENT)
+
+
+def test_decompress_legacy():
+    # Entries written before compression are plain UTF-8 text
+    assert decompress(CONTENT.encode('utf8')) == CONTENT
+    assert decompress(CONTENT) == CONTENT
+    assert decompress(gzip.compress(b'{}')) == '{}'
+
+
+@pytest.mark.skipif(zstandard is not None, reason="zstandard is installed")
+def test_decompress_zstd_missing():
+    with pytest.raises(ValueError):
+        decompress(b"\x28\xb5\x2f\xfd" + b"\x00"*8)
+
+
+def test_file_cache_compressed(tmp_path):
+    cache = FileCache('gzip')
+    cache.write(KEY, CONTENT)
+    try:
+        assert cache.path(KEY).read_bytes().startswith(GZIP_MAGIC)
+        assert cache.read(KEY) == CONTENT
+        # Uncompressed entries of earlier versions remain readable
+        cache.path(KEY).write_text(CONTENT, encoding='utf8')
+        assert cache.read(KEY) == CONTENT
+    finally:
+        cache.delete(KEY)
+
+
+def test_sqlite_cache_compressed(tmp_path):
+    cache = SQLiteCache(tmp_path/"cache.sqlite", 'gzip')
+    cache.write(KEY, CONTENT)
+    (size,) = [size for _, size, _ in cache.entries()]
+    assert size < len(CONTENT)
+    assert cache.read(KEY) == CONTENT
+    # Entries of an uncompressed database remain readable
+    SQLiteCache(tmp_path/"cache.sqlite").write(KEY, CONTENT)
+    assert cache.read(KEY) == CONTENT
@@ -0,0 +1,113 @@
+"""Tests for `utils.housekeeping` module."""
+
+import pytest
+
+from Include.pybliometrics.utils import housekeeping
+from Include.pybliometrics.utils.cache import SQLiteCache
+from Include.pybliometrics.utils.housekeeping import Housekeeper, evict, \
+    format_size, get_limits, parse_size, usage
+
+
+def fill(cache, api, n, size, start=0):
+    """Write `n` entries of `size` bytes for `api`, the first accessed
+    first, and return their keys.
+    """
+    keys = []
+    for i in range(n):
+        key = (api, None, str(i))
+        cache.write(key, 'x'*size)
+        with cache._connection() as con:
+            con.execute("UPDATE entries SET atime=? WHERE api=? AND key=?",
+                        (start + i, api, str(i)))
+        keys.append(key)
+    return keys
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SQLiteCache(tmp_path/"cache.sqlite")
+
+
+def test_parse_size():
+    assert parse_size('') is None
+    assert parse_size('1048576') == 2**20
+    assert parse_size('500MB') == 500*10**6
+    assert parse_size('2 GiB') == 2*2**30
+    assert parse_size('1.5kb') == 1500
+    for value in ('-1', 'MB', '5 XB'):
+        with pytest.raises(ValueError):
+            parse_size(value)
+
+
+def test_format_size():
+    assert format_size(999) == "999 B"
+    assert format_size(1500) == "1.5 kB"
+    assert format_size(2*10**12) == "2.0 TB"
+
+
+def test_get_limits(monkeypatch):
+    monkeypatch.setitem(housekeeping.config['Cache'], 'MaxSize', '2GB')
+    housekeeping.config['Cache Quotas'] = {'AbstractRetrieval': '500MB',
+                                           'ScopusSearch': ''}
+    try:
+        assert get_limits() == {None: 2*10**9, 'AbstractRetrieval': 5*10**8}
+    finally:
+        housekeeping.config.remove_section('Cache Quotas')
+
+
+def test_usage(cache):
+    fill(cache, 'AbstractRetrieval', 3, 10)
+    fill(cache, 'ScopusSearch', 1, 20)
+    assert usage(cache) == {'AbstractRetrieval': {'entries': 3, 'bytes': 30},
+                            'ScopusSearch': {'entries': 1, 'bytes': 20}}
+
+
+def test_evict_without_limits(cache):
+    fill(cache, 'AbstractRetrieval', 3, 10)
+    assert evict(cache, {}) == {}
+    assert len(list(cache.keys())) == 3
+
+
+def test_evict_api_limit(cache):
+    keys = fill(cache, 'AbstractRetrieval', 5, 10)
+    others = fill(cache, 'ScopusSearch', 2, 10)
+    assert evict(cache, {'AbstractRetrieval': 25}) == {'AbstractRetrieval': 3}
+    # The least recently used entries go first; other APIs are untouched
+    assert sorted(cache.keys()) == sorted(keys[3:] + others)
+
+
+def test_evict_total_limit(cache):
+    old = fill(cache, 'AbstractRetrieval', 2, 10)
+    new = fill(cache, 'ScopusSearch', 2, 10, start=100)
+    assert evict(cache, {None: 25}) == {'AbstractRetrieval': 2}
+    assert sorted(cache.keys()) == new
+    assert evict(cache, {None: 25}) == {}
+    assert old[0] not in cache.keys()
+
+
+def test_evict_api_then_total(cache):
+    fill(cache, 'AbstractRetrieval', 4, 10, start=100)
+    scopus = fill(cache, 'ScopusSearch', 4, 10)
+    deleted = evict(cache, {'AbstractRetrieval': 20, None: 40})
+    # The API limit deletes the oldest two of its entries first, then the
+    # total limit deletes the oldest entries of any API
+    assert deleted == {'AbstractRetrieval': 2, 'ScopusSearch': 2}
+    assert sum(size for _, size, _ in cache.entries()) == 40
+    assert not set(scopus[:2]) & set(cache.keys())
+
+
+def test_evict_read_refreshes_access(cache):
+    keys = fill(cache, 'AbstractRetrieval', 3, 10)
+    cache.read(keys[0])  # Now the most recently used entry
+    evict(cache, {'AbstractRetrieval': 20})
+    assert sorted(cache.keys()) == sorted([keys[0], keys[2]])
+
+
+def test_housekeeper(cache):
+    fill(cache, 'AbstractRetrieval', 3, 10)
+    housekeeper = Housekeeper(cache, {None: 10}, interval=60)
+    housekeeper.start()
+    housekeeper.stop()
+    housekeeper.join(10)
+    assert not housekeeper.is_alive()
+    assert len(list(cache.keys())) == 1
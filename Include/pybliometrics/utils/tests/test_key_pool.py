@@ -0,0 +1,114 @@
+"""Tests for `utils.key_pool` module and its use by `utils.get_content`."""
+
+from time import time
+
+import pytest
+
+from Include.pybliometrics.scopus.exception import Scopus429Error
+from Include.pybliometrics.utils import get_content as get_content_module
+from Include.pybliometrics.utils import key_pool, startup
+from Include.pybliometrics.utils.constants import URLS
+from Include.pybliometrics.utils.get_content import get_content
+from Include.pybliometrics.utils.key_pool import KeyPool
+
+API = 'AuthorRetrieval'
+URL = URLS[API] + '7004212773'
+
+
+def headers(remaining, reset):
+    return {'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(reset)}
+
+
+def test_key_pool_keys():
+    pool = KeyPool([' a', 'b ', ''])
+    assert pool.keys == ['a', 'b']
+    assert pool.get(API) == 'a'  # Unused keys: the first one
+    assert KeyPool([]).get(API) is None
+
+
+def test_key_pool_routing():
+    pool = KeyPool(['a', 'b', 'c'])
+    reset = time() + 3600
+    pool.update('a', API, headers(10, reset))
+    pool.update('b', API, headers(500, reset))
+    pool.update('c', API, headers(20, reset))
+    assert pool.get(API) == 'b'
+    # Quotas are per API
+    assert pool.get('ScopusSearch') == 'a'
+    # Headers without quota leave it unchanged
+    pool.update('b', API, {})
+    assert pool.status(API)['b'] == (500, reset)
+
+
+def test_key_pool_exhaust():
+    pool = KeyPool(['a', 'b'])
+    reset = time() + 3600
+    pool.exhaust('a', API, headers(0, reset))
+    assert pool.get(API) == 'b'
+    pool.exhaust('b', API, {'Retry-After': '60'})
+    assert pool.get(API) is None
+    assert pool.status(API)['b'][1] == pytest.approx(time() + 60, abs=5)
+
+
+def test_key_pool_reset(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(key_pool, 'time', lambda: clock[0])
+    pool = KeyPool(['a', 'b'])
+    pool.exhaust('a', API, headers(0, 1100))
+    pool.exhaust('b', API)  # Without headers: put aside for one second
+    assert pool.get(API) is None
+    clock[0] = 1001.5
+    assert pool.get(API) == 'b'
+    clock[0] = 1100
+    # Past its reset, a key counts as having its full quota again
+    pool.update('b', API, headers(3, 2000))
+    assert pool.get(API) == 'a'
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A fresh pool of the configured keys used by `get_content()`."""
+    pool = KeyPool(startup.KEYS)
+    monkeypatch.setattr(startup, 'KEY_POOL', pool)
+    return pool
+
+
+def test_get_content_switches_keys(server, pool):
+    server.quota = 3
+    used = [get_content(URL, API).request.headers['X-ELS-APIKey']
+            for _ in range(6)]
+    # Each request goes to the key with the most remaining quota
+    assert sorted(used) == sorted(pool.keys*3)
+    assert all(remaining == 0 for remaining, _ in pool.status(API).values())
+    requests = server.requests
+    with pytest.raises(Scopus429Error):
+        get_content(URL, API)
+    # Both keys are exhausted until their reset: no further request
+    assert server.requests == requests
+
+
+def test_get_content_bounded_key_switches(pool, monkeypatch):
+    # Exhausted keys without reset time return to the pool after one
+    # second, i.e. at once for slow requests
+    clock = [1000.0]
+    monkeypatch.setattr(key_pool, 'time', lambda: clock[0])
+    calls = []
+
+    class Response:
+        status_code = 429
+        headers = {'X-ELS-Status': 'QUOTA_EXCEEDED - Quota Exceeded'}
+
+        def json(self):
+            return {}
+
+    def fake_get(api, url, **kwds):
+        calls.append(kwds['headers']['X-ELS-APIKey'])
+        clock[0] += 2
+        return Response()
+
+    monkeypatch.setattr(get_content_module, '_timed_get', fake_get)
+    with pytest.raises(Scopus429Error):
+        get_content(URL, API)
+    assert len(calls) == 1 + len(pool.keys)*get_content_module._retries
+    assert set(calls) == set(pool.keys)
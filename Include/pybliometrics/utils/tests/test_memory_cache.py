@@ -0,0 +1,79 @@
+"""Tests for the in-memory tier of `utils.cache` module."""
+
+from Include.pybliometrics.scopus.author_retrieval import AuthorRetrieval
+from Include.pybliometrics.utils.cache import MemoryCache, get_cache, \
+    get_memory_cache
+
+
+def test_memory_cache_get_put():
+    memory = MemoryCache()
+    assert memory.get(('api', None, 'a')) is None
+    value = {'a': 1}
+    memory.put(('api', None, 'a'), value, 1000.0, 10)
+    stored, mtime = memory.get(('api', None, 'a'))
+    assert stored is value  # Parsed objects are shared, not copied
+    assert mtime == 1000.0
+    assert len(memory) == 1 and memory.size == 10
+
+
+def test_memory_cache_lru_entries():
+    memory = MemoryCache(max_entries=2)
+    memory.put('a', 'A', 0, 1)
+    memory.put('b', 'B', 0, 1)
+    memory.get('a')  # Now 'b' is the least recently used entry
+    memory.put('c', 'C', 0, 1)
+    assert memory.get('b') is None
+    assert memory.get('a') and memory.get('c')
+    assert len(memory) == 2
+
+
+def test_memory_cache_lru_bytes():
+    memory = MemoryCache(max_bytes=100)
+    memory.put('a', 'A', 0, 60)
+    memory.put('b', 'B', 0, 30)
+    memory.put('c', 'C', 0, 30)
+    assert memory.get('a') is None
+    assert memory.size == 60
+    # Replacing an entry accounts for its new size
+    memory.put('b', 'B', 0, 50)
+    assert memory.size == 80
+    # Entries larger than the limit are not stored and drop older versions
+    memory.put('c', 'C', 0, 101)
+    assert memory.get('c') is None
+    assert memory.size == 50
+
+
+def test_memory_cache_disabled():
+    memory = MemoryCache(max_entries=0)
+    memory.put('a', 'A', 0, 1)
+    assert memory.get('a') is None
+
+
+def test_memory_cache_discard_clear():
+    memory = MemoryCache()
+    memory.put('a', 'A', 0, 5)
+    memory.put('b', 'B', 0, 5)
+    memory.discard('a')
+    memory.discard('a')
+    assert memory.get('a') is None and memory.size == 5
+    memory.clear()
+    assert len(memory) == 0 and memory.size == 0
+
+
+def test_memory_cache_spares_reads(server):
+    memory = get_memory_cache()
+    memory.clear()
+    requests = server.requests
+    first = AuthorRetrieval('7004212771', refresh=30)
+    assert server.requests == requests + 1
+    key = first._cache_key
+    assert memory.get(key) is not None
+    # The next instance uses the parsed entry, without reading the backend
+    get_cache().delete(key)
+    second = AuthorRetrieval('7004212771', refresh=30)
+    assert server.requests == requests + 1
+    assert second._json is first._json
+    # Without the parsed entry, the entry is downloaded again
+    memory.clear()
+    AuthorRetrieval('7004212771', refresh=30)
+    assert server.requests == requests + 2
@@ -0,0 +1,88 @@
+"""Tests for the cached misses of `superclasses.base` module, subject to
+`NegativeTTL` (see `utils.freshness`).
+"""
+
+import os
+from time import time
+
+import pytest
+
+from Include.pybliometrics.scopus.author_retrieval import AuthorRetrieval
+from Include.pybliometrics.scopus.exception import Scopus404Error
+from Include.pybliometrics.scopus.scopus_search import ScopusSearch
+from Include.pybliometrics.utils import freshness
+from Include.pybliometrics.utils.cache import FileCache, get_cache, \
+    get_memory_cache
+
+
+def age(key, days):
+    """Make the file cache entry `key` older by `days`."""
+    path = FileCache().path(key)
+    mtime = time() - days*86400
+    os.utime(path, (mtime, mtime))
+    get_memory_cache().discard(key)
+
+
+@pytest.fixture(autouse=True)
+def empty_memory():
+    get_memory_cache().clear()
+
+
+def test_negative_ttl_retrieval(server):
+    requests = server.requests
+    with pytest.raises(Scopus404Error):
+        AuthorRetrieval('0', refresh=True)
+    assert server.requests == requests + 1
+    # The miss is cached and used, even with refresh=True
+    with pytest.raises(Scopus404Error):
+        AuthorRetrieval('0', refresh=True)
+    assert server.requests == requests + 1
+    key = ('AuthorRetrieval', 'ENHANCED', '0')
+    assert get_cache().read(key).startswith('{"service-error"')
+    # Once older than the negative TTL it is requested again
+    age(key, 2)
+    with pytest.raises(Scopus404Error):
+        AuthorRetrieval('0')
+    assert server.requests == requests + 2
+    get_cache().delete(key)
+
+
+def test_negative_ttl_search(server):
+    s = ScopusSearch('AF-ID(0)', refresh=True)
+    assert s.get_results_size() == 0
+    assert s.results is None
+    requests = server.requests
+    s = ScopusSearch('AF-ID(0)', refresh=True)
+    assert s.get_results_size() == 0
+    assert server.requests == requests
+    age(s._cache_key, 2)
+    ScopusSearch('AF-ID(0)')
+    assert server.requests > requests
+    get_cache().delete(s._cache_key)
+
+
+def test_negative_ttl_ignores_policy(server, monkeypatch):
+    # A fresh miss is used whatever the freshness policy, an expired one
+    # refreshed whatever its age under the policy
+    monkeypatch.setattr(freshness, '_policies',
+                        {'AuthorRetrieval': freshness.parse_policy('30')})
+    with pytest.raises(Scopus404Error):
+        AuthorRetrieval('00')
+    key = ('AuthorRetrieval', 'ENHANCED', '00')
+    age(key, 2)
+    requests = server.requests
+    with pytest.raises(Scopus404Error):
+        AuthorRetrieval('00')
+    assert server.requests == requests + 1
+    get_cache().delete(key)
+
+
+def test_negative_ttl_disabled(server, monkeypatch):
+    monkeypatch.setitem(freshness.config['Cache'], 'NegativeTTL', '0')
+    requests = server.requests
+    for _ in range(2):
+        with pytest.raises(Scopus404Error):
+            AuthorRetrieval('000')
+    assert server.requests == requests + 2
+    assert get_cache().read(('AuthorRetrieval', 'ENHANCED',
+                             '000')) is None
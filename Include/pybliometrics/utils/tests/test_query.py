@@ -0,0 +1,64 @@
+"""Tests for `utils.query` module."""
+
+from Include.pybliometrics.utils.query import cache_stem, canonical_query, \
+    key_params
+
+
+def test_canonical_query_case_and_whitespace():
+    expected = 'AUTHFIRST(john) AND AUTHLAST(smith)'
+    assert canonical_query('AUTHLAST(Smith) and AUTHFIRST(John)') == expected
+    assert canonical_query('authfirst (john)   AND authlast(smith)') == expected
+
+
+def test_canonical_query_sorts_operands():
+    assert canonical_query('AU-ID(2) OR AU-ID(1)') == 'AU-ID(1) OR AU-ID(2)'
+    assert canonical_query('(AU-ID(2) OR AU-ID(1)) AND PUBYEAR AFT 2019') == \
+        '(AU-ID(1) OR AU-ID(2)) AND pubyear aft 2019'
+
+
+def test_canonical_query_mixed_operators_keep_order():
+    query = 'AU-ID(2) OR AU-ID(1) AND AU-ID(3)'
+    assert canonical_query(query) == query
+    query = 'AU-ID(2) W/3 AU-ID(1)'
+    assert canonical_query(query) == query
+    assert canonical_query('a pre/2 b') == 'a PRE/2 b'
+
+
+def test_canonical_query_and_not_keeps_order():
+    query = 'AU-ID(3) AND AU-ID(2) AND NOT AU-ID(1)'
+    assert canonical_query(query) == query
+    query = 'AU-ID(2) AND NOT AU-ID(1) AND NOT AU-ID(0)'
+    assert canonical_query(query) == query
+    assert canonical_query('AU-ID(2) and not AU-ID(1)') == \
+        'AU-ID(2) AND NOT AU-ID(1)'
+
+
+def test_canonical_query_phrases():
+    assert canonical_query('TITLE("Deep   Learning")') == \
+        'TITLE("deep learning")'
+    # Parentheses and operators within phrases are part of the phrase
+    assert canonical_query('TITLE({Machine  Learning}) OR TITLE("a (b) or c")') \
+        == 'TITLE("a (b) or c") OR TITLE({machine learning})'
+
+
+def test_canonical_query_unbalanced_parentheses():
+    assert canonical_query('AU-ID(1') == 'au-id(1'
+    assert canonical_query('AU-ID(1))  OR X') == 'au-id(1)) or x'
+
+
+def test_key_params_ignored():
+    params = {'apikey': 'key', 'insttoken': 'token', 'count': 25,
+              'view': 'COMPLETE', 'start': 0, 'cursor': '*', 'query': 'x',
+              'date': '2020', 'field': 'eid'}
+    assert key_params('x', params) == ['date', 'field']
+    assert key_params({'affil': 'x'}, {'affil': 'x', 'count': 200}) == []
+
+
+def test_cache_stem():
+    params = {'count': 25, 'view': 'COMPLETE', 'cursor': '*'}
+    stem = cache_stem('AU-ID(2) OR AU-ID(1)', params)
+    assert stem == cache_stem('au-id(1) or au-id(2)',
+                              {**params, 'apikey': 'key', 'count': 200})
+    assert stem != cache_stem('AU-ID(2) OR AU-ID(1)',
+                              {**params, 'date': '2020'})
+    assert stem != cache_stem('AU-ID(2) AND AU-ID(1)', params)
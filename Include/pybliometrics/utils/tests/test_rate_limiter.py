@@ -0,0 +1,74 @@
+"""Tests for `utils.rate_limiter` module."""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import time
+
+from Include.pybliometrics.utils.rate_limiter import TokenBucket
+
+RATE = 20
+CAPACITY = 4
+WORKERS = 3
+REQUESTS = 8  # Per worker
+
+# Tolerance of the timer resolution
+EPSILON = 0.05
+
+
+def acquire_all(bucket):
+    """Acquire `REQUESTS` tokens and return the times at which they were
+    obtained.
+    """
+    stamps = []
+    for _ in range(REQUESTS):
+        bucket.acquire()
+        stamps.append(time())
+    return stamps
+
+
+def acquire_shared(state_dir):
+    """Acquire tokens from the bucket shared through `state_dir`."""
+    return acquire_all(TokenBucket(RATE, CAPACITY, state_dir, "test"))
+
+
+def check_rate(results):
+    """Check that the tokens were obtained no faster than the bucket
+    allows: after the initial burst, at most `RATE` tokens per second.
+    """
+    stamps = sorted(s for r in results for s in r)
+    assert len(stamps) == WORKERS*REQUESTS
+    for i in range(CAPACITY, len(stamps)):
+        minimum = (i - CAPACITY + 1)/RATE
+        assert stamps[i] - stamps[0] >= minimum - EPSILON
+
+
+def test_token_bucket_burst():
+    bucket = TokenBucket(RATE, CAPACITY)
+    assert all(bucket.acquire() == 0 for _ in range(CAPACITY))
+    assert bucket.acquire() > 0
+
+
+def test_token_bucket_unlimited():
+    bucket = TokenBucket(0)
+    assert all(bucket.acquire() == 0 for _ in range(100))
+
+
+def test_token_bucket_threads():
+    bucket = TokenBucket(RATE, CAPACITY)
+    with ThreadPoolExecutor(WORKERS) as executor:
+        results = list(executor.map(acquire_all, [bucket]*WORKERS))
+    check_rate(results)
+
+
+def test_token_bucket_shared_threads(tmp_path):
+    # Separate instances in one process share the bucket through the file
+    buckets = [TokenBucket(RATE, CAPACITY, tmp_path, "test")
+               for _ in range(WORKERS)]
+    with ThreadPoolExecutor(WORKERS) as executor:
+        results = list(executor.map(acquire_all, buckets))
+    check_rate(results)
+
+
+def test_token_bucket_shared_processes(tmp_path):
+    with ProcessPoolExecutor(WORKERS) as executor:
+        results = list(executor.map(acquire_shared, [tmp_path]*WORKERS))
+    check_rate(results)
@@ -0,0 +1,90 @@
+"""Tests for `utils.single_flight` module."""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event
+from time import sleep
+
+import pytest
+
+from Include.pybliometrics.utils.single_flight import SingleFlight, flight_key
+
+THREADS = 8
+
+
+def run_concurrently(flights, key, func):
+    """Call `flights.do(key, func)` from `THREADS` threads released together
+    and return the list of results (or exceptions) in thread order.
+    """
+    barrier = Barrier(THREADS)
+
+    def call():
+        barrier.wait()
+        try:
+            return flights.do(key, func)
+        except Exception as err:
+            return err
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        futures = [executor.submit(call) for _ in range(THREADS)]
+        return [f.result(timeout=10) for f in futures]
+
+
+def test_single_flight_coalesces():
+    flights = SingleFlight()
+    calls = []
+
+    def func():
+        calls.append(1)
+        sleep(0.2)  # Keep the flight open until all threads joined it
+        return object()
+
+    results = run_concurrently(flights, 'key', func)
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    # The flight is over: a new call runs the function again
+    flights.do('key', func)
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_error():
+    flights = SingleFlight()
+    calls = []
+
+    def func():
+        calls.append(1)
+        sleep(0.2)
+        raise ValueError("failed")
+
+    results = run_concurrently(flights, 'key', func)
+    assert len(calls) == 1
+    assert all(isinstance(r, ValueError) for r in results)
+    with pytest.raises(ValueError):
+        flights.do('key', func)
+
+
+def test_single_flight_distinct_keys():
+    flights = SingleFlight()
+    started = Event()
+    release = Event()
+
+    def slow():
+        started.set()
+        release.wait(10)
+        return 'slow'
+
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(flights.do, 'a', slow)
+        assert started.wait(10)
+        # Another key does not wait for the flight of 'a'
+        assert flights.do('b', lambda: 'fast') == 'fast'
+        release.set()
+        assert future.result(timeout=10) == 'slow'
+
+
+def test_flight_key():
+    url = 'https://api.elsevier.com/content/search/scopus'
+    key = flight_key(url, {'query': 'AU-ID(1)', 'count': 25}, 'ScopusSearch')
+    assert key == flight_key(url, {'count': '25', 'query': 'AU-ID(1)'},
+                             'ScopusSearch')
+    assert key != flight_key(url, {'query': 'AU-ID(1)', 'count': 200},
+                             'ScopusSearch')
@@ -0,0 +1,59 @@
+"""Benchmark of the read and decode time of compressed cache entries.
+
+Writes the synthetic results of a large ScopusSearch query as JSONL cache
+entry without compression, with gzip and, if the package zstandard is
+installed, with zstd, and measures for each the size, the time to read and
+decompress the entry and the time to parse its records.
+
+Usage, from the root of the project:
+
+    python -m benchmarks.bench_cache_compression [--results 5000] [--repeat 20]
+"""
+
+import argparse
+from json import dumps, loads
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from Include.pybliometrics.utils.compression import compress, decompress, zstandard
+from Include.pybliometrics.utils.standin_server import search_entry
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--results", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    opts = parser.parse_args(args)
+
+    query = " OR ".join(f"AU-ID({i})" for i in range(50))
+    text = "\n".join(dumps(search_entry('ScopusSearch', query, i),
+                           separators=(',', ':'))
+                     for i in range(opts.results))
+    methods = ['none', 'gzip'] + (['zstd'] if zstandard else [])
+
+    print(f"{opts.results} results, best of {opts.repeat} runs")
+    print(f"{'method':<8}{'size (kB)':>12}{'write (ms)':>12}"
+          f"{'read (ms)':>12}{'parse (ms)':>12}{'total (ms)':>12}")
+    with TemporaryDirectory() as tmp:
+        for method in methods:
+            fname = Path(tmp)/method
+            start = perf_counter()
+            fname.write_bytes(compress(text, method))
+            write = perf_counter() - start
+            read = parse = float("inf")
+            for _ in range(opts.repeat):
+                start = perf_counter()
+                content = decompress(fname.read_bytes())
+                middle = perf_counter()
+                _ = [loads(line) for line in content.split("\n") if line]
+                end = perf_counter()
+                read = min(read, middle - start)
+                parse = min(parse, end - middle)
+            print(f"{method:<8}{fname.stat().st_size/1e3:>12.1f}"
+                  f"{write*1e3:>12.1f}{read*1e3:>12.1f}{parse*1e3:>12.1f}"
+                  f"{(read + parse)*1e3:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
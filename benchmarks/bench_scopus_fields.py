@@ -0,0 +1,74 @@
+"""Benchmark of the field projection of ScopusSearch results.
+
+Builds the synthetic results of a large author query in the COMPLETE view,
+all fields and restricted to the fields of `--fields` as the API returns
+them with the `field` parameter, and compares their size (as JSON lines, as
+downloaded, and gzip-compressed, as cached) and the time to read the cached
+lines and to build `to_frame()`.
+
+Usage, from the root of the project:
+
+    python -m benchmarks.bench_scopus_fields [--results 5000] [--repeat 5]
+        [--fields eid subtypeDescription coverDate]
+"""
+
+import argparse
+from json import dumps, loads
+from time import perf_counter
+
+from Include.pybliometrics.scopus import scopus_search
+from Include.pybliometrics.scopus.scopus_search import ScopusSearch, _api_fields
+from Include.pybliometrics.utils.compression import compress
+from Include.pybliometrics.utils.standin_server import project_entry, search_entry
+
+
+def best(func, repeat):
+    """Return the best time of `repeat` calls of `func` in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return min(times)*1e3
+
+
+def read_frame(content):
+    """Parse cached JSON lines and return the DataFrame of the results."""
+    search = ScopusSearch.__new__(ScopusSearch)
+    search._json = [loads(line) for line in content.split("\n") if line]
+    search._cache_key = ('ScopusSearch', 'COMPLETE', 'benchmark')
+    search._mdate = perf_counter()
+    search._integrity = []
+    search._action = "raise"
+    scopus_search._records.clear()
+    return search.to_frame()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--results", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fields", nargs="+",
+                        default=['eid', 'subtypeDescription', 'coverDate'])
+    opts = parser.parse_args(args)
+
+    query = "AU-ID(7004212771)"
+    entries = [search_entry('ScopusSearch', query, i)
+               for i in range(opts.results)]
+    field = _api_fields(opts.fields)
+    projected = [project_entry(e, field.split(",")) for e in entries]
+
+    print(f"{opts.results} results, field={field}, best of {opts.repeat} "
+          "runs")
+    print(f"{'results':<12}{'JSON (kB)':>12}{'gzip (kB)':>12}"
+          f"{'parse (ms)':>12}")
+    for name, data in (("all fields", entries), ("projected", projected)):
+        content = "\n".join(dumps(e, separators=(',', ':')) for e in data)
+        sizes = [len(content.encode('utf8')), len(compress(content, 'gzip'))]
+        parse = best(lambda: read_frame(content), opts.repeat)
+        print(f"{name:<12}" + "".join(f"{s/1e3:>12.1f}" for s in sizes)
+              + f"{parse:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
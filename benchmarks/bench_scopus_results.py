@@ -0,0 +1,90 @@
+"""Benchmark of the parsing of ScopusSearch results.
+
+Parses the synthetic results of a large ScopusSearch query, whose
+documents have `--authors` authors listed twice each as in results with
+multi-affiliated authors, and measures the deduplication of the authors
+with the former `reduce`-based function and with the linear one, the first
+and the repeated access to `results`, and the DataFrame built from the
+namedtuples and by `to_frame()`.
+
+Usage, from the root of the project:
+
+    python -m benchmarks.bench_scopus_results [--results 5000] [--authors 10] [--repeat 5]
+"""
+
+import argparse
+from functools import reduce
+from time import perf_counter
+
+import pandas as pd
+
+from Include.pybliometrics.scopus import scopus_search
+from Include.pybliometrics.scopus.scopus_search import ScopusSearch
+from Include.pybliometrics.utils.parse_content import deduplicate
+from Include.pybliometrics.utils.standin_server import search_entry
+
+
+def deduplicate_reduce(lst):
+    """Former, quadratic deduplication of `utils/parse_content.py`."""
+    return reduce(lambda x, y: x + y if y[0] not in x else x,
+                  map(lambda x: [x], lst), [])
+
+
+def best(func, repeat):
+    """Return the best time of `repeat` calls of `func` in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return min(times)*1e3
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--results", type=int, default=5000)
+    parser.add_argument("--authors", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    opts = parser.parse_args(args)
+
+    query = " OR ".join(f"AU-ID({i})" for i in range(50))
+    entries = []
+    for i in range(opts.results):
+        entry = search_entry('ScopusSearch', query, i)
+        author = entry['author'][0]
+        authors = [{**author, 'authid': str(int(author['authid']) + k)}
+                   for k in range(opts.authors)]
+        entry['author'] = authors + authors
+        entries.append(entry)
+
+    # Instance with the results already downloaded
+    search = ScopusSearch.__new__(ScopusSearch)
+    search._json = entries
+    search._cache_key = ('ScopusSearch', 'COMPLETE', 'benchmark')
+    search._mdate = 0.0
+    search._integrity = []
+    search._action = "raise"
+
+    def first_access():
+        scopus_search._records.clear()
+        return search.results
+
+    print(f"{opts.results} results with {opts.authors} authors each, "
+          f"best of {opts.repeat} runs")
+    print(f"{'step':<36}{'time (ms)':>12}")
+    steps = [
+        ("deduplicate authors (reduce)",
+         lambda: [deduplicate_reduce(e['author']) for e in entries]),
+        ("deduplicate authors (linear)",
+         lambda: [deduplicate(e['author']) for e in entries]),
+        ("results, first access", first_access),
+        ("results, repeated access", lambda: search.results),
+        ("DataFrame(results)", lambda: pd.DataFrame(search.results)),
+        ("to_frame()", search.to_frame),
+    ]
+    for name, func in steps:
+        print(f"{name:<36}{best(func, opts.repeat):>12.1f}")
+
+
+if __name__ == '__main__':
+    main()